@@ -0,0 +1,217 @@
+"""
+Micro-benchmarks for the scoring, ranking and rendering helpers in bot_lec.py.
+
+Each benchmark runs over generated data (seeded, so runs are reproducible) at every requested size.
+Size is the number of users. The voting summary works on tallies, so it gets one poll per 100 users.
+Results print as a pytest-benchmark style table and can be saved as a baseline and compared later,
+so a performance change can show before/after numbers.
+
+Usage:
+    python bench.py                          # everything at 100, 1k, 10k and 100k users
+    python bench.py --sizes 100,1000 -k rank # only benchmarks whose name contains "rank"
+    python bench.py --save before            # also write .benchmarks/before.json
+    python bench.py --compare before         # show the change in median against that run
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BASELINE_DIR = ".benchmarks"
+TEAMS = ["G2", "FNC", "KC", "VIT", "TH", "SK", "GX", "KOI", "NAVI", "SHFT", "LR", "KCB"]
+WEEKS = 10
+MATCHES = 5
+
+
+def generate_standings(rng, users):
+    """
+    {user_id: {"weeks": {week: points}, "total": points}} with plenty of ties, plus usernames.
+    """
+    standings = {}
+    for user_id in range(1, users + 1):
+        weeks = {week: rng.randint(0, 8) for week in range(1, WEEKS + 1) if rng.random() < 0.9}
+        standings[user_id] = {"weeks": weeks, "total": sum(weeks.values())}
+    usernames = {user_id: f"user{user_id}" for user_id in standings}
+    return standings, usernames
+
+
+def generate_match(rng, index):
+    team1, team2 = rng.sample(TEAMS, 2)
+    match_type = ["BO1", "BO3", "BO5"][index % 3]
+    if match_type == "BO1":
+        options = [f"{team1} wins", f"{team2} wins"]
+    elif match_type == "BO3":
+        options = [f"{team1} 2-0", f"{team1} 2-1", f"{team2} 2-1", f"{team2} 2-0"]
+    else:
+        options = [f"{team1} 3-0", f"{team1} 3-1", f"{team1} 3-2", f"{team2} 3-2", f"{team2} 3-1", f"{team2} 3-0"]
+    return (index + 1, team1, team2, match_type), options
+
+
+def generate_predictions(rng, users):
+    matches = [generate_match(rng, i) for i in range(MATCHES)]
+    predictions = {}
+    for (match_id, _, _, _), options in matches:
+        for user_id in range(1, users + 1):
+            if rng.random() < 0.9:
+                predictions[(match_id, f"user{user_id}")] = tuple(rng.choice(options).split(" ", 1))
+    return matches, predictions
+
+
+class Benchmarks:
+    """
+    Each bench_* method takes the size and returns (function, args) to time.
+    """
+
+    def __init__(self, lec, seed):
+        self.lec = lec
+        self.seed = seed
+
+    def rng(self, size):
+        return random.Random(f"{self.seed}-{size}")
+
+    def bench_rank_users(self, size):
+        standings, _ = generate_standings(self.rng(size), size)
+        return self.lec.rank_users, (standings, WEEKS)
+
+    def bench_leaderboard_chunks(self, size):
+        standings, usernames = generate_standings(self.rng(size), size)
+        return self.lec.format_leaderboard_chunks, (self.lec.rank_users(standings, WEEKS), standings, usernames)
+
+    def bench_result_points(self, size):
+        rng = self.rng(size)
+        (_, team1, team2, match_type), options = generate_match(rng, 2)
+        winner, score = rng.choice(options).split(" ", 1)
+        predictions = [rng.choice(options).split(" ", 1) for _ in range(size)]
+
+        def award():
+            return [self.lec.match_points(pred_winner, pred_score, winner, score, match_type, 0, 0) for pred_winner, pred_score in predictions]
+        return award, ()
+
+    def bench_bonus_points(self, size):
+        rng = self.rng(size)
+        options = TEAMS[:8]
+        exact = set(rng.sample(options, 2))
+        subset = set(rng.sample(options, 4))
+        selections = [set(rng.sample(options, rng.randint(1, 2))) for _ in range(size)]
+
+        def score():
+            return [
+                (self.lec.bonus_points(selected, exact, 2, 3), self.lec.bonus_points(selected, subset, 2, 3))
+                for selected in selections
+            ]
+        return score, ()
+
+    def bench_voting_summary(self, size):
+        rng = self.rng(size)
+        polls = max(size // 100, 1)
+        match_rows = []
+        for i in range(polls):
+            (match_id, team1, team2, match_type), options = generate_match(rng, i)
+            votes = sorted(((option, rng.randint(0, size)) for option in options), key=lambda row: -row[1])
+            match_rows += [(match_id, team1, team2, match_type, option, count) for option, count in votes]
+        bonus_rows = [
+            (question_id, f"Question {question_id}", team, rng.randint(0, size))
+            for question_id in range(1, polls + 1) for team in TEAMS[:4]
+        ]
+        return self.lec.format_voting_summary, ("2026-01-01", match_rows, bonus_rows)
+
+    def bench_predictions_table(self, size):
+        rng = self.rng(size)
+        standings, usernames = generate_standings(rng, size)
+        users = sorted(((usernames[user_id], data["total"], None) for user_id, data in standings.items()), key=lambda row: -row[1])
+        matches, predictions = generate_predictions(rng, size)
+        return self.lec.render_predictions_table, ("01-01", users, [match for match, _ in matches], predictions)
+
+    def all(self):
+        return [name[len("bench_"):] for name in dir(self) if name.startswith("bench_")]
+
+
+def measure(function, args, min_time, max_rounds, min_rounds=3):
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_rounds and (len(timings) < min_rounds or time.perf_counter() - started < min_time):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return {
+        "min": min(timings),
+        "max": max(timings),
+        "mean": statistics.mean(timings),
+        "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "median": statistics.median(timings),
+        "rounds": len(timings),
+    }
+
+
+def print_table(results, baseline):
+    name_width = max(len(name) for name in results) + 2
+    header = f"{'Name (time in ms)':<{name_width}}{'Min':>12}{'Max':>12}{'Mean':>12}{'StdDev':>12}{'Median':>12}{'Rounds':>8}"
+    if baseline:
+        header += f"{'vs base':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in results.items():
+        line = (f"{name:<{name_width}}{stats['min'] * 1000:>12.3f}{stats['max'] * 1000:>12.3f}{stats['mean'] * 1000:>12.3f}"
+                f"{stats['stddev'] * 1000:>12.3f}{stats['median'] * 1000:>12.3f}{stats['rounds']:>8}")
+        if baseline:
+            before = baseline.get(name)
+            line += f"{(stats['median'] / before['median'] - 1) * 100:>+9.1f}%" if before else f"{'new':>10}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scoring, ranking and rendering helpers.")
+    parser.add_argument("--sizes", default="100,1000,10000,100000", help="comma separated user counts")
+    parser.add_argument("-k", dest="select", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds to keep repeating each benchmark")
+    parser.add_argument("--max-rounds", type=int, default=200)
+    parser.add_argument("--max-render-users", type=int, default=5000, help="skip predictions_table above this size")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", metavar="NAME", help="save the results as .benchmarks/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="compare against .benchmarks/NAME.json")
+    args = parser.parse_args()
+
+    # bot_lec opens its database on import, keep that away from the real predictions.db
+    os.environ["PREDICTIONS_DB"] = os.path.join(tempfile.mkdtemp(prefix="lec-bench-"), "predictions.db")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    import bot_lec
+
+    baseline = None
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json")) as baseline_file:
+            baseline = json.load(baseline_file)["benchmarks"]
+
+    benchmarks = Benchmarks(bot_lec, args.seed)
+    results = {}
+    for name in benchmarks.all():
+        if args.select not in name:
+            continue
+        for size in [int(size) for size in args.sizes.split(",")]:
+            if name == "predictions_table" and size > args.max_render_users:
+                continue
+            function, function_args = getattr(benchmarks, f"bench_{name}")(size)
+            results[f"{name}[{size}]"] = measure(function, function_args, args.min_time, args.max_rounds)
+            print(f"  {name}[{size}] done", file=sys.stderr)
+
+    print_table(results, baseline)
+
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(os.path.join(BASELINE_DIR, f"{args.save}.json"), "w") as baseline_file:
+            json.dump({
+                "saved": datetime.now().isoformat(timespec="seconds"),
+                "machine": {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.processor()},
+                "seed": args.seed,
+                "benchmarks": results,
+            }, baseline_file, indent=2)
+        print(f"Saved to {BASELINE_DIR}/{args.save}.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,68 @@
 import asyncio
 import discord
-from discord.ext import commands
-import sqlite3
+from discord.ext import commands, tasks
 import os
 from dotenv import load_dotenv
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from datetime import datetime, timedelta
 import pytz
 import re
+import csv
 import json
 import functools
-from PIL import Image, ImageDraw, ImageFont
+import time
+import contextlib
 import io
+import logging
+import metrics
+import sql_profiler
+from bot_logging import configure_logging
+from scoring import match_points, bonus_points
+import config
+import emojis
+import tenants
+from week_calendar import WeekCalendar
 
 # Load environment variables
 load_dotenv()
+configure_logging()
+log = logging.getLogger("lec")
+reaction_log = logging.getLogger("lec.reactions")
+leaderboard_log = logging.getLogger("lec.leaderboard")
 TOKEN = os.getenv("DISCORD_BOT_TOKEN")
+STARTED_AT = time.monotonic()
+
+@contextlib.contextmanager
+def startup_phase(name):
+    """
+    Logs how long a step of startup took, so slow restarts show where the time goes.
+    """
+    start = time.monotonic()
+    yield
+    seconds = time.monotonic() - start
+    metrics.observe("startup_phase_seconds", seconds, phase=name)
+    log.info("Startup: %s took %.0f ms", name, seconds * 1000)
+
+# Which tournament this bot runs when there's no TENANTS_FILE: picks the stage model (LEC weeks, Internationals G/SF/F stages)
+TOURNAMENT = os.getenv("TOURNAMENT", "lec").lower()
+
+# Live poll embeds: edit prediction polls with the current vote split
+LIVE_POLL_EMBEDS = os.getenv("LIVE_POLL_EMBEDS", "false").lower() in ("1", "true", "yes")
+LIVE_POLL_EDIT_INTERVAL = int(os.getenv("LIVE_POLL_EDIT_INTERVAL", "15"))  # Minimum seconds between edits of one message
+LIVE_POLL_BAR_WIDTH = 10
+
+# How often to check CONFIG_FILE for changes to emotes, reaction sets, stages and channels, see config.py
+CONFIG_RELOAD_INTERVAL = int(os.getenv("CONFIG_RELOAD_INTERVAL", "30"))
+
+# Directory !results feed:<file> reads result files from, e.g. where a stats export drops them. Off when unset.
+RESULTS_FEED_DIR = os.getenv("RESULTS_FEED_DIR")
+
+# Sharding: SHARD_COUNT switches to AutoShardedBot. Several processes can split the shards with SHARD_IDS ("0-3", "4-7"),
+# each then only serves, and only writes to the databases of, the tenants whose guild is on its own shards.
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))
+SHARD_IDS = tenants.parse_shard_ids(os.getenv("SHARD_IDS"))
+if SHARD_IDS and not SHARD_COUNT:
+    raise ValueError("SHARD_IDS needs SHARD_COUNT")
 
 # Bot setup
 intents = discord.Intents.default()
@@ -23,191 +70,812 @@ intents.messages = True
 intents.message_content = True
 intents.reactions = True
 intents.members = True
-bot = commands.Bot(command_prefix="!", intents=intents)
-
-# Create a scheduler
+if SHARD_COUNT:
+    bot = commands.AutoShardedBot(command_prefix="!", intents=intents, shard_count=SHARD_COUNT,
+                                  shard_ids=sorted(SHARD_IDS) if SHARD_IDS else None, chunk_guilds_at_startup=False)
+else:
+    # Nothing reads the member cache, so don't hold up on_ready downloading every member list
+    bot = commands.Bot(command_prefix="!", intents=intents, chunk_guilds_at_startup=False)
+
+# Create a scheduler (started in setup_hook, on the bot's own event loop)
 scheduler = AsyncIOScheduler()
 uk_tz = pytz.timezone("Europe/London")
 
-# Start the event loop and scheduler
-async def main():
-    scheduler.start()  # Start the scheduler
-    print("Scheduler started")
-
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
-loop.run_until_complete(main())
-
-# Database setup
-conn = sqlite3.connect('predictions.db')
-cursor = conn.cursor()
-
-# Create the matches table
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS matches (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    team1 TEXT NOT NULL,
-    team2 TEXT NOT NULL,
-    match_type TEXT NOT NULL,
-    match_date TEXT NOT NULL,  -- Date of the match
-    match_week INTEGER NOT NULL,
-    poll_created BOOLEAN DEFAULT FALSE, -- Track poll creation
-    poll_message_id TEXT,
-    winner TEXT,
-    score TEXT,
-    winner_points INTEGER DEFAULT 0,
-    scoreline_points INTEGER DEFAULT 0
-)
-''')
-conn.commit()
-
-# Create the predictions table with foreign key reference to matches
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS predictions (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_id INTEGER NOT NULL,
-    pred_winner TEXT,
-    pred_score TEXT,
-    match_id INTEGER,
-    match_week INTEGER NOT NULL,
-    points INTEGER DEFAULT 0,
-    FOREIGN KEY (match_id) REFERENCES matches(id) ON DELETE CASCADE,
-    UNIQUE(user_id, match_id)
-)
-''')
-
-# Commit changes to the database
-conn.commit()
-
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS bonus_answers (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    question_id INTEGER NOT NULL,
-    match_week INTEGER NOT NULL,
-    user_id INTEGER NOT NULL,
-    answer TEXT NOT NULL,
-    points INTEGER DEFAULT 0,
-    UNIQUE(question_id, user_id),  -- Ensure one answer per user per question
-    FOREIGN KEY (question_id) REFERENCES bonus_questions (id)
-)
-''')
-conn.commit()
-
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS bonus_questions (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    question TEXT NOT NULL,
-    description TEXT NOT NULL,
-    options TEXT NOT NULL,
-    required_answers INTEGER NOT NULL,
-    correct_answer TEXT,
-    date DATE,
-    match_week INTEGER NOT NULL,
-    poll_created BOOLEAN DEFAULT FALSE,
-    points INTEGER NOT NULL,
-    reaction_type TEXT
-);
-
-''')
-conn.commit()
-
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS users (
-    user_id INTEGER PRIMARY KEY,
-    username TEXT NOT NULL
-)
-''')
-conn.commit()
-
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS leaderboard (
-    user_id INTEGER,
-    match_week INTEGER,
-    weekly_points INTEGER DEFAULT 0,
-    PRIMARY KEY (user_id, match_week)
-)
-''')
-conn.commit()
-
-REACTION_SETS = {
-    'set1': ['🟦', '🔵', '💙', '❤️', '🔴', '🟥'],  # Blue/Red themed emojis only
-}
+# How late a scheduled job may still run, e.g. after the bot was down when it came due
+JOB_MISFIRE_GRACE = timedelta(hours=int(os.getenv("JOB_MISFIRE_GRACE_HOURS", "6")))
 
-TOURNAMENT_STAGES = {
-    1: ('Week 1', 1),
-    2: ('Week 2', 2),
-    3: ('Week 3', 3),
-    4: ('Week 4', 4),
-    5: ('Week 5', 5),
-    6: ('Week 6', 6),
-    7: ('Week 7', 7),
-    8: ('Week 8', 8),
-    9: ('Week 9', 9),
-    10: ('Week 10', 10)
-}
+# Database setup: every tenant has its own database. cursor, conn and STAGE_MODEL stand for the
+# active tenant's, see tenants.py; with a single tenant that's always the one.
+TENANTS = tenants.load(TOURNAMENT, os.getenv("PREDICTIONS_DB", "predictions.db"), SHARD_IDS, SHARD_COUNT or 1)
+with startup_phase("open databases"):
+    for tenant in TENANTS.tenants:
+        tenant.connect(lambda tenant_cursor: metrics.instrument_cursor(sql_profiler.profile_cursor(tenant_cursor)))
+conn = tenants.TenantAttribute("conn")
+cursor = tenants.TenantAttribute("cursor")
+STAGE_MODEL = tenants.TenantAttribute("stage_model")
 
-TEAM_EMOTES = {
-    "KOI": "<:Koi:1330749930167603311>",
-    "SK": "<:SK:1330750495169445928>",
-    "FNC": "<:Fnatic:1330750485568946317>",
-    "G2": "<:G2:1330750487762440222>",
-    "TH": "<:Heretics:1330750491046445106>",
-    "NAVI": "<:NaVi:1402724220978331808>",
-    "VIT": "<:Vitality:1330750496557760624>",
-    "GX": "<:GiantX:1330750489285103616>",
-    "KC": "<:KC:1330750492552466463>",
-    "SHFT": "<:Shifters:1459685880636641391>",
-    "LR": "<:LosRatones:1459685744325951672>",
-    "KCB": "<:KCorpBlue:1459685949675016314>"
-}
+def ensure_column(table, column, definition):
+    """
+    Adds a column to an existing table if an older predictions.db doesn't have it yet.
+    """
+    cursor.execute(f'PRAGMA table_info({table})')
+    if column not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
 
-team_emote_ids = {
-    "KOI": 1330749930167603311,
-    "SK": 1330750495169445928,
-    "FNC": 1330750485568946317,
-    "G2": 1330750487762440222,
-    "TH": 1330750491046445106,
-    "NAVI": 1402724220978331808,
-    "VIT": 1330750496557760624,
-    "GX": 1330750489285103616,
-    "KC": 1330750492552466463,
-    "SHFT": 1459685880636641391,
-    "LR": 1459685744325951672,
-    "KCB": 1459685949675016314
-}
+def setup_database():
+    """
+    Creates or upgrades the active tenant's tables as one migration: a single commit at startup,
+    and a failed upgrade leaves the database as it was.
+    """
+    # sqlite3 doesn't open a transaction for CREATE/ALTER by itself
+    cursor.execute('BEGIN')
+    try:
+        create_tables()
+        refresh_stages()
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
+
+def create_tables():
+    # Create the matches table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS matches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        team1 TEXT NOT NULL,
+        team2 TEXT NOT NULL,
+        match_type TEXT NOT NULL,
+        match_date TEXT NOT NULL,  -- Date of the match
+        match_week INTEGER NOT NULL,
+        poll_created BOOLEAN DEFAULT FALSE, -- Track poll creation
+        poll_message_id TEXT,
+        winner TEXT,
+        score TEXT,
+        winner_points INTEGER DEFAULT 0,
+        scoreline_points INTEGER DEFAULT 0
+    )
+    ''')
+
+    # Create the predictions table with foreign key reference to matches
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS predictions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        pred_winner TEXT,
+        pred_score TEXT,
+        match_id INTEGER,
+        match_week INTEGER NOT NULL,
+        points INTEGER DEFAULT 0,
+        FOREIGN KEY (match_id) REFERENCES matches(id) ON DELETE CASCADE,
+        UNIQUE(user_id, match_id)
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS bonus_answers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        question_id INTEGER NOT NULL,
+        match_week INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        answer TEXT NOT NULL,
+        points INTEGER DEFAULT 0,
+        UNIQUE(question_id, user_id),  -- Ensure one answer per user per question
+        FOREIGN KEY (question_id) REFERENCES bonus_questions (id)
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS bonus_questions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        question TEXT NOT NULL,
+        description TEXT NOT NULL,
+        options TEXT NOT NULL,
+        required_answers INTEGER NOT NULL,
+        correct_answer TEXT,
+        date DATE,
+        match_week INTEGER NOT NULL,
+        poll_created BOOLEAN DEFAULT FALSE,
+        points INTEGER NOT NULL,
+        reaction_type TEXT
+    );
+
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS users (
+        user_id INTEGER PRIMARY KEY,
+        username TEXT NOT NULL
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS leaderboard (
+        user_id INTEGER,
+        match_week INTEGER,
+        weekly_points INTEGER DEFAULT 0,
+        PRIMARY KEY (user_id, match_week)
+    )
+    ''')
+
+    # Running vote counts per poll option, kept in step with predictions/bonus_answers
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS poll_tallies (
+        poll_type TEXT NOT NULL,  -- 'match' or 'bonus'
+        poll_id INTEGER NOT NULL,  -- matches.id or bonus_questions.id
+        option TEXT NOT NULL,  -- "G2 2-0" for matches, the option text for bonus questions
+        votes INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (poll_type, poll_id, option)
+    )
+    ''')
+
+    # Scheduled jobs survive restarts here and are re-added to the scheduler on startup
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS scheduled_jobs (
+        id TEXT PRIMARY KEY,  -- e.g. "delete_polls:12-03", so the same job can't be queued twice
+        kind TEXT NOT NULL,  -- key into JOB_HANDLERS
+        run_at TEXT NOT NULL,  -- UTC, ISO format
+        args TEXT NOT NULL,  -- JSON list of arguments for the handler
+        status TEXT NOT NULL DEFAULT 'pending'  -- pending, running, done, failed, missed, interrupted
+    )
+    ''')
+
+    # Small key/value store for bot bookkeeping, e.g. the reaction event watermark
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS bot_state (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    ''')
+
+    # Append-only record of every accepted vote, result and standings change, replayed by replay.py
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS event_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        logged_at TEXT NOT NULL,  -- UTC, ISO format
+        kind TEXT NOT NULL,  -- see log_event
+        data TEXT NOT NULL  -- JSON
+    )
+    ''')
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_date_id ON matches (match_date, id)')
+
+    # Message IDs of the prediction poll (poll channel) and result poll (admin channel)
+    ensure_column('matches', 'result_message_id', 'TEXT')
+    ensure_column('bonus_questions', 'poll_message_id', 'TEXT')
+    ensure_column('bonus_questions', 'result_message_id', 'TEXT')
+
+    # Set once delete_polls has removed the prediction poll; poll_created stays set so it isn't posted again
+    ensure_column('matches', 'poll_deleted', 'BOOLEAN DEFAULT FALSE')
+    ensure_column('bonus_questions', 'poll_deleted', 'BOOLEAN DEFAULT FALSE')
+
+    # Internationals databases from before the shared bot have no reaction_type; their polls used numbers
+    ensure_column('bonus_questions', 'reaction_type', "TEXT DEFAULT 'numbers'")
+    cursor.execute("UPDATE bonus_questions SET reaction_type = 'numbers' WHERE reaction_type IS NULL")
+
+    # Stage keys (the match_week values) with their order, so queries sort on an indexed integer
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS stages (
+        stage TEXT PRIMARY KEY,  -- match_week value, e.g. 3 or 'SF'
+        stage_order INTEGER NOT NULL UNIQUE,
+        name TEXT NOT NULL
+    )
+    ''')
+
+def refresh_stages(stage_model=None):
+    """
+    Rewrites the active tenant's stages table from stage_model, STAGE_MODEL by default. Doesn't commit.
+    """
+    cursor.execute('DELETE FROM stages')
+    cursor.executemany('INSERT INTO stages (stage, stage_order, name) VALUES (?, ?, ?)', (stage_model or STAGE_MODEL).rows())
+
+with startup_phase("database migrations"):
+    for tenant in TENANTS.tenants:
+        with tenants.using(tenant):
+            setup_database()
+
+# Team emotes and the emoji registry come from the live configuration (config.py), so they can change without a restart
+TEAM_EMOTES = config.ConfigAttribute("team_emotes")
+EMOJIS = config.ConfigAttribute("emojis")
+
+def match_layout():
+    """
+    Where the active tenant's match poll options sit in a reaction set, see emojis.MATCH_LAYOUTS.
+    """
+    return tenants.active().match_layout
+
+def apply_config(snapshot):
+    """
+    Moves the tenants onto a newly loaded configuration's channels and stage models. config.reload calls this
+    before the new configuration goes live. Everything that can fail (checks, the stages table writes) happens
+    first, and a failure raises with channels, stage models and stages tables left as they were.
+    """
+    changed = []  # (tenant, new stage model)
+    for tenant in TENANTS.tenants:
+        stage_model = snapshot.stage_models[tenant.tournament]
+        if stage_model.assigned_by_date != tenant.stage_model.assigned_by_date:
+            # Stored match_week values are week numbers or stage codes, they can't be reinterpreted in place
+            raise ValueError(f"Stages for {tenant.name} can't switch between numbered weeks and named stages without a restart")
+        if stage_model.rows() != tenant.stage_model.rows():
+            changed.append((tenant, stage_model))
+    channel_plan = TENANTS.plan_channels(snapshot.channels)
+
+    committed = []
+    try:
+        for tenant, stage_model in changed:
+            with tenants.using(tenant):
+                cursor.execute('BEGIN')
+                refresh_stages(stage_model)
+        for tenant, _ in changed:
+            tenant.conn.commit()
+            committed.append(tenant)
+    except Exception:
+        for tenant, _ in changed:
+            with tenants.using(tenant):
+                if tenant in committed:
+                    refresh_stages()  # Back to the stage model that stays live
+                    conn.commit()
+                else:
+                    conn.rollback()
+        raise
+
+    # Nothing below can fail
+    TENANTS.set_channels(channel_plan)
+    for tenant, stage_model in changed:
+        tenant.stage_model = stage_model
+        with tenants.using(tenant):
+            week_calendars.pop("calendar", None)
+            invalidate_predictions_view()
+        log.info("Stages for %s are now %s", tenant.name, ", ".join(stage_model.names[key] for key in stage_model.keys))
+
+def channel_id(role):
+    """
+    ID of one of the active tenant's channels: poll, admin, leaderboard, bot or announcements,
+    or None for an announce target (public_announcements, ping_announcements) it doesn't have.
+    """
+    return tenants.active().channels.get(role)
+
+@bot.check
+async def bind_tenant(ctx):
+    """
+    Global check: makes the tenant of the channel (or guild) a command was sent from active for the command.
+    """
+    tenant = TENANTS.resolve(ctx.channel.id, ctx.guild.id if ctx.guild else None)
+    if tenant is None:
+        return False
+    tenants.activate(tenant)
+    return True
 
 def is_mod_channel(ctx):
-    admin_channel_id = 1346615169433997322
+    admin_channel_id = channel_id("admin")
     return ctx.channel.id == admin_channel_id
 
+def poll_type_from_title(title):
+    """
+    Which kind of poll an embed is, from its title. None for unrelated embeds.
+    """
+    if "Match Poll" in title:
+        return "match_poll"
+    elif "Result Poll" in title:
+        return "result_poll"
+    elif "Bonus Question Result" in title:
+        return "bonus_result"
+    elif "Bonus Question" in title:
+        return "bonus_poll"
+    return None
+
+def bump_tally(poll_type, poll_id, option, delta):
+    """
+    Adjusts the vote count for one poll option.
+    Doesn't commit, so the vote and its tally change land in the same transaction.
+    """
+    cursor.execute('''
+    INSERT INTO poll_tallies (poll_type, poll_id, option, votes)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(poll_type, poll_id, option) DO UPDATE SET
+        votes = poll_tallies.votes + excluded.votes
+    ''', (poll_type, poll_id, option, delta))
+
+def log_event(kind, **data):
+    """
+    Appends to event_log, see replay.py for what each kind carries.
+    Doesn't commit, so the event lands in the same transaction as the change it records.
+    """
+    cursor.execute('''
+    INSERT INTO event_log (logged_at, kind, data) VALUES (?, ?, ?)
+    ''', (discord.utils.utcnow().isoformat(timespec="milliseconds"), kind, json.dumps(data)))
+
+def count_raw_votes():
+    """
+    Counts votes straight from predictions and bonus_answers.
+    Returns {(poll_type, poll_id, option): votes}.
+    """
+    counts = {}
+    cursor.execute('''
+    SELECT match_id, pred_winner || ' ' || pred_score, COUNT(*)
+    FROM predictions
+    WHERE match_id IN (SELECT id FROM matches)
+    GROUP BY match_id, pred_winner, pred_score
+    ''')
+    for match_id, option, votes in cursor.fetchall():
+        counts[("match", match_id, option)] = votes
+
+    cursor.execute('''
+    SELECT bonus_answers.question_id, answer_options.value, COUNT(*)
+    FROM bonus_answers, json_each(bonus_answers.answer) AS answer_options
+    WHERE json_valid(bonus_answers.answer)
+    GROUP BY bonus_answers.question_id, answer_options.value
+    ''')
+    for question_id, option, votes in cursor.fetchall():
+        counts[("bonus", question_id, option)] = votes
+
+    return counts
+
+def reconcile_poll_tallies():
+    """
+    Checks poll_tallies against the raw vote tables and fixes any drifted rows.
+    Returns the number of rows that had to be corrected.
+    """
+    expected = count_raw_votes()
+
+    cursor.execute('SELECT poll_type, poll_id, option, votes FROM poll_tallies')
+    actual = {(poll_type, poll_id, option): votes for poll_type, poll_id, option, votes in cursor.fetchall()}
+
+    drifted = [key for key in expected.keys() | actual.keys() if expected.get(key, 0) != actual.get(key, 0)]
+    for poll_type, poll_id, option in drifted:
+        votes = expected.get((poll_type, poll_id, option), 0)
+        if votes:
+            cursor.execute('''
+            INSERT INTO poll_tallies (poll_type, poll_id, option, votes)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(poll_type, poll_id, option) DO UPDATE SET votes = excluded.votes
+            ''', (poll_type, poll_id, option, votes))
+        else:
+            cursor.execute('''
+            DELETE FROM poll_tallies
+            WHERE poll_type = ? AND poll_id = ? AND option = ?
+            ''', (poll_type, poll_id, option))
+    conn.commit()
+
+    return len(drifted)
+
+# message_id -> {"tenant", "poll_type", "poll_id", "channel_id", "embed", "fields": [(name, option)], "counts": {option: votes}, "last_edit"}
+live_polls = {}
+live_polls_dirty = set()
+
+def render_vote_bar(option, votes, total_votes):
+    """
+    Poll field value: the option on the first line, its share of the vote underneath.
+    """
+    share = votes / total_votes if total_votes else 0
+    filled = round(share * LIVE_POLL_BAR_WIDTH)
+    return f"{option}\n{'█' * filled}{'░' * (LIVE_POLL_BAR_WIDTH - filled)} {share:.0%} ({votes})"
+
+def track_live_vote(message, poll_type, poll_id, changes):
+    """
+    Applies vote changes ({option: delta}) to the in-memory tally of a prediction poll
+    and marks its embed for the next throttled edit. Call after the vote is committed.
+    """
+    if not LIVE_POLL_EMBEDS:
+        return
+
+    poll = live_polls.get(message.id)
+    if poll is None:
+        # First vote seen on this message since startup, seed from poll_tallies (already includes this change)
+        cursor.execute('''
+        SELECT option, votes FROM poll_tallies
+        WHERE poll_type = ? AND poll_id = ?
+        ''', (poll_type, poll_id))
+        embed = message.embeds[0]
+        live_polls[message.id] = {
+            "tenant": tenants.active(),
+            "poll_type": poll_type,
+            "poll_id": poll_id,
+            "channel_id": message.channel.id,
+            "embed": embed,
+            "fields": [(field.name, field.value.split("\n")[0]) for field in embed.fields],
+            "counts": dict(cursor.fetchall()),
+            "last_edit": 0.0
+        }
+    else:
+        for option, delta in changes.items():
+            poll["counts"][option] = poll["counts"].get(option, 0) + delta
+
+    live_polls_dirty.add(message.id)
+
+def refresh_live_polls():
+    """
+    Re-reads the active tenant's in-memory tallies from poll_tallies, after counts were corrected in bulk.
+    """
+    tenant = tenants.active()
+    for message_id, poll in live_polls.items():
+        if poll["tenant"] is not tenant:
+            continue
+        cursor.execute('''
+        SELECT option, votes FROM poll_tallies
+        WHERE poll_type = ? AND poll_id = ?
+        ''', (poll["poll_type"], poll["poll_id"]))
+        counts = dict(cursor.fetchall())
+        if counts != poll["counts"]:
+            poll["counts"] = counts
+            live_polls_dirty.add(message_id)
+
+def build_live_poll_embed(poll):
+    embed = poll["embed"].copy()
+    embed.clear_fields()
+    total_votes = sum(max(poll["counts"].get(option, 0), 0) for _, option in poll["fields"])
+    for name, option in poll["fields"]:
+        votes = max(poll["counts"].get(option, 0), 0)
+        embed.add_field(name=name, value=render_vote_bar(option, votes, total_votes), inline=False)
+    return embed
+
+async def edit_live_poll(message_id, poll):
+    try:
+        channel = bot.get_channel(poll["channel_id"])
+        await channel.get_partial_message(message_id).edit(embed=build_live_poll_embed(poll))
+    except discord.NotFound:
+        live_polls.pop(message_id, None)  # Poll was deleted
+    except Exception as e:
+        log.error("Error updating live poll %s: %s", message_id, e)
+
+@tasks.loop(seconds=1)
+async def live_poll_flusher():
+    """
+    Edits every poll with new votes, at most once per LIVE_POLL_EDIT_INTERVAL seconds per message.
+    """
+    now = time.monotonic()
+    due = []
+    for message_id in list(live_polls_dirty):
+        poll = live_polls.get(message_id)
+        if poll is None:
+            live_polls_dirty.discard(message_id)
+        elif now - poll["last_edit"] >= LIVE_POLL_EDIT_INTERVAL:
+            live_polls_dirty.discard(message_id)
+            poll["last_edit"] = now
+            due.append(edit_live_poll(message_id, poll))
+    if due:
+        await asyncio.gather(*due)
+
+@tasks.loop(seconds=CONFIG_RELOAD_INTERVAL)
+async def config_watcher():
+    try:
+        config.reload(apply=apply_config)
+    except Exception as e:
+        log.error("Error reloading configuration: %s", e)
+
+@tasks.loop(minutes=15)
+async def tally_reconciler():
+    """
+    Started in setup_hook; the first run waits for the gateway so it doesn't delay connecting.
+    """
+    for tenant in TENANTS.tenants:
+        with tenants.using(tenant):
+            try:
+                drifted = reconcile_poll_tallies()
+                if drifted:
+                    refresh_live_polls()
+                    log.warning("Poll tallies for %s drifted on %d option(s), corrected from raw votes.", tenant.name, drifted)
+            except Exception as e:
+                log.error("Error reconciling poll tallies for %s: %s", tenant.name, e)
+
+def get_state(key):
+    cursor.execute('SELECT value FROM bot_state WHERE key = ?', (key,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def set_state(key, value):
+    cursor.execute('''
+    INSERT INTO bot_state (key, value) VALUES (?, ?)
+    ON CONFLICT(key) DO UPDATE SET value = excluded.value
+    ''', (key, value))
+    conn.commit()
+
+# Per tenant: {"handled": time of the last reaction event handled, "saved": the time last written to bot_state}.
+# Saved to the tenant's bot_state every minute. It only dates the gap in the recovery log: Discord doesn't say
+# which messages got reactions while the bot was away, so it can't narrow recovery.
+reaction_watermarks = tenants.TenantDict("reaction_watermark")
+reaction_events_waiting = 0  # Events held back by a running recovery
+# Cleared while missed reactions are being recovered, so live events wait instead of racing the diff
+reactions_open = asyncio.Event()
+reactions_open.set()
+reaction_recovery_lock = asyncio.Lock()
+
+@contextlib.asynccontextmanager
+async def reactions_held():
+    """
+    Holds live reaction events for a block that diffs poll reactions against the database, so a vote can't be
+    written between the reactor fetch and the diff and then be removed by it. One block runs at a time.
+    """
+    async with reaction_recovery_lock:
+        reactions_open.clear()
+        try:
+            yield
+        finally:
+            reactions_open.set()
+
+async def wait_for_reaction_recovery():
+    """
+    Holds a reaction event until any running recovery has finished, then moves the active tenant's watermark.
+    """
+    global reaction_events_waiting
+    if not reactions_open.is_set():
+        reaction_events_waiting += 1
+        try:
+            await reactions_open.wait()
+        finally:
+            reaction_events_waiting -= 1
+    reaction_watermarks["handled"] = discord.utils.utcnow()
+
+@tally_reconciler.before_loop
+async def before_tally_reconciler():
+    await bot.wait_until_ready()
+
+@tasks.loop(minutes=1)
+async def reaction_watermark_saver():
+    for tenant in TENANTS.tenants:
+        with tenants.using(tenant):
+            handled = reaction_watermarks.get("handled")
+            if handled and handled != reaction_watermarks.get("saved"):
+                set_state("last_reaction_event", handled.isoformat())
+                reaction_watermarks["saved"] = handled
+
+# Per tenant: message_id -> Message for prediction polls, so a vote doesn't need a REST fetch of its poll
+poll_messages = tenants.TenantDict("poll_messages")
+# Per tenant: user_id -> username, from the users table and the members on reaction events
+known_users = tenants.TenantDict("known_users")
+
+class KnownUser:
+    """
+    The parts of a discord.User the reaction handlers use, for someone already known by name.
+    """
+
+    def __init__(self, user_id, name):
+        self.id = user_id
+        self.name = name
+        self.mention = f"<@{user_id}>"
+
+async def reaction_user(payload):
+    """
+    Who reacted: the payload's member, then the known users, and only then a REST lookup.
+    """
+    if payload.member is not None:
+        known_users[payload.user_id] = payload.member.name
+        return payload.member
+    name = known_users.get(payload.user_id)
+    if name is not None:
+        return KnownUser(payload.user_id, name)
+    user = bot.get_user(payload.user_id) or await bot.fetch_user(payload.user_id)
+    known_users[user.id] = user.name
+    return user
+
+async def poll_message(channel, message_id):
+    """
+    A message reacted to, from the index for prediction polls. Admin channel messages are always fetched,
+    since their handlers look at the current reactions.
+    """
+    message = poll_messages.get(message_id)
+    if message is None:
+        message = await channel.fetch_message(message_id)
+        if channel.id == channel_id("poll") and message.embeds:
+            poll_messages[message_id] = message
+    return message
+
+def warm_caches():
+    """
+    Bulk-loads the active tenant's lookups after a restart, so the first reactions don't all miss: usernames
+    from the users table and every user's latest predicted week. Open poll messages go into the index as
+    the reaction recovery fetches them.
+    """
+    cursor.execute('SELECT user_id, username FROM users')
+    known_users.update(cursor.fetchall())
+    cursor.execute('''
+    SELECT predictions.user_id, predictions.match_week, MAX(stages.stage_order)
+    FROM predictions
+    JOIN stages ON stages.stage = predictions.match_week
+    GROUP BY predictions.user_id
+    ''')
+    latest_prediction_week_cache.update((user_id, match_week) for user_id, match_week, _ in cursor.fetchall())
+    return len(known_users)
+
+async def recover_missed_reactions(reason):
+    """
+    Reconciles the open polls with their reactions after the bot may have missed events,
+    i.e. after a (re)connect. Every open poll is checked however short the gap was, as a missed event
+    can be on any of them; only open polls are fetched, so this doesn't depend on channel history.
+    """
+    if reaction_recovery_lock.locked():
+        return
+    async with reactions_held():
+        recovered_at = discord.utils.utcnow()
+        if reason == "ready":
+            with startup_phase("cache warm-up"):
+                for tenant in TENANTS.tenants:
+                    with tenants.using(tenant):
+                        users = warm_caches()
+                        log.info("Warm-up for %s: %d known users", tenant.name, users)
+        for tenant in TENANTS.tenants:
+            with tenants.using(tenant):
+                try:
+                    handled = reaction_watermarks.get("handled")
+                    watermark = handled.isoformat() if handled else get_state("last_reaction_event")
+                    report = await reconcile_poll_reactions()
+                    set_state("last_reaction_event", recovered_at.isoformat())
+                    reaction_watermarks["handled"] = reaction_watermarks["saved"] = recovered_at
+
+                    drift = report["added"] + report["changed"] + report["removed"]
+                    reaction_log.info("Reaction recovery for %s (%s, last event %s): %d open polls, %d indexed, %d vote(s) recovered.",
+                                      tenant.name, reason, watermark or "never", report["polls"], len(poll_messages), drift)
+                    if drift:
+                        bot_channel = bot.get_channel(channel_id("bot"))
+                        if bot_channel:
+                            await bot_channel.send(f"Recovered {report['added']} added, {report['changed']} changed and {report['removed']} removed vote(s) missed while disconnected.")
+                except Exception as e:
+                    reaction_log.exception("Error recovering missed reactions for %s: %s", tenant.name, e)
+
+@bot.event
+async def setup_hook():
+    """
+    Starts the background services before the gateway connection, keeping this short: the bot isn't
+    receiving votes until it returns.
+    """
+    with startup_phase("configuration"):
+        # A broken config file stops the bot here rather than running with half of it
+        config.reload(strict=True, apply=apply_config)
+    with startup_phase("scheduled jobs"):
+        scheduler.start()
+        for tenant in TENANTS.tenants:
+            with tenants.using(tenant):
+                restore_scheduled_jobs()
+
+    with startup_phase("metrics"):
+        metrics.instrument_http(bot.http)
+        metrics.instrument_commands(bot)
+        metrics.gauge("live_polls_pending_edits", lambda: len(live_polls_dirty))
+        metrics.gauge("reaction_events_waiting", lambda: reaction_events_waiting)
+        metrics.gauge("scheduled_jobs_pending", lambda: len(scheduler.get_jobs()))
+        await metrics.start_server()
+
+    config_watcher.start()
+    reaction_watermark_saver.start()
+    tally_reconciler.start()
+    # Reactions wait until on_ready has warmed the caches and recovered missed votes
+    reactions_open.clear()
+    log.info("Startup: setup done %.1fs after start, connecting to the gateway", time.monotonic() - STARTED_AT)
+
 # Event: Bot ready
 @bot.event
 async def on_ready():
-    print(f"Logged in as {bot.user}")
+    log.info("Logged in as %s, ready %.1fs after start", bot.user, time.monotonic() - STARTED_AT)
+    if SHARD_COUNT:
+        log.info("Running shards %s of %s for tenants %s", sorted(SHARD_IDS) if SHARD_IDS else "all", SHARD_COUNT,
+                 ", ".join(tenant.name for tenant in TENANTS.tenants))
+    if LIVE_POLL_EMBEDS and not live_poll_flusher.is_running():
+        live_poll_flusher.start()
+    await recover_missed_reactions("ready")
 
 @bot.event
+async def on_resumed():
+    await recover_missed_reactions("resumed")
+
+def rank_users(user_data, latest_week):
+    """
+    Orders user IDs by total points, then by the latest week's points,
+    then by earlier weeks (newest first, in STAGE_MODEL order) to break any remaining ties.
+    user_data: {user_id: {"weeks": {week: points}, "total": points}}
+    """
+    earlier_weeks = STAGE_MODEL.tie_break_order(latest_week)
+
+    def compare_with_previous_weeks(user1, user2):
+        for week in earlier_weeks:
+            score1 = user_data[user1]["weeks"].get(week, 0)
+            score2 = user_data[user2]["weeks"].get(week, 0)
+
+            leaderboard_log.debug("Comparing users %s and %s for week %s: score1=%s, score2=%s", user1, user2, week, score1, score2)
+
+            if score1 != score2:
+                return score2 - score1  # Higher score first
+        return 0  # No more weeks to compare, consider them equal
+
+    def sort_key(user):
+        return (user_data[user]["total"], user_data[user]["weeks"].get(latest_week, 0))
+
+    sorted_users = sorted(user_data.keys(), key=sort_key, reverse=True)
+    leaderboard_log.debug("sorted_users before tie-breaking: %s", sorted_users)
+
+    # Handle ties by recursively comparing scores from previous weeks
+    i = 0
+    while i < len(sorted_users) - 1:
+        j = i
+        while j < len(sorted_users) - 1 and sort_key(sorted_users[j]) == sort_key(sorted_users[j + 1]):
+            j += 1
+        if j > i:
+            # There is a tie between sorted_users[i:j+1]
+            tied_users = sorted_users[i:j + 1]
+            leaderboard_log.debug("Tie detected between users: %s", tied_users)
+            try:
+                # Sort tied users using previous weeks' scores
+                tied_users.sort(key=functools.cmp_to_key(compare_with_previous_weeks), reverse=True)
+                sorted_users[i:j + 1] = tied_users
+            except Exception as e:
+                leaderboard_log.error("Error during tie-breaking: %s", e)
+        i = j + 1
+
+    leaderboard_log.debug("sorted_users after tie-breaking: %s", sorted_users)
+    return sorted_users
+
+def format_leaderboard_chunks(sorted_users, user_data, usernames):
+    """
+    Leaderboard text split into messages that stay under Discord's 2000 character limit.
+    """
+    chunks = []
+    current_chunk = "**🏆 Leaderboard 🏆**\n\n"
+    char_count = len(current_chunk)
+
+    for rank, user_id in enumerate(sorted_users, start=1):
+        data = user_data[user_id]
+        week_scores = " | ".join(
+            f"{STAGE_MODEL.short_name(week)}: {points}" for week, points in sorted(data["weeks"].items(), key=lambda item: STAGE_MODEL.order(item[0]))
+        )
+        entry = f"{rank}. **{usernames[user_id]}** - {week_scores} | **Total: {data['total']}**\n"
+
+        # If adding this entry would exceed Discord's limit, start a new chunk
+        if char_count + len(entry) > 1900:
+            chunks.append(current_chunk)
+            current_chunk = entry
+            char_count = len(entry)
+        else:
+            current_chunk += entry
+            char_count += len(entry)
+
+    # Add the final chunk
+    if current_chunk:
+        chunks.append(current_chunk)
+    return chunks
+
+# Per tenant: {"running": bool, "again": bool} for the leaderboard publish in progress
+leaderboard_publishes = tenants.TenantDict("leaderboard_publish")
+
 async def update_leaderboard():
     """
-    Updates the leaderboard message in the dedicated channel.
+    Updates the leaderboard message in the dedicated channel. Only one publish per tenant runs at a time:
+    a call during a publish, e.g. results coming in on another shard, makes the running one go again afterwards
+    instead of purging and posting alongside it.
+    """
+    if leaderboard_publishes.get("running"):
+        leaderboard_publishes["again"] = True
+        metrics.inc("leaderboard_updates_coalesced_total")
+        return
+    leaderboard_publishes["running"] = True
+    try:
+        while True:
+            leaderboard_publishes["again"] = False
+            await publish_leaderboard()
+            if not leaderboard_publishes.get("again"):
+                break
+    finally:
+        leaderboard_publishes["running"] = False
+
+@metrics.timed("leaderboard_update")
+async def publish_leaderboard():
+    """
+    Rebuilds the active tenant's leaderboard and replaces the bot's messages in the leaderboard channel.
     """
     try:
-        leaderboard_channel_id = 1346615199544905730
+        leaderboard_channel_id = channel_id("leaderboard")
         leaderboard_channel = bot.get_channel(leaderboard_channel_id)
 
         if not leaderboard_channel:
-            print("Error: Leaderboard channel not found.")
+            leaderboard_log.error("Leaderboard channel not found.")
             return
 
-        # Fetch leaderboard data (sorted by match week)
+        # Fetch leaderboard data
         cursor.execute('''
             SELECT user_id, match_week, weekly_points
             FROM leaderboard
-            ORDER BY match_week ASC
         ''')
         leaderboard_data = cursor.fetchall()
 
         if not leaderboard_data:
-            leaderboard_message = "**🏆 Leaderboard 🏆**\n\nNo points have been awarded yet!"
+            chunks = ["**🏆 Leaderboard 🏆**\n\nNo points have been awarded yet!"]
         else:
             leaderboard_dict = {}
             user_id_list = set()
@@ -227,133 +895,76 @@ async def update_leaderboard():
             ''', tuple(user_id_list))
             user_data = dict(cursor.fetchall())  # Map user_id -> username
 
-            # Fetch the latest match week
-            cursor.execute('SELECT MAX(match_week) FROM leaderboard')
-            latest_week = cursor.fetchone()[0]
-            print(f"latest_week: {latest_week}")
-
-            def tie_breaker(user_data, latest_week):
-                """
-                Recursively break ties by comparing scores from previous weeks.
-                """
-                def compare_users(user1, user2, week):
-                    if week < 1:
-                        return 0  # No more weeks to compare, consider them equal
-
-                    score1 = user_data[user1]["weeks"].get(week, 0)
-                    score2 = user_data[user2]["weeks"].get(week, 0)
-
-                    print(f"Comparing users {user1} and {user2} for week {week}: score1={score1}, score2={score2}")
-
-                    if score1 != score2:
-                        return score2 - score1  # Higher score first
-
-                    return compare_users(user1, user2, week - 1)  # Compare previous week
-
-                def sort_key(user):
-                    return (user_data[user]["total"], user_data[user]["weeks"].get(latest_week, 0))
-
-                def compare_with_previous_weeks(user1, user2):
-                    # Start comparison from the week before latest_week
-                    return compare_users(user1, user2, latest_week - 1)
-
-                sorted_users = sorted(user_data.keys(), key=sort_key, reverse=True)
-                print(f"sorted_users before tie-breaking: {sorted_users}")
-
-                # Handle ties by recursively comparing scores from previous weeks
-                i = 0
-                while i < len(sorted_users) - 1:
-                    j = i
-                    while j < len(sorted_users) - 1 and sort_key(sorted_users[j]) == sort_key(sorted_users[j + 1]):
-                        j += 1
-                    if j > i:
-                        # There is a tie between sorted_users[i:j+1]
-                        tied_users = sorted_users[i:j + 1]
-                        print(f"Tie detected between users: {tied_users}")
-                        try:
-                            # Sort tied users using previous weeks' scores
-                            tied_users.sort(key=functools.cmp_to_key(compare_with_previous_weeks), reverse=True)
-                            sorted_users[i:j + 1] = tied_users
-                        except Exception as e:
-                            print(f"Error during tie-breaking: {e}")
-                    i = j + 1
-
-                print(f"sorted_users after tie-breaking: {sorted_users}")
-                return sorted_users
-
-            # Usage in update_leaderboard function
-            sorted_users = tie_breaker(leaderboard_dict, latest_week)
-            chunks = []
-            current_chunk = "**🏆 Leaderboard 🏆**\n\n"
-            char_count = len(current_chunk)
-
-            for rank, user_id in enumerate(sorted_users, start=1):
-                data = leaderboard_dict[user_id]
-                username = user_data.get(user_id)
-                if not username:
+            # The latest match week, from the rows already loaded
+            latest_week = max((match_week for _, match_week, _ in leaderboard_data), key=STAGE_MODEL.order)
+            leaderboard_log.debug("latest_week: %s", latest_week)
+
+            sorted_users = rank_users(leaderboard_dict, latest_week)
+
+            # Look up anyone missing from the users table before building the message
+            for user_id in sorted_users:
+                if not user_data.get(user_id):
                     try:
                         user = await bot.fetch_user(user_id)
-                        username = user.name
+                        user_data[user_id] = user.name
                     except:
-                        username = f"Unknown ({user_id})"
+                        user_data[user_id] = f"Unknown ({user_id})"
 
-                week_scores = " | ".join(f"W{week}: {points}" for week, points in sorted(data["weeks"].items()))
-                entry = f"{rank}. **{username}** - {week_scores} | **Total: {data['total']}**\n"
+            chunks = format_leaderboard_chunks(sorted_users, leaderboard_dict, user_data)
 
-                # If adding this entry would exceed Discord's limit, start a new chunk
-                if char_count + len(entry) > 1900:
-                    chunks.append(current_chunk)
-                    current_chunk = entry
-                    char_count = len(entry)
-                else:
-                    current_chunk += entry
-                    char_count += len(entry)
+        # Delete existing messages and send new ones
+        await leaderboard_channel.purge(check=lambda m: m.author == bot.user)
+        for chunk in chunks:
+            await leaderboard_channel.send(chunk)
 
-            # Add the final chunk
-            if current_chunk:
-                chunks.append(current_chunk)
+    except Exception as e:
+        leaderboard_log.exception("Error updating leaderboard: %s", e)
 
-            # Delete existing messages and send new ones
-            await leaderboard_channel.purge(check=lambda m: m.author == bot.user)
-            for chunk in chunks:
-                await leaderboard_channel.send(chunk)
 
-    except Exception as e:
-        print(f"Error updating leaderboard: {e}")
+# Per tenant: {"calendar": WeekCalendar} of the scheduled match days, see week_calendar.py
+week_calendars = tenants.TenantDict("week_calendar")
 
+def week_calendar():
+    """
+    The active tenant's calendar index, loaded from the matches table the first time it's needed
+    and kept up to date as matches are scheduled and deleted.
+    """
+    calendar = week_calendars.get("calendar")
+    if calendar is None:
+        cursor.execute('SELECT match_date, match_week FROM matches')
+        calendar = week_calendars["calendar"] = WeekCalendar(STAGE_MODEL, cursor.fetchall())
+    return calendar
 
-@bot.command()
-@commands.check(is_mod_channel)
-async def schedule(ctx, match_date: str, match_type: str, team1: str, team2: str, winner_points: int = 0, scoreline_points:int = 0):
+def next_week_for(date):
     """
-    Schedule a match with a specific date.
-    Args:
-        match_date: Date of the match in DD-MM format.
-        match_type: Type of match ('bo1', 'bo3', or 'bo5').
-        team1: Name of the first team.
-        team2: Name of the second team.
-        winner/scoreline points: optional, will default to appropriate points if no value given
+    The week a match or question on this date belongs to when STAGE_MODEL assigns weeks from the schedule:
+    the week of the closest match day before it if that's within 2 days, otherwise the week after.
+    """
+    return week_calendar().week_for(date.strftime("%Y-%m-%d"))
+
+async def schedule_match(ctx, match_date, match_type, match_week, team1, team2, winner_points, scoreline_points):
+    """
+    Adds a match. match_week is None when STAGE_MODEL assigns it from the schedule.
     """
     try:
+        if match_week is not None:
+            try:
+                match_week = STAGE_MODEL.parse(match_week)
+            except ValueError as e:
+                await ctx.send(f"❌ {e}")
+                return
+
         # Validate and parse match_date
         parsed_date = datetime.strptime(match_date, "%d-%m")
         current_year = datetime.now().year
         match_date_with_year = parsed_date.replace(year=current_year)
 
-        cursor.execute("SELECT match_date, match_week FROM matches ORDER BY match_date ASC")
-        existing_matches = cursor.fetchall()
-
-        match_week = 1  # Default to week 1 if no matches exist
-
-        if existing_matches:
-            last_match_date, last_match_week = existing_matches[-1]
-            last_match_date = datetime.strptime(last_match_date, "%Y-%m-%d")
-
-            # If new match is within 2 days of the last scheduled match, keep the same week
-            if (match_date_with_year - last_match_date).days <= 2:
-                match_week = last_match_week
-            else:
-                match_week = last_match_week + 1
+        if match_week is None:
+            try:
+                match_week = next_week_for(match_date_with_year)
+            except ValueError as e:
+                await ctx.send(f"❌ {e}")
+                return
 
         # Insert into the database with the full date and calculated match_week
         cursor.execute('''
@@ -361,21 +972,101 @@ async def schedule(ctx, match_date: str, match_type: str, team1: str, team2: str
         VALUES (?, ?, ?, ?, ?, ?, ?)
         ''', (match_date_with_year.strftime("%Y-%m-%d"), match_type.upper(), team1, team2, match_week, winner_points, scoreline_points))
         conn.commit()
+        week_calendar().add(match_date_with_year.strftime("%Y-%m-%d"), match_week)
+        invalidate_predictions_view(match_week=match_week)
 
-        await ctx.send(f"Match scheduled: {team1} vs {team2} on {match_date_with_year.strftime('%d-%m')} (Week {match_week})")
+        await ctx.send(f"Match scheduled: {team1} vs {team2} on {match_date_with_year.strftime('%d-%m')} ({STAGE_MODEL.name(match_week)})")
 
     except ValueError:
         await ctx.send("Invalid date format. Please use DD-MM.")
 
+def insert_matches(matches):
+    """
+    Schedules many matches in one transaction, e.g. a whole split from a file.
+    matches: (match_date "YYYY-MM-DD", match_type, match_week or None, team1, team2, winner_points, scoreline_points);
+    a None week is assigned from the schedule, with the batch's own dates counting as scheduled.
+    Returns the weeks given to the matches, in order. ValueError, with nothing saved, if a date is past the last week.
+    """
+    calendar = week_calendar()
+    weeks, planned = calendar.plan([match[0] for match in matches])
+    weeks = [match[2] if match[2] is not None else week for match, week in zip(matches, weeks)]
+    cursor.execute('BEGIN')
+    try:
+        cursor.executemany('''
+        INSERT INTO matches (match_date, match_type, team1, team2, match_week, winner_points, scoreline_points)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (match_date, match_type.upper(), team1, team2, week, winner_points, scoreline_points)
+            for (match_date, match_type, _, team1, team2, winner_points, scoreline_points), week in zip(matches, weeks)
+        ])
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
+    if all(match[2] is None for match in matches):
+        week_calendars["calendar"] = planned
+    else:
+        week_calendars.pop("calendar", None)  # Explicit stages don't follow the plan, reload on next use
+    invalidate_predictions_view()
+    return weeks
+
+def split_stage_argument(args):
+    """
+    (stage, remaining arguments) for a command whose stage argument depends on the active tenant: it comes first
+    where STAGE_MODEL takes the stage from the mod, and is None where it's assigned from the schedule.
+    Decided per invocation, since one process can serve tournaments of both kinds.
+    """
+    if STAGE_MODEL.assigned_by_date:
+        return None, list(args)
+    if not args:
+        raise ValueError(f"Give the stage, {STAGE_MODEL.choices()}.")
+    return args[0], list(args[1:])
+
+def stage_usage():
+    """
+    The stage argument in usage messages, empty where the stage comes from the schedule.
+    """
+    return "" if STAGE_MODEL.assigned_by_date else " <stage>"
+
 @bot.command()
 @commands.check(is_mod_channel)
-async def add_bonus_question(ctx, date: str, question: str, description: str, options: str, reaction_type: str = "numbers", required_answers: int = 1, points: int = 1):
+async def schedule(ctx, match_date: str, match_type: str, *args):
     """
-    Adds a bonus question to the database.
-    Requires:
-    Date in DD-MM format, the question (w/ quotation marks), any description (w/ quotation marks), options (list surrounded by quotation marks), required answers (will default to 1 if no value), points (default value 1)
+    Schedule a match with a specific date.
+    Args:
+        match_date: Date of the match in DD-MM format.
+        match_type: Type of match ('bo1', 'bo3', or 'bo5').
+        stage: Only for tournaments with named stages, e.g. 'G', 'SF', 'F'; LEC weeks come from the schedule.
+        team1: Name of the first team.
+        team2: Name of the second team.
+        winner/scoreline points: optional, will default to appropriate points if no value given
+    Usage: !schedule <DD-MM> <bo1|bo3|bo5> [stage] <team1> <team2> [winner_points] [scoreline_points]
     """
+    usage = f"Usage: !schedule <DD-MM> <bo1|bo3|bo5>{stage_usage()} <team1> <team2> [winner_points] [scoreline_points]"
     try:
+        match_week, args = split_stage_argument(args)
+        if not 2 <= len(args) <= 4:
+            raise ValueError("Give both teams, then optionally the winner and scoreline points.")
+        team1, team2 = args[:2]
+        winner_points, scoreline_points = (int(value) for value in (args[2:] + [0, 0])[:2])
+    except ValueError as e:
+        message = str(e) if not str(e).startswith("invalid literal") else "Points must be whole numbers."
+        await ctx.send(f"❌ {message}\n{usage}")
+        return
+    await schedule_match(ctx, match_date, match_type, match_week, team1, team2, winner_points, scoreline_points)
+
+async def save_bonus_question(ctx, date, match_week, question, description, options, reaction_type, required_answers, points):
+    """
+    Adds a bonus question. match_week is None when STAGE_MODEL assigns it from the schedule.
+    """
+    try:
+        if match_week is not None:
+            try:
+                match_week = STAGE_MODEL.parse(match_week)
+            except ValueError as e:
+                await ctx.send(f"❌ {e}")
+                return
+
         parsed_date = datetime.strptime(date, "%d-%m")
         current_year = datetime.now().year
         match_date_with_year = parsed_date.replace(year=current_year)
@@ -384,31 +1075,393 @@ async def add_bonus_question(ctx, date: str, question: str, description: str, op
             await ctx.send("Invalid reaction type. Use 'numbers' or 'teams'")
             return
 
-        cursor.execute("SELECT match_date, match_week FROM matches ORDER BY match_week DESC LIMIT 1")
-        existing_matches = cursor.fetchall()
-
-        match_week = 1  # Default to week 1 if no matches exist
-
-        if existing_matches and len(existing_matches) > 0:
-            last_match_date, last_match_week = existing_matches[0]
-            last_match_date = datetime.strptime(last_match_date, "%Y-%m-%d")
-
-            # If new match is within 2 days of the last scheduled match, keep the same week
-            if (match_date_with_year - last_match_date).days <= 2:
-                match_week = last_match_week
-            else:
-                match_week = last_match_week + 1
+        if match_week is None:
+            try:
+                match_week = next_week_for(match_date_with_year)
+            except ValueError as e:
+                await ctx.send(f"❌ {e}")
+                return
 
         cursor.execute('''
         INSERT INTO bonus_questions (date, question, description, options, required_answers, points, match_week, reaction_type)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         ''', (match_date_with_year.strftime("%Y-%m-%d"), question, description, options, required_answers, points, match_week, reaction_type))
         conn.commit()
+        invalidate_predictions_view(match_week=match_week)
 
         await ctx.send(f"Bonus question added for {date}: {question}")
     except Exception as e:
         await ctx.send(f"Error adding bonus question: {e}")
 
+@bot.command()
+@commands.check(is_mod_channel)
+async def add_bonus_question(ctx, date: str, *args):
+    """
+    Adds a bonus question to the database.
+    Requires:
+    Date in DD-MM format, the stage for tournaments with named stages, the question (w/ quotation marks), any description (w/ quotation marks), options (list surrounded by quotation marks), optionally the reaction type ('numbers' or 'teams', default numbers), required answers (will default to 1 if no value), points (default value 1)
+    Usage: !add_bonus_question <DD-MM> [stage] "question" "description" "options" [numbers|teams] [required_answers] [points]
+    """
+    usage = f'Usage: !add_bonus_question <DD-MM>{stage_usage()} "question" "description" "options" [numbers|teams] [required_answers] [points]'
+    try:
+        match_week, args = split_stage_argument(args)
+        if len(args) < 3:
+            raise ValueError("Give the question, its description and the options.")
+        question, description, options = args[:3]
+        rest = args[3:]
+        reaction_type = "numbers"
+        if rest and not str(rest[0]).isdigit():
+            reaction_type = rest.pop(0)
+        if len(rest) > 2:
+            raise ValueError("Too many arguments.")
+        required_answers, points = (int(value) for value in (rest + [1, 1][len(rest):]))
+    except ValueError as e:
+        message = str(e) if not str(e).startswith("invalid literal") else "Required answers and points must be whole numbers."
+        await ctx.send(f"❌ {message}\n{usage}")
+        return
+    await save_bonus_question(ctx, date, match_week, question, description, options, reaction_type, required_answers, points)
+
+SCHEDULE_COLUMNS = ("date", "type", "team1", "team2", "week", "winner_points", "scoreline_points")
+
+def read_schedule_file(filename, data):
+    """
+    Rows of a schedule or results file as dicts: a JSON list of objects, or CSV with a header row,
+    with SCHEDULE_COLUMNS or RESULT_COLUMNS.
+    """
+    text = data.decode("utf-8-sig")
+    if filename.lower().endswith(".json"):
+        rows = json.loads(text)
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError("JSON schedules must be a list of objects")
+        return rows
+    return list(csv.DictReader(io.StringIO(text)))
+
+def file_date(raw_date):
+    """
+    "YYYY-MM-DD" for a date given as YYYY-MM-DD or DD-MM (this year). ValueError for anything else.
+    """
+    if re.fullmatch(r"\d{4}-\d{2}-\d{2}", raw_date):
+        return datetime.strptime(raw_date, "%Y-%m-%d").strftime("%Y-%m-%d")
+    return datetime.strptime(raw_date, "%d-%m").replace(year=datetime.now().year).strftime("%Y-%m-%d")
+
+def validate_schedule(rows):
+    """
+    Checks every row before anything is saved. Returns (matches for insert_matches, [problems]).
+    """
+    matches = []
+    problems = []
+    seen = set()
+    for line, row in enumerate(rows, start=1):
+        row = {str(key).strip().lower(): str(value).strip() for key, value in row.items() if key is not None and value is not None}
+        try:
+            match_date = file_date(row.get("date", ""))
+        except ValueError:
+            problems.append(f"Row {line}: invalid date '{row.get('date', '')}', use DD-MM or YYYY-MM-DD")
+            continue
+
+        match_type = row.get("type", "").upper()
+        team1, team2 = row.get("team1", "").upper(), row.get("team2", "").upper()
+        row_problems = []
+        if match_type not in emojis.MATCH_TYPES:
+            row_problems.append(f"unknown match type '{row.get('type', '')}'")
+        unknown_teams = [team for team in (team1, team2) if team not in TEAM_EMOTES]
+        if unknown_teams:
+            row_problems.append(f"unknown team(s) {', '.join(unknown_teams) or '(blank)'}")
+        elif team1 == team2:
+            row_problems.append("a team can't play itself")
+
+        match_week = None
+        if row.get("week"):
+            try:
+                match_week = STAGE_MODEL.parse(row["week"])
+            except ValueError as e:
+                row_problems.append(str(e))
+        elif not STAGE_MODEL.assigned_by_date:
+            row_problems.append(f"no stage, use {STAGE_MODEL.choices()}")
+
+        try:
+            winner_points = int(row.get("winner_points") or 0)
+            scoreline_points = int(row.get("scoreline_points") or 0)
+        except ValueError:
+            row_problems.append("points must be whole numbers")
+            winner_points = scoreline_points = 0
+
+        key = (match_date, team1, team2, match_type)
+        if key in seen:
+            row_problems.append("listed twice")
+        seen.add(key)
+
+        if row_problems:
+            problems.append(f"Row {line}: {'; '.join(row_problems)}")
+        else:
+            matches.append((match_date, match_type, match_week, team1, team2, winner_points, scoreline_points))
+
+    if matches:
+        # Matches that are already scheduled, in one query over the file's date range
+        dates = [match[0] for match in matches]
+        cursor.execute('''
+        SELECT match_date, team1, team2, match_type FROM matches
+        WHERE match_date BETWEEN ? AND ?
+        ''', (min(dates), max(dates)))
+        existing = set(cursor.fetchall())
+        for match in matches:
+            if (match[0], match[3], match[4], match[1]) in existing:
+                problems.append(f"{match[3]} vs {match[4]} ({match[1]}) on {match[0]} is already scheduled")
+    return matches, problems
+
+@bot.command()
+@commands.check(is_mod_channel)
+async def import_schedule(ctx, *options):
+    """
+    Schedules every match in an attached CSV or JSON file in one go; nothing is saved if any row is invalid.
+    Columns: date (DD-MM or YYYY-MM-DD), type, team1, team2, and optionally week, winner_points, scoreline_points.
+    Weeks are assigned from the dates where the tournament does that, otherwise the week column is required.
+    Add 'polls' to create the polls straight away.
+    Usage: !import_schedule [polls] (with the file attached)
+    """
+    try:
+        if not ctx.message.attachments:
+            await ctx.send("❌ Attach the schedule as a .csv or .json file.")
+            return
+        attachment = ctx.message.attachments[0]
+        started = time.perf_counter()
+        try:
+            rows = read_schedule_file(attachment.filename, await attachment.read())
+        except (ValueError, UnicodeDecodeError, csv.Error) as e:
+            await ctx.send(f"❌ Couldn't read {attachment.filename}: {e}")
+            return
+        if not rows:
+            await ctx.send(f"❌ {attachment.filename} has no matches.")
+            return
+
+        matches, problems = validate_schedule(rows)
+        if problems:
+            shown = "\n".join(problems[:15])
+            more = f"\n...and {len(problems) - 15} more" if len(problems) > 15 else ""
+            await ctx.send(f"❌ {len(problems)} problem(s), nothing was imported:\n{shown}{more}")
+            return
+
+        try:
+            weeks = insert_matches(matches)
+        except ValueError as e:
+            # Weeks are planned before anything is written
+            await ctx.send(f"❌ {e} Nothing was imported.")
+            return
+        elapsed = time.perf_counter() - started
+        stages_used = sorted(set(weeks), key=STAGE_MODEL.order)
+        await ctx.send(f"✅ Imported {len(matches)} matches from {min(m[0] for m in matches)} to {max(m[0] for m in matches)} "
+                       f"({', '.join(STAGE_MODEL.name(stage) for stage in stages_used)}) in {elapsed * 1000:.0f} ms.")
+
+        if "polls" in [option.lower() for option in options]:
+            await ctx.invoke(create_polls)
+    except Exception as e:
+        await ctx.send(f"❌ Error importing schedule: {e}")
+
+RESULT_COLUMNS = ("date", "winner", "score")
+
+def parse_result_entries(entries):
+    """
+    The entries typed after !results as rows like a results file. A date (DD-MM or YYYY-MM-DD) applies to
+    the entries after it; each entry is WINNER:SCORE, or just WINNER for a BO1.
+    """
+    rows = []
+    match_date = ""
+    for entry in entries:
+        if re.fullmatch(r"\d{1,2}-\d{1,2}|\d{4}-\d{2}-\d{2}", entry):
+            match_date = entry
+            continue
+        winner, _, score = entry.partition(":")
+        rows.append({"date": match_date, "winner": winner, "score": score})
+    return rows
+
+def validate_results(rows):
+    """
+    Finds the scheduled match every row is the result of before anything is saved, in one query over the dates.
+    Returns ([(match, winner, score)] for score_results, [problems]), match being
+    (id, match_date, match_week, match_type, team1, team2, winner_points, scoreline_points, winner).
+    """
+    entries = []
+    problems = []
+    for line, row in enumerate(rows, start=1):
+        row = {str(key).strip().lower(): str(value).strip() for key, value in row.items() if key is not None and value is not None}
+        try:
+            match_date = file_date(row.get("date", ""))
+        except ValueError:
+            problems.append(f"Row {line}: invalid date '{row.get('date', '')}', use DD-MM or YYYY-MM-DD")
+            continue
+        if not row.get("winner"):
+            problems.append(f"Row {line}: no winner")
+            continue
+        entries.append((line, match_date, row["winner"].upper(), row.get("score", "").lower()))
+    if not entries:
+        return [], problems
+
+    dates = [entry[1] for entry in entries]
+    cursor.execute('''
+    SELECT id, match_date, match_week, match_type, team1, team2, winner_points, scoreline_points, winner
+    FROM matches
+    WHERE match_date BETWEEN ? AND ?
+    ''', (min(dates), max(dates)))
+    matches_by_team = {}  # (match_date, team) -> matches the team plays that day
+    for match in cursor.fetchall():
+        for team in (match[4], match[5]):
+            matches_by_team.setdefault((match[1], team), []).append(match)
+
+    results = []
+    entered = set()
+    for line, match_date, winner, score in entries:
+        label = f"Row {line}: {winner} on {match_date}"
+        candidates = matches_by_team.get((match_date, winner), [])
+        open_matches = [match for match in candidates if match[8] is None]
+        if not candidates:
+            problems.append(f"{label}: no match scheduled")
+            continue
+        if not open_matches:
+            problems.append(f"{label}: result already recorded")
+            continue
+        if len(open_matches) > 1:
+            problems.append(f"{label}: plays more than one open match that day, use the result polls")
+            continue
+        match = open_matches[0]
+        if match[0] in entered:
+            problems.append(f"{label}: {match[4]} vs {match[5]} is listed twice")
+            continue
+
+        match_type = match[3]
+        if match_type == "BO1" and score in ("", "win", "wins", "1-0"):
+            score = "wins"
+        options = match_options(match_type, match[4], match[5]) or []
+        if f"{winner} {score}" not in options:
+            choices = ", ".join(option.split(" ", 1)[1] for option in options if option.startswith(f"{winner} "))
+            problems.append(f"{label}: '{score}' isn't a {match_type} score, use {choices}")
+            continue
+        entered.add(match[0])
+        results.append((match, winner, score))
+    return results, problems
+
+def score_results(results):
+    """
+    Records many results in one transaction: the matches, the points of every prediction on them (one query)
+    and the weekly totals, all with match_points like a result poll. results: (match, winner, score) from
+    validate_results. Returns {match_id: (correct_votes, total_votes)} from the poll tallies.
+    """
+    matches_by_id = {match[0]: (match, winner, score) for match, winner, score in results}
+    placeholders = ",".join(["?"] * len(matches_by_id))
+    cursor.execute('BEGIN')
+    try:
+        cursor.executemany('''
+        UPDATE matches
+        SET winner = ?, score = ?
+        WHERE id = ? AND winner IS NULL
+        ''', [(winner, score, match[0]) for match, winner, score in results])
+        if cursor.rowcount != len(results):
+            raise ValueError("a result was recorded from a poll in the meantime, nothing was saved")
+        for match, winner, score in results:
+            match_id, _, match_week, match_type, _, _, winner_points, scoreline_points, _ = match
+            log_event("match_result", match_id=match_id, match_week=match_week, match_type=match_type, winner=winner, score=score,
+                      winner_points=winner_points, scoreline_points=scoreline_points)
+
+        cursor.execute(f'''
+        SELECT id, match_id, user_id, match_week, pred_winner, pred_score
+        FROM predictions
+        WHERE match_id IN ({placeholders})
+        ''', tuple(matches_by_id))
+        prediction_points = []
+        weekly_points = {}  # (user_id, match_week) -> points, zero too so every voter has a row for the week
+        for pred_id, match_id, user_id, match_week, pred_winner, pred_score in cursor.fetchall():
+            match, winner, score = matches_by_id[match_id]
+            points = match_points(pred_winner, pred_score, winner, score, match[3], match[6], match[7])
+            if points:
+                prediction_points.append((points, pred_id))
+            weekly_points[(user_id, match_week)] = weekly_points.get((user_id, match_week), 0) + points
+
+        cursor.executemany('''
+        UPDATE predictions
+        SET points = points + ?
+        WHERE id = ?
+        ''', prediction_points)
+        cursor.executemany('''
+        INSERT INTO leaderboard (user_id, match_week, weekly_points)
+        VALUES (?, ?, ?)
+        ON CONFLICT(user_id, match_week) DO UPDATE SET
+            weekly_points = leaderboard.weekly_points + excluded.weekly_points
+        ''', [(user_id, match_week, points) for (user_id, match_week), points in weekly_points.items()])
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
+    for match_week in {match[2] for match, _, _ in results}:
+        invalidate_predictions_view(match_week=match_week)
+
+    cursor.execute(f'''
+    SELECT poll_id, option, votes FROM poll_tallies
+    WHERE poll_type = 'match' AND poll_id IN ({placeholders})
+    ''', tuple(matches_by_id))
+    votes = {match_id: [0, 0] for match_id in matches_by_id}
+    for match_id, option, option_votes in cursor.fetchall():
+        _, winner, score = matches_by_id[match_id]
+        votes[match_id][1] += option_votes
+        if option == f"{winner} {score}":
+            votes[match_id][0] += option_votes
+    return {match_id: tuple(counts) for match_id, counts in votes.items()}
+
+@bot.command()
+@commands.check(is_mod_channel)
+async def results(ctx, *entries):
+    """
+    Records many match results at once and refreshes the leaderboard once, e.g. at the end of a match day.
+    Nothing is saved if any entry is invalid.
+    Entries are WINNER:SCORE (just WINNER for a BO1), after the date they're on; more dates can follow.
+    Instead of entries, attach a .csv or .json file with date, winner and score columns, or give feed:<file>
+    to read one from RESULTS_FEED_DIR.
+    Usage: !results 12-03 G2:2-1 FNC:2-0 KC
+    """
+    try:
+        started = time.perf_counter()
+        feeds = [entry.partition(":")[2] for entry in entries if entry.lower().startswith("feed:")]
+        if feeds:
+            if not RESULTS_FEED_DIR:
+                await ctx.send("❌ No results feed is set up, set RESULTS_FEED_DIR.")
+                return
+            filename = os.path.basename(feeds[0])
+            try:
+                with open(os.path.join(RESULTS_FEED_DIR, filename), "rb") as feed_file:
+                    rows = read_schedule_file(filename, feed_file.read())
+            except (OSError, ValueError, UnicodeDecodeError, csv.Error) as e:
+                await ctx.send(f"❌ Couldn't read {filename}: {e}")
+                return
+        elif ctx.message.attachments:
+            attachment = ctx.message.attachments[0]
+            filename = attachment.filename
+            try:
+                rows = read_schedule_file(filename, await attachment.read())
+            except (ValueError, UnicodeDecodeError, csv.Error) as e:
+                await ctx.send(f"❌ Couldn't read {filename}: {e}")
+                return
+        else:
+            rows = parse_result_entries(entries)
+        if not rows:
+            await ctx.send("❌ No results given. Usage: !results 12-03 G2:2-1 FNC:2-0, or attach a file.")
+            return
+
+        match_results, problems = validate_results(rows)
+        if problems:
+            shown = "\n".join(problems[:15])
+            more = f"\n...and {len(problems) - 15} more" if len(problems) > 15 else ""
+            await ctx.send(f"❌ {len(problems)} problem(s), no results were recorded:\n{shown}{more}")
+            return
+
+        votes = score_results(match_results)
+        elapsed = time.perf_counter() - started
+        lines = [f"✅ Recorded {len(match_results)} result(s) in {elapsed * 1000:.0f} ms, points have been awarded:"]
+        for match, winner, score in match_results:
+            correct_votes, total_votes = votes[match[0]]
+            lines.append(f"{match[4]} vs {match[5]} ({match[3]}): {winner} {score}, {correct_votes} of {total_votes} predicted it")
+        await ctx.send("\n".join(lines)[:2000])
+
+        await update_leaderboard()
+    except Exception as e:
+        await ctx.send(f"❌ Error recording results: {e}")
 
 @bot.command()
 @commands.check(is_mod_channel)
@@ -417,9 +1470,9 @@ async def create_polls(ctx):
     Creates prediction polls in a public channel and result polls in some mod channel type thing.
     """
     try:
-        poll_channel_id = 1346615134885253181  # Replace with actual channel IDs        
+        poll_channel_id = channel_id("poll")
         poll_channel = bot.get_channel(poll_channel_id)
-        admin_channel_id = 1346615169433997322
+        admin_channel_id = channel_id("admin")
         admin_channel = bot.get_channel(admin_channel_id)
         # Fetch matches that have not had polls created yet
         cursor.execute('''
@@ -466,24 +1519,9 @@ async def create_polls(ctx):
                 await poll_channel.send(f"**{formatted_date} Games**")
                 await admin_channel.send(f"**{formatted_date} Games**")
 
-            # Generate score options based on match type
-            if match_type == 'BO1':
-                options = [f"{team1} wins", f"{team2} wins"]
-                reactions = [REACTION_SETS[reaction_set][0], REACTION_SETS[reaction_set][5]]  # Outer pair (🟦🟥)
-            elif match_type == 'BO3':
-                options = [f"{team1} 2-0", f"{team1} 2-1", f"{team2} 2-1", f"{team2} 2-0"]
-                reactions = [                                                    # From outside in:
-                    REACTION_SETS[reaction_set][0],  # 🟦 (far left)
-                    REACTION_SETS[reaction_set][1],  # 🟥 (far right)
-                    REACTION_SETS[reaction_set][4],  # 🔵 (inner left)
-                    REACTION_SETS[reaction_set][5]   # 🔴 (inner right)
-                ]
-            elif match_type == 'BO5':
-                options = [
-                    f"{team1} 3-0", f"{team1} 3-1", f"{team1} 3-2",
-                    f"{team2} 3-2", f"{team2} 3-1", f"{team2} 3-0"
-                ]
-                reactions = REACTION_SETS[reaction_set]  # All six emojis
+            # Score options based on match type, and their reactions
+            options = match_options(match_type, team1, team2)
+            reactions = EMOJIS.match_reactions(match_type, reaction_set, match_layout())
 
             # Create prediction and result polls for the match
             await create_match_poll(poll_channel, admin_channel, match_id, match_date, team1, team2, match_type, options, reactions, winner_points, scoreline_points)
@@ -498,17 +1536,11 @@ async def create_polls(ctx):
             option_split = [option.strip() for option in options.split(",")]
 
             if reaction_type.lower() == "teams":
-                # Try to get emotes for each team
-                reactions = []
-                for team in option_split:
-                    if team in TEAM_EMOTES:
-                        reactions.append(TEAM_EMOTES[team])
-                    else:
-                        await ctx.send(f"❌ No emote found for team: {team}")
-                        return
-            else:
-                NUMBER_EMOJIS = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟"]
-                reactions = NUMBER_EMOJIS[:len(option_split)]
+                missing = [team for team in option_split if team not in TEAM_EMOTES]
+                if missing:
+                    await ctx.send(f"❌ No emote found for team: {missing[0]}")
+                    return
+            reactions = EMOJIS.bonus_reactions(reaction_type, option_split)
 
             # Add date header if the date changes
             if match_date != current_date:
@@ -537,7 +1569,7 @@ async def create_match_poll(prediction_channel, result_channel, match_id, match_
         color=discord.Color.blue()
     )
     for i, option in enumerate(options):
-        prediction_embed.add_field(name=f"Option {reactions[i]}", value=option, inline=False)
+        prediction_embed.add_field(name=f"Option {reactions[i]}", value=render_vote_bar(option, 0, 0) if LIVE_POLL_EMBEDS else option, inline=False)
 
     prediction_message = await prediction_channel.send(embed=prediction_embed)
     for reaction in reactions:
@@ -556,12 +1588,12 @@ async def create_match_poll(prediction_channel, result_channel, match_id, match_
     for reaction in reactions:
         await result_message.add_reaction(reaction)
 
-    # Update poll_created to True
+    # Update poll_created to True and remember where the polls are
     cursor.execute('''
     UPDATE matches
-    SET poll_created = TRUE
+    SET poll_created = TRUE, poll_message_id = ?, result_message_id = ?
     WHERE id = ?
-    ''', (match_id,))
+    ''', (str(prediction_message.id), str(result_message.id), match_id))
     conn.commit()
 
 
@@ -576,7 +1608,7 @@ async def create_bonus_poll(prediction_channel, result_channel, question_id, que
         color=discord.Color.gold()
     )
     for i, option in enumerate(options, start=1):
-        prediction_embed.add_field(name=f"Option {i}", value=option, inline=False)
+        prediction_embed.add_field(name=f"Option {i}", value=render_vote_bar(option, 0, 0) if LIVE_POLL_EMBEDS else option, inline=False)
 
     prediction_message = await prediction_channel.send(embed=prediction_embed)
     for reaction in reactions:
@@ -595,26 +1627,28 @@ async def create_bonus_poll(prediction_channel, result_channel, question_id, que
     for reaction in reactions:
         await result_message.add_reaction(reaction)
 
-    # Update poll_created to True
+    # Update poll_created to True and remember where the polls are
     cursor.execute('''
     UPDATE bonus_questions
-    SET poll_created = TRUE
+    SET poll_created = TRUE, poll_message_id = ?, result_message_id = ?
     WHERE id = ?
-    ''', (question_id,))
+    ''', (str(prediction_message.id), str(result_message.id), question_id))
     conn.commit()
 
 
 @bot.event
+@metrics.timed("reaction_handler", action="add")
 async def on_raw_reaction_add(payload):
     try:
-        POLL_CHANNEL_ID = 1346615134885253181  # Your poll channel
-        ADMIN_CHANNEL_ID = 1346615169433997322  # Your admin channel
+        tenant = TENANTS.for_channel(payload.channel_id)
         if payload.user_id == bot.user.id:
             return  # Ignore bot reactions
-        if payload.channel_id not in [POLL_CHANNEL_ID, ADMIN_CHANNEL_ID]:
+        if tenant is None or payload.channel_id not in (tenant.channels["poll"], tenant.channels["admin"]):
             return
-        print("the bot has seen the reaction")
-        bot_channel_id = 1346615855408091180  # Replace with your bot channel ID
+        tenants.activate(tenant)
+        await wait_for_reaction_recovery()
+        reaction_log.debug("Reaction %s from %s on message %s", payload.emoji, payload.user_id, payload.message_id)
+        bot_channel_id = channel_id("bot")
         bot_channel = bot.get_channel(bot_channel_id)
         
         if payload.user_id == bot.user.id:
@@ -623,8 +1657,8 @@ async def on_raw_reaction_add(payload):
         # Fetch the full message if not already cached
 
         channel = bot.get_channel(payload.channel_id)
-        message = await channel.fetch_message(payload.message_id)
-        user = await bot.fetch_user(payload.user_id)
+        message = await poll_message(channel, payload.message_id)
+        user = await reaction_user(payload)
             
         if not message.embeds:
             return
@@ -637,16 +1671,10 @@ async def on_raw_reaction_add(payload):
         description = embed.description  # Message content for match date
 
         # Parse poll type and match details from the title
-        if "Match Poll" in title:
-            poll_type = "match_poll"
-        elif "Result Poll" in title:
-            poll_type = "result_poll"
-        elif "Bonus Question Result" in title:
-            poll_type = "bonus_result"
-        elif "Bonus Question" in title:
-            poll_type = "bonus_poll"
-        else:
+        poll_type = poll_type_from_title(title)
+        if poll_type is None:
             return  # Ignore unrelated embeds
+        metrics.label(poll_type=poll_type)
 
         if poll_type == "match_poll" or poll_type == "result_poll":
             # Extract team names and match type from the title
@@ -695,29 +1723,17 @@ async def on_raw_reaction_add(payload):
                         UNION
                         SELECT match_week FROM bonus_answers WHERE user_id = ?
                     )
-                    ORDER BY match_week DESC
+                    JOIN stages ON stages.stage = match_week
+                    ORDER BY stages.stage_order DESC
                     LIMIT 1
                 ''', (user.id, user.id))
                 latest_stage_row = cursor.fetchone()
-                latest_stage = latest_stage_row[0] if latest_stage_row and latest_stage_row[0] is not None else 0
-                latest_stage_value = TOURNAMENT_STAGES.get(latest_stage, [None, 0])[1] if latest_stage else 0
-                print(f"Latest stage for user: {latest_stage_value}")
+                latest_stage = latest_stage_row[0] if latest_stage_row else None
+                reaction_log.debug("Latest stage for user: %s", latest_stage)
 
-                current_stage_value = TOURNAMENT_STAGES[match_row[1]][1]  # Gets the numeric value (1 for 'G', 2 for 'SF', 3 for 'F')
-                
-                # Get the current match's stage
-                current_stage = TOURNAMENT_STAGES[match_row[1]][1]  # Get stage number from match_week
-                
-                # Generate list of missed stages
-                missed_stages = []
-                if latest_stage_value < current_stage_value:
-                    for stage_value in range(latest_stage_value + 1, current_stage_value):
-                        # Find the stage key (G/SF/F) for this value
-                        stage_key = next((k for k, v in TOURNAMENT_STAGES.items() if v[1] == stage_value), None)
-                        if stage_key:
-                            missed_stages.append(stage_key)
-                
-                print(f"Missed stages: {missed_stages}")
+                # Stages between the user's last vote and this match's stage
+                missed_stages = STAGE_MODEL.between(latest_stage, match_row[1])
+                reaction_log.debug("Missed stages: %s", missed_stages)
 
                 if missed_stages:
                     for stage in missed_stages:
@@ -739,55 +1755,27 @@ async def on_raw_reaction_add(payload):
                             ON CONFLICT(user_id, match_week) DO UPDATE SET 
                                 weekly_points = excluded.weekly_points
                         ''', (user.id, stage, lowest_score))
+                        log_event("leaderboard_set", user_id=user.id, match_week=stage, points=lowest_score, reason="missed_week")
                         conn.commit()
                 
                 # Handle match poll (log predictions)
-                options = [field.value for field in embed.fields]
-                all_possible_reactions = set()
-                for reaction_set in REACTION_SETS.values():
-                    all_possible_reactions.update(reaction_set)
-
-                if str(payload.emoji.name) not in all_possible_reactions:
+                emoji_key = emojis.key(payload.emoji)
+                if not EMOJIS.is_match_reaction(emoji_key):
                     await bot_channel.send(f"{user.mention} Invalid reaction. Please select a valid option.")
                     return
-                
-                used_reaction_set = None
-                for set_name, reactions in REACTION_SETS.items():
-                    if str(payload.emoji.name) in reactions:
-                        used_reaction_set = set_name
-                        break
-
-                if used_reaction_set is None:
-                    await bot_channel.send(f"{user.mention} Invalid reaction type.")
-                    return
 
-                # Generate score options based on match type
-                if match_type == 'BO1':
-                    options = [f"{team1} wins", f"{team2} wins"]
-                    reactions = (REACTION_SETS[used_reaction_set][0], REACTION_SETS[used_reaction_set][5])  # Outer pair (🟦🟥)
-                elif match_type == 'BO3':
-                    options = [f"{team1} 2-0", f"{team1} 2-1", f"{team2} 2-1", f"{team2} 2-0"]
-                    reactions = (                                                    # From outside in:
-                        REACTION_SETS[used_reaction_set][0],  # 🟦 (far left)
-                        REACTION_SETS[used_reaction_set][1],  # 🟥 (far right)
-                        REACTION_SETS[used_reaction_set][4],  # 🔵 (inner left)
-                        REACTION_SETS[used_reaction_set][5]   # 🔴 (inner right)
-                    )
-                elif match_type == 'BO5':
-                    options = [
-                        f"{team1} 3-0", f"{team1} 3-1", f"{team1} 3-2",
-                        f"{team2} 3-2", f"{team2} 3-1", f"{team2} 3-0"
-                    ]
-                    reactions = REACTION_SETS[used_reaction_set][:6]  # All six emojis
-
-                # Now we can safely get the index
-                if str(payload.emoji.name) in reactions:  # Check if it's in the correct subset
-                    selected_index = reactions.index(str(payload.emoji.name))
-                    prediction = options[selected_index]
-                    pred_winner, pred_score = prediction.split(" ", 1)
-                else:
+                selected_index = EMOJIS.match_choice(match_type, emoji_key, match_layout())
+                if selected_index is None:
                     await bot_channel.send(f"{user.mention} Invalid reaction for this match type.")
                     return
+                prediction = match_options(match_type, team1, team2)[selected_index]
+                pred_winner, pred_score = prediction.split(" ", 1)
+
+                cursor.execute('''
+                SELECT pred_winner, pred_score FROM predictions
+                WHERE match_id = ? AND user_id = ?
+                ''', (match_id, user.id))
+                previous_prediction = cursor.fetchone()
 
                 # Insert prediction into the database
                 cursor.execute('''
@@ -797,16 +1785,29 @@ async def on_raw_reaction_add(payload):
                 pred_winner = excluded.pred_winner,
                 pred_score = excluded.pred_score
                 ''', (match_id, match_row[1], user.id, pred_winner, pred_score))
-                conn.commit()
+
+                # Move the user's vote in the tallies (switching options counts as one vote moving)
+                vote_changes = {}
+                if previous_prediction != (pred_winner, pred_score):
+                    if previous_prediction:
+                        vote_changes[" ".join(previous_prediction)] = -1
+                    vote_changes[prediction] = 1
+                for option, delta in vote_changes.items():
+                    bump_tally("match", match_id, option, delta)
 
                 cursor.execute('''
                 INSERT INTO users (user_id, username)
                 VALUES (?, ?)
                 ON CONFLICT(user_id) DO UPDATE SET username = excluded.username
                 ''', (user.id, str(user.name)))  # Stores the current username
+                if vote_changes:
+                    log_event("match_vote", match_id=match_id, match_week=match_row[1], user_id=user.id, option=prediction)
                 conn.commit()
+                if vote_changes:
+                    invalidate_predictions_view(user.id, match_row[1])
+                    track_live_vote(message, "match", match_id, vote_changes)
 
-                print(f"{user.name} your prediction has been logged: {pred_winner} with score {pred_score}.")
+                reaction_log.info("%s prediction logged: %s with score %s", user.name, pred_winner, pred_score)
 
             elif poll_type == "result_poll":
                 # Check if result already exists
@@ -821,49 +1822,16 @@ async def on_raw_reaction_add(payload):
                     return
 
                 # Handle result poll
-                options = [field.value for field in embed.fields]
-                all_possible_reactions = set()
-                for reaction_set in REACTION_SETS.values():
-                    all_possible_reactions.update(reaction_set)
-
-                if str(payload.emoji.name) not in all_possible_reactions:
-                    return
-
-                used_reaction_set = None
-                for set_name, reactions in REACTION_SETS.items():
-                    if str(payload.emoji.name) in reactions:
-                        used_reaction_set = set_name
-                        break
-                if used_reaction_set is None:
-                    await message.channel.send("Invalid reaction type")
+                emoji_key = emojis.key(payload.emoji)
+                if not EMOJIS.is_match_reaction(emoji_key):
                     return
 
-                if match_type == 'BO1':
-                    options = [f"{team1} wins", f"{team2} wins"]
-                    reactions = (REACTION_SETS[used_reaction_set][0], REACTION_SETS[used_reaction_set][5])  # Outer pair (🟦🟥)
-                elif match_type == 'BO3':
-                    options = [f"{team1} 2-0", f"{team1} 2-1", f"{team2} 2-1", f"{team2} 2-0"]
-                    reactions = (                                                    # From outside in:
-                        REACTION_SETS[used_reaction_set][0],  # 🟦 (far left)
-                        REACTION_SETS[used_reaction_set][1],  # 🟥 (far right)
-                        REACTION_SETS[used_reaction_set][4],  # 🔵 (inner left)
-                        REACTION_SETS[used_reaction_set][5]   # 🔴 (inner right)
-                    )
-                elif match_type == 'BO5':
-                    options = [
-                        f"{team1} 3-0", f"{team1} 3-1", f"{team1} 3-2",
-                        f"{team2} 3-2", f"{team2} 3-1", f"{team2} 3-0"
-                    ]
-                    reactions = REACTION_SETS[used_reaction_set][:6]  # All six emojis
-
-                # 5. Get selected result
-                if str(payload.emoji.name) in reactions:
-                    selected_index = reactions.index(str(payload.emoji.name))
-                    result = options[selected_index]
-                    winner, score = result.split(" ", 1)
-                else:
+                selected_index = EMOJIS.match_choice(match_type, emoji_key, match_layout())
+                if selected_index is None:
                     await message.channel.send("Invalid reaction for this match type")
                     return
+                result = match_options(match_type, team1, team2)[selected_index]
+                winner, score = result.split(" ", 1)
 
                 # Update match result in the database
                 cursor.execute('''
@@ -871,6 +1839,8 @@ async def on_raw_reaction_add(payload):
                 SET winner = ?, score = ?
                 WHERE id = ?
                 ''', (winner, score, match_id))
+                log_event("match_result", match_id=match_id, match_week=match_row[1], match_type=match_type, winner=winner, score=score,
+                          winner_points=match_row[2], scoreline_points=match_row[3])
                 conn.commit()
 
                 # Award points for correct predictions
@@ -883,21 +1853,7 @@ async def on_raw_reaction_add(payload):
 
                 for prediction in predictions:
                     pred_id, user_id, match_week, pred_winner, pred_score = prediction
-                    points = 0
-
-                    # Award points for correct winner
-                    if pred_winner == winner:
-                        if match_row[2] != 0:
-                            points += match_row[2] 
-                        else:
-                            points += 1 if match_type == "BO1" else (2 if match_type == "BO3" else 3)
-
-                        # Bonus points for correct score
-                        if pred_score == score:
-                            if match_row[3] != 0:
-                                points += match_row[3]
-                            else:
-                                points += 1 if match_type == "BO3" else (2 if match_type == "BO5" else 0)
+                    points = match_points(pred_winner, pred_score, winner, score, match_type, match_row[2], match_row[3])
 
                     # Update points in the predictions table
                     cursor.execute('''
@@ -915,11 +1871,20 @@ async def on_raw_reaction_add(payload):
                     conn.commit()
 
                 conn.commit()
+                invalidate_predictions_view(match_week=match_row[1])
 
                 await update_leaderboard()
 
+                cursor.execute('''
+                SELECT COALESCE(SUM(votes), 0), COALESCE(SUM(CASE WHEN option = ? THEN votes END), 0)
+                FROM poll_tallies
+                WHERE poll_type = 'match' AND poll_id = ?
+                ''', (result, match_id))
+                total_votes, correct_votes = cursor.fetchone()
+
                 await message.channel.send(
-                    f"Result recorded for match {team1} vs {team2} ({match_type}): {winner} wins with score {score}! Points have been awarded."
+                    f"Result recorded for match {team1} vs {team2} ({match_type}): {winner} wins with score {score}! Points have been awarded.\n"
+                    f"{correct_votes} of {total_votes} predicted {result}."
                 )
         elif poll_type == "bonus_poll" or poll_type == "bonus_result":
             # Locate the question in the database
@@ -937,45 +1902,32 @@ async def on_raw_reaction_add(payload):
 
             question_id, week, options, reaction_type, required_answers, points_value = question_row
             option_split = [option.strip() for option in options.split(",")]
-            reactions = []
-            if reaction_type == "numbers":
-                reactions = [f"{i + 1}️⃣" for i in range(len(option_split))]
-                reaction_ids = [str(i + 1) for i in range(len(option_split))]
-            elif reaction_type == "teams":
-                    option_teams = [team.strip() for team in options.split(",")]
-                    # Try to get emotes for each team
-                    reactions = []
-                    for team in option_teams:
-                        if team in TEAM_EMOTES:
-                            reactions.append(TEAM_EMOTES[team])
-                            reaction_ids = [TEAM_EMOTES[team].split(':')[2].rstrip('>') for team in option_teams]
-            
-            print(f"Reactions: {reactions}")
-            print(f"reaction_ids: {reaction_ids}")
-            print(f"payload emoji id: {payload.emoji.id}")
-            print(f"payload emoji name: {payload.emoji.name}")
+            emoji_key = emojis.key(payload.emoji)
+            selected_option = EMOJIS.bonus_choice(reaction_type, option_split, emoji_key)
+            reaction_log.debug("Bonus reaction %s picks option %s", emoji_key, selected_option)
 
-            if (str(payload.emoji.name) not in reactions) and (str(payload.emoji.id) not in reaction_ids) and (str(payload.emoji.name) != "✅"):
+            if selected_option is None and emoji_key != emojis.FINALIZE:
                 await message.channel.send("Invalid reaction. Please select a valid option.")
                 return
 
             if poll_type == "bonus_poll":
                 cursor.execute('''
-                    SELECT MAX(match_week) FROM (
+                    SELECT match_week FROM (
                         SELECT match_week FROM predictions WHERE user_id = ?
                         UNION
                         SELECT match_week FROM bonus_answers WHERE user_id = ?
                     )
+                    JOIN stages ON stages.stage = match_week
+                    ORDER BY stages.stage_order DESC
+                    LIMIT 1
                 ''', (user.id, user.id))
-                latest_week = cursor.fetchone()[0] or 0
-                print(latest_week)
-                
-                if latest_week is None:
-                    latest_week = 0  # No previous activity
+                latest_week_row = cursor.fetchone()
+                latest_week = latest_week_row[0] if latest_week_row else None  # None when there's no previous activity
+                reaction_log.debug("Latest week for user: %s", latest_week)
 
                 # Find all missed weeks between the latest activity and current match week
-                missed_weeks = list(range(latest_week + 1, question_row[1]))
-                print(f"all_weeks: {missed_weeks}")
+                missed_weeks = STAGE_MODEL.between(latest_week, question_row[1])
+                reaction_log.debug("Missed weeks: %s", missed_weeks)
 
                 if missed_weeks:
                     for week in missed_weeks:
@@ -988,7 +1940,7 @@ async def on_raw_reaction_add(payload):
                         ''', (week,))
                         
                         lowest_score_row = cursor.fetchone()
-                        print(lowest_score_row)
+                        reaction_log.debug("Lowest score for week %s: %s", week, lowest_score_row)
                         lowest_score = lowest_score_row[0] if lowest_score_row else 0  # Ensure no NoneType error
 
                         # Insert or update leaderboard entry
@@ -998,40 +1950,23 @@ async def on_raw_reaction_add(payload):
                             ON CONFLICT(user_id, match_week) DO UPDATE SET 
                                 weekly_points = excluded.weekly_points
                         ''', (user.id, week, lowest_score))
+                        log_event("leaderboard_set", user_id=user.id, match_week=week, points=lowest_score, reason="missed_week")
                         conn.commit()
                 
                 # Log reactions and options to debug
-                print(f"Reactions: {reactions}")
-                print(f"Options: {options}")
+                reaction_log.debug("Options: %s", options)
 
                 try:
-                    # Ensure reactions are aligned with options
-                    try:
-                        if isinstance(payload.emoji, discord.PartialEmoji):
-                            # Handle custom emojis
-                            print("hi")
-                            if payload.emoji.id:  # Custom emoji (team emotes)
-                                print("Custom emoji detected")
-                                selected_index = reaction_ids.index(str(payload.emoji.id))
-                            else:  # Unicode emoji (number emotes)
-                                print("Unicode emoji detected")
-                                selected_index = reactions.index(str(payload.emoji))
-                        elif isinstance(payload.emoji, discord.Emoji):
-                            # Handle standard emojis
-                            print("hi2")
-
-                            selected_index = reactions.index(str(payload.emoji))
-                    except ValueError:
+                    if selected_option is None:
                         await bot_channel.send(f"{user.mention} Invalid reaction. Please select a valid option.")
                         return
-                    print(selected_index)
 
                     # Fetch existing answers
                     cursor.execute('''
                     SELECT answer FROM bonus_answers WHERE user_id = ? AND question_id = ?
                     ''', (user.id, question_id))
                     existing_answer_row = cursor.fetchone()
-                    print(existing_answer_row)
+                    reaction_log.debug("Existing answer row: %s", existing_answer_row)
 
                     if existing_answer_row:
                         try:
@@ -1043,14 +1978,13 @@ async def on_raw_reaction_add(payload):
                     else:
                         existing_answers = []  # First-time user, initialize empty list
 
-                    print(existing_answers)
+                    reaction_log.debug("Existing answers: %s", existing_answers)
 
                     if len(existing_answers) < required_answers:
-                        # Map emoji to actual option
-                        selected_option = option_split[selected_index]
-
-                        if selected_option not in existing_answers:
+                        vote_added = selected_option not in existing_answers
+                        if vote_added:
                             existing_answers.append(selected_option)  # Add selection
+                            bump_tally("bonus", question_id, selected_option, 1)
 
 
                         updated_answers = json.dumps(existing_answers)
@@ -1060,14 +1994,18 @@ async def on_raw_reaction_add(payload):
                         VALUES (?, ?, ?, ?)
                         ON CONFLICT(user_id, question_id) DO UPDATE SET answer = excluded.answer
                         ''', (user.id, question_id, updated_answers, question_row[1]))
-                        conn.commit()
                         
                         cursor.execute('''
                         INSERT INTO users (user_id, username)
                         VALUES (?, ?)
                         ON CONFLICT(user_id) DO UPDATE SET username = excluded.username
                         ''', (user.id, str(user.name)))  # Stores the current username
+                        if vote_added:
+                            log_event("bonus_answer", question_id=question_id, match_week=question_row[1], user_id=user.id, answers=existing_answers)
                         conn.commit()
+                        if vote_added:
+                            invalidate_predictions_view(user.id, question_row[1])
+                            track_live_vote(message, "bonus", question_id, {selected_option: 1})
                     else:
                         await bot_channel.send(f"{user.mention} You have already selected an answer. Please remove one first if you wish to change your answer.")
                         return
@@ -1100,20 +2038,13 @@ async def on_raw_reaction_add(payload):
                     try:
                         correct_answers = set(json.loads(answer_row[0]))  # Parse stored JSON
                     except json.JSONDecodeError:
-                        print(f"Error parsing JSON from DB: {answer_row[0]}")  # Debugging
+                        reaction_log.warning("Error parsing JSON from DB: %s", answer_row[0])
                         correct_answers = set()
                 else:
                     correct_answers = set()  # Initialize as empty if no value is stored
 
-                if isinstance(payload.emoji, discord.PartialEmoji):
-                    if payload.emoji.id:  # Custom team emotes
-                        user_input = dict(zip(reaction_ids, option_split)).get(str(payload.emoji.id), None)
-                    else:  # Unicode number emotes
-                        user_input = dict(zip(reactions, option_split)).get(str(payload.emoji.name), None)
-                elif isinstance(payload.emoji, discord.Emoji):
-                    user_input = dict(zip(reactions, option_split)).get(str(payload.emoji.name), None)
-                
-                print(user_input)
+                user_input = selected_option
+                reaction_log.debug("Result input: %s", user_input)
 
                 if user_input:
                     correct_answers.add(user_input)  # Add selection
@@ -1128,9 +2059,9 @@ async def on_raw_reaction_add(payload):
                     await message.channel.send(f"✅ The correct answer for '{question_text}' has been recorded.")
                     return
 
-                if str(payload.emoji.name) == "✅":  # Change this emoji to whatever you prefer
+                if emoji_key == emojis.FINALIZE:
                     await message.channel.send(f"✅ Correct answer selection finalized! Checking responses...")
-                    print(correct_answers)
+                    reaction_log.debug("Correct answers: %s", correct_answers)
                     # Fetch user responses
                     cursor.execute('''
                     SELECT user_id, answer FROM bonus_answers
@@ -1143,21 +2074,13 @@ async def on_raw_reaction_add(payload):
                         return
 
                     awarded_users = []
+                    log_event("bonus_finalize", question_id=question_id, match_week=match_week, correct_answers=sorted(correct_answers),
+                              required_answers=required_answers, points=points_value)
                     for user_id, user_selections_json in user_responses:
                         user_selections = set(json.loads(user_selections_json))
-                        print(user_selections)  # Convert user answers
-
-                        if len(correct_answers) == required_answers:
-                            # For exact number of required answers, need exact match
-                            points_awarded = points_value if user_selections == correct_answers else 0
-                            print(f"Exact match required. Match found: {user_selections == correct_answers}")
-                        else:
-                            # For more answers than required, must be valid subset AND have correct number of answers
-                            if len(user_selections) == required_answers and user_selections.issubset(correct_answers):
-                                points_awarded = points_value
-                            else:
-                                points_awarded = 0
-                            print(f"Subset check: selections={len(user_selections)}, required={required_answers}, valid subset={user_selections.issubset(correct_answers)}")
+                        reaction_log.debug("User selections: %s", user_selections)
+
+                        points_awarded = bonus_points(user_selections, correct_answers, required_answers, points_value)
 
                         # Award points
                         cursor.execute('''
@@ -1178,6 +2101,8 @@ async def on_raw_reaction_add(payload):
                         if points_awarded > 0:
                             awarded_users.append(user_id)
 
+                    invalidate_predictions_view(match_week=match_week)
+
                     # --- **Send Final Result Message** ---
                     correct_answer_text = ", ".join(correct_answers)
                     if awarded_users:
@@ -1187,33 +2112,33 @@ async def on_raw_reaction_add(payload):
 
                     await update_leaderboard()
     except Exception as e:
-        print(f"Error in reaction handling: {e}")
+        reaction_log.exception("Error in reaction handling: %s", e)
         if bot_channel:
             await bot_channel.send(f"Error processing reaction: {e}")
 
 @bot.event
+@metrics.timed("reaction_handler", action="remove")
 async def on_raw_reaction_remove(payload):
-    print("hi")
-    POLL_CHANNEL_ID = 1346615134885253181  # Your poll channel
-    ADMIN_CHANNEL_ID = 1346615169433997322  # Your admin channel
+    tenant = TENANTS.for_channel(payload.channel_id)
     if payload.user_id == bot.user.id:
         return  # Ignore bot reactions
-    if payload.channel_id not in [POLL_CHANNEL_ID, ADMIN_CHANNEL_ID]:
+    if tenant is None or payload.channel_id not in (tenant.channels["poll"], tenant.channels["admin"]):
         return
-    bot_channel_id = 1346615855408091180  # Replace with your bot channel ID
-    bot_channel = bot.get_channel(bot_channel_id)
+    tenants.activate(tenant)
+    await wait_for_reaction_recovery()
 
     # Fetch the full message if not already cached
     try:
         channel = bot.get_channel(payload.channel_id)
-        message = await channel.fetch_message(payload.message_id)
-        user = await bot.fetch_user(payload.user_id)
+        message = await poll_message(channel, payload.message_id)
+        user = await reaction_user(payload)
 
         if not message.embeds:
             return
 
         embed = message.embeds[0]
         title = embed.title
+        metrics.label(poll_type=poll_type_from_title(title) or "other")
     
         if not message.embeds:
             return
@@ -1233,19 +2158,8 @@ async def on_raw_reaction_remove(payload):
                 return
 
             option_split = [option.strip() for option in options.split(",")]
-            reactions = []
-            if reaction_type == "numbers":
-                reactions = [f"{i + 1}️⃣" for i in range(len(option_split))]
-            elif reaction_type == "teams":
-                    option_teams = [team.strip() for team in options.split(",")]
-                    # Try to get emotes for each team
-                    reactions = []
-                    for team in option_teams:
-                        if team in TEAM_EMOTES:
-                            reactions.append(TEAM_EMOTES[team])
-                            reaction_ids = [TEAM_EMOTES[team].split(':')[2].rstrip('>') for team in option_teams]
-
-            if str(payload.emoji.name) not in reactions and str(payload.emoji.id) not in reaction_ids:
+            selected_option = EMOJIS.bonus_choice(reaction_type, option_split, emojis.key(payload.emoji))
+            if selected_option is None:
                 return
 
             # Fetch existing answers
@@ -1256,37 +2170,15 @@ async def on_raw_reaction_remove(payload):
 
             if existing_answer_row and existing_answer_row[0]:
                 existing_answers = json.loads(existing_answer_row[0])
-                print(existing_answers)
+                reaction_log.debug("Existing answers: %s", existing_answers)
             else:
                 return  # Nothing to remove
 
-            # Map emoji to actual option
-            try:
-                if isinstance(payload.emoji, discord.PartialEmoji):
-                    # Handle custom emojis
-                    print("hi")
-                    if payload.emoji.id:  # Custom emoji (team emotes)
-                        print("Custom emoji detected")
-                        selected_index = reaction_ids.index(str(payload.emoji.id))
-                    else:  # Unicode emoji (number emotes)
-                        print("Unicode emoji detected")
-                        selected_index = reactions.index(str(payload.emoji))
-                elif isinstance(payload.emoji, discord.Emoji):
-                    # Handle standard emojis
-                    print("hi2")
-                    selected_index = reactions.index(str(payload.emoji))
-
-            except ValueError:
-                await bot_channel.send(f"{user.mention} Invalid reaction. Please select a valid option.")
-                return
-            print(selected_index)
-
-            selected_option = option_split[selected_index]
-            
-            if selected_option in existing_answers:
-                print("i got here :/)")
+            vote_removed = selected_option in existing_answers
+            if vote_removed:
                 existing_answers.remove(selected_option)
-                print(existing_answers)  # Remove selection
+                reaction_log.debug("Answers after removal: %s", existing_answers)
+                bump_tally("bonus", question_id, selected_option, -1)
 
             updated_answers = json.dumps(existing_answers)
 
@@ -1296,7 +2188,12 @@ async def on_raw_reaction_remove(payload):
             SET answer = ?
             WHERE user_id = ? AND question_id = ?
             ''', (updated_answers, user.id, question_id))
+            if vote_removed:
+                log_event("bonus_answer", question_id=question_id, match_week=match_week, user_id=user.id, answers=existing_answers)
             conn.commit()
+            if vote_removed:
+                invalidate_predictions_view(user.id, match_week)
+                track_live_vote(message, "bonus", question_id, {selected_option: -1})
 
         elif "Bonus Result" in title:
             question_text = title.split(":")[1].strip()
@@ -1312,17 +2209,11 @@ async def on_raw_reaction_remove(payload):
             question_id, options, reaction_type, answer_data, match_week = question_row
 
             option_split = [option.strip() for option in options.split(",")]
-            if reaction_type == "numbers":
-                reactions = [f"{i + 1}️⃣" for i in range(len(option_split))]
-            elif reaction_type == "teams":
-                    # Try to get emotes for each team
-                reactions = []
-                for team in option_split:
-                    if team in TEAM_EMOTES:
-                        reactions.append(TEAM_EMOTES[team])
+            emoji_key = emojis.key(payload.emoji)
+            selected_option = EMOJIS.bonus_choice(reaction_type, option_split, emoji_key)
 
             # Only proceed if we haven't awarded points yet
-            if str(payload.emoji.name) == "✅":  # If the finalize emoji
+            if emoji_key == emojis.FINALIZE:
                 cursor.execute('BEGIN TRANSACTION')
                 try:
                     # Get all users who got points for this question
@@ -1353,21 +2244,22 @@ async def on_raw_reaction_remove(payload):
                     SET correct_answer = NULL 
                     WHERE id = ?
                     ''', (question_id,))
+                    log_event("bonus_finalize_undone", question_id=question_id, match_week=match_week)
                     cursor.execute('COMMIT')
+                    invalidate_predictions_view(match_week=match_week)
                     await update_leaderboard()
                     return
                 except Exception as e:
                     cursor.execute('ROLLBACK')
-                    print(f"Error during transaction: {e}")
+                    reaction_log.exception("Error during transaction: %s", e)
                     return
 
-            elif str(payload.emoji.name) in reactions:
+            elif selected_option is not None:
         # Only proceed if tick is not present
-                if not any(r.emoji == "✅" for r in message.reactions):
+                if not any(r.emoji == emojis.FINALIZE for r in message.reactions):
                     if answer_data:
                         correct_answers = set(json.loads(answer_data))
-                        selected_option = dict(zip(reactions, option_split)).get(str(payload.emoji.name))
-                            
+
                         if selected_option and selected_option in correct_answers:
                             correct_answers.remove(selected_option)
                             # Update database with new correct answers
@@ -1394,7 +2286,7 @@ async def on_raw_reaction_remove(payload):
 
                 # Locate Match in DB
                 cursor.execute('''
-                SELECT id FROM matches
+                SELECT id, match_week FROM matches
                 WHERE team1 = ? AND team2 = ? AND match_type = ? AND match_date = ?
                 ''', (team1, team2, match_type, match_date))
                 match_row = cursor.fetchone()
@@ -1402,49 +2294,12 @@ async def on_raw_reaction_remove(payload):
                 if not match_row:
                     return  # No match found, nothing to remove
 
-                match_id = match_row[0]
-
-                # Handle reaction validation
-                all_possible_reactions = set()
-                for reaction_set in REACTION_SETS.values():
-                    all_possible_reactions.update(reaction_set)
-
-                if str(payload.emoji.name) not in all_possible_reactions:
-                    return
-
-                # Find which reaction set was used
-                used_reaction_set = None
-                for set_name, reactions in REACTION_SETS.items():
-                    if str(payload.emoji.name) in reactions:
-                        used_reaction_set = set_name
-                        break
-
-                if not used_reaction_set:
-                    return
-
-                # Generate score options based on match type
-                if match_type == 'BO1':
-                    options = [f"{team1} wins", f"{team2} wins"]
-                    reactions = (REACTION_SETS[used_reaction_set][0], REACTION_SETS[used_reaction_set][5])  # Outer pair (🟦🟥)
-                elif match_type == 'BO3':
-                    options = [f"{team1} 2-0", f"{team1} 2-1", f"{team2} 2-1", f"{team2} 2-0"]
-                    reactions = (                                                    # From outside in:
-                        REACTION_SETS[used_reaction_set][0],  # 🟦 (far left)
-                        REACTION_SETS[used_reaction_set][1],  # 🟥 (far right)
-                        REACTION_SETS[used_reaction_set][4],  # 🔵 (inner left)
-                        REACTION_SETS[used_reaction_set][5]   # 🔴 (inner right)
-                    )
-                elif match_type == 'BO5':
-                    options = [
-                        f"{team1} 3-0", f"{team1} 3-1", f"{team1} 3-2",
-                        f"{team2} 3-2", f"{team2} 3-1", f"{team2} 3-0"
-                    ]
-                    reactions = REACTION_SETS[used_reaction_set][:6]  # All six emojis
+                match_id, match_week = match_row
 
                 # Get the prediction that corresponds to the removed reaction
-                if str(payload.emoji.name) in reactions:
-                    selected_index = reactions.index(str(payload.emoji.name))
-                    prediction = options[selected_index]
+                selected_index = EMOJIS.match_choice(match_type, emojis.key(payload.emoji), match_layout())
+                if selected_index is not None:
+                    prediction = match_options(match_type, team1, team2)[selected_index]
                     pred_winner, pred_score = prediction.split(" ", 1)
 
                     # Only delete if the stored prediction matches the removed reaction
@@ -1453,11 +2308,18 @@ async def on_raw_reaction_remove(payload):
                     WHERE match_id = ? AND user_id = ? 
                     AND pred_winner = ? AND pred_score = ?
                     ''', (match_id, user.id, pred_winner, pred_score))
+                    vote_removed = cursor.rowcount > 0
+                    if vote_removed:
+                        bump_tally("match", match_id, prediction, -1)
+                        log_event("match_unvote", match_id=match_id, user_id=user.id, option=prediction)
                     conn.commit()
+                    if vote_removed:
+                        invalidate_predictions_view(user.id, match_week)
+                        track_live_vote(message, "match", match_id, {prediction: -1})
 
 
             except Exception as e:
-                print(f"Error removing match prediction: {e}")
+                reaction_log.exception("Error removing match prediction: %s", e)
         elif "Result Poll" in title:
             try:
                 match_details = title.split(":")[1].strip()
@@ -1515,8 +2377,10 @@ async def on_raw_reaction_remove(payload):
                         SET winner = NULL, score = NULL 
                         WHERE id = ?
                         ''', (match_id,))
+                        log_event("match_result_cleared", match_id=match_id, match_week=match_week)
 
                         cursor.execute('COMMIT')
+                        invalidate_predictions_view(match_week=match_week)
                         await message.channel.send(f"Result for {team1} vs {team2} has been cleared and points have been removed.")
                         await update_leaderboard()
 
@@ -1528,21 +2392,23 @@ async def on_raw_reaction_remove(payload):
             except Exception as e:
                 await message.channel.send(f"Error processing result removal: {e}")
     except Exception as e:
-        print(f"Error handling raw reaction removal: {e}")
+        reaction_log.exception("Error handling raw reaction removal: %s", e)
     
 
 @bot.command()
 @commands.check(is_mod_channel)
-async def reset_stage(ctx, stage: int):
+async def reset_stage(ctx, stage: str):
     """
     Reset leaderboard entries and predictions for a specific tournament stage.
     Args:
-        stage: Tournament stage ('G' for Groups, 'SF' for Semi-Finals, 'F' for Finals)
+        stage: Tournament stage, a week number or a stage code like 'SF' depending on the tournament
     """
     try:
         # Validate stage input
-        if stage not in TOURNAMENT_STAGES:
-            await ctx.send("❌ Invalid stage. Use 'G' for Groups, 'SF' for Semi-Finals, or 'F' for Finals.")
+        try:
+            stage = STAGE_MODEL.parse(stage)
+        except ValueError as e:
+            await ctx.send(f"❌ {e}")
             return
 
         # Start transaction
@@ -1556,7 +2422,7 @@ async def reset_stage(ctx, stage: int):
             match_ids = [row[0] for row in cursor.fetchall()]
 
             if not match_ids:
-                await ctx.send(f"No matches found for stage {TOURNAMENT_STAGES[stage][0]}.")
+                await ctx.send(f"No matches found for stage {STAGE_MODEL.name(stage)}.")
                 return
 
             # Delete leaderboard entries for this stage
@@ -1564,9 +2430,10 @@ async def reset_stage(ctx, stage: int):
             DELETE FROM leaderboard 
             WHERE match_week = ?
             ''', (stage,))
+            log_event("stage_reset", match_week=stage)
 
             cursor.execute('COMMIT')
-            await ctx.send(f"✅ Successfully reset all entries for {TOURNAMENT_STAGES[stage][0]}.")
+            await ctx.send(f"✅ Successfully reset all entries for {STAGE_MODEL.name(stage)}.")
             await update_leaderboard()
 
         except Exception as e:
@@ -1578,16 +2445,18 @@ async def reset_stage(ctx, stage: int):
 
 @bot.command()
 @commands.check(is_mod_channel)
-async def clear_results(ctx, stage: int):
+async def clear_results(ctx, stage: str):
     """
     Removes all winners and scorelines from matches in a specific tournament stage.
     Args:
-        stage: Tournament stage ('G' for Groups, 'SF' for Semi-Finals, 'F' for Finals)
+        stage: Tournament stage, a week number or a stage code like 'SF' depending on the tournament
     """
     try:
         # Validate stage input
-        if stage not in TOURNAMENT_STAGES:
-            await ctx.send("❌ Invalid stage. Use 'G' for Groups, 'SF' for Semi-Finals, or 'F' for Finals.")
+        try:
+            stage = STAGE_MODEL.parse(stage)
+        except ValueError as e:
+            await ctx.send(f"❌ {e}")
             return
 
         # Start transaction
@@ -1602,7 +2471,7 @@ async def clear_results(ctx, stage: int):
             matches_with_results = cursor.fetchall()
 
             if not matches_with_results:
-                await ctx.send(f"No results found for {TOURNAMENT_STAGES[stage][0]}.")
+                await ctx.send(f"No results found for {STAGE_MODEL.name(stage)}.")
                 return
 
             # Remove points from predictions and leaderboard
@@ -1631,9 +2500,11 @@ async def clear_results(ctx, stage: int):
             SET winner = NULL, score = NULL 
             WHERE match_week = ?
             ''', (stage,))
+            log_event("stage_results_cleared", match_week=stage)
 
             cursor.execute('COMMIT')
-            await ctx.send(f"✅ Successfully cleared all results from {TOURNAMENT_STAGES[stage][0]}.")
+            invalidate_predictions_view(match_week=stage)
+            await ctx.send(f"✅ Successfully cleared all results from {STAGE_MODEL.name(stage)}.")
             await update_leaderboard()
 
         except Exception as e:
@@ -1644,64 +2515,217 @@ async def clear_results(ctx, stage: int):
         await ctx.send(f"❌ Error: {e}")
 
 
+# match_week -> {user_id: rendered !predictions embed}
+predictions_view_cache = tenants.TenantDict("predictions_view")
+# user_id -> latest match week the user has predicted for
+latest_prediction_week_cache = tenants.TenantDict("latest_prediction_week")
+
+def invalidate_predictions_view(user_id=None, match_week=None):
+    """
+    Drops cached !predictions embeds.
+    Pass a user and week when one user's votes change, just a week when results for it change,
+    just a user to drop all of their weeks, or nothing to clear everything.
+    """
+    if user_id is None:
+        if match_week is None:
+            predictions_view_cache.clear()
+            latest_prediction_week_cache.clear()
+        else:
+            predictions_view_cache.pop(match_week, None)
+        return
+
+    latest_prediction_week_cache.pop(user_id, None)
+    weeks = [match_week] if match_week is not None else list(predictions_view_cache)
+    for week in weeks:
+        predictions_view_cache.get(week, {}).pop(user_id, None)
+
+MATCHES_PAGE_SIZE = 8
+
+def parse_match_filters(filters):
+    """
+    Turns !matches filter arguments into SQL conditions and parameters.
+    Filters: week:<n>, date:<DD-MM>, pending (no result yet), nopoll (poll not created)
+    """
+    conditions = []
+    params = []
+    for item in filters:
+        key, _, value = item.lower().partition(":")
+        if key == "week":
+            conditions.append("match_week = ?")
+            params.append(STAGE_MODEL.parse(value))
+        elif key == "date":
+            parsed_date = datetime.strptime(value, "%d-%m").replace(year=datetime.now().year)
+            conditions.append("match_date = ?")
+            params.append(parsed_date.strftime("%Y-%m-%d"))
+        elif key == "pending":
+            conditions.append("winner IS NULL")
+        elif key == "nopoll":
+            conditions.append("poll_created = FALSE")
+        else:
+            raise ValueError(f"Unknown filter '{item}'. Use week:<n>, date:<DD-MM>, pending or nopoll.")
+    return conditions, params
+
+def fetch_matches_page(conditions, params, after=None, before=None):
+    """
+    Fetches one page of matches using keyset pagination on (match_date, id).
+    Pass the (match_date, id) of the last row shown as `after` for the next page,
+    or of the first row shown as `before` for the previous page.
+    Returns (rows, has_more) where has_more says whether rows exist beyond this page in that direction.
+    """
+    where = list(conditions)
+    page_params = list(params)
+    if after:
+        where.append("(match_date, id) > (?, ?)")
+        page_params.extend(after)
+    elif before:
+        where.append("(match_date, id) < (?, ?)")
+        page_params.extend(before)
+
+    direction = "DESC" if before else "ASC"
+    where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+    cursor.execute(f'''
+    SELECT id, match_date, match_week, match_type, team1, team2, poll_created, winner, score
+    FROM matches
+    {where_clause}
+    ORDER BY match_date {direction}, id {direction}
+    LIMIT ?
+    ''', (*page_params, MATCHES_PAGE_SIZE + 1))
+    rows = cursor.fetchall()
+
+    has_more = len(rows) > MATCHES_PAGE_SIZE
+    rows = rows[:MATCHES_PAGE_SIZE]
+    if before:
+        rows.reverse()
+    return rows, has_more
+
+
+class MatchesView(discord.ui.View):
+    """
+    Previous/next buttons for the !matches listing. Only the page being shown is queried.
+    """
+    def __init__(self, author_id, conditions, params, rows, has_next):
+        super().__init__(timeout=300)
+        self.author_id = author_id
+        self.tenant = tenants.active()  # Button presses arrive in their own task
+        self.conditions = conditions
+        self.params = params
+        self.rows = rows
+        self.page = 1
+        self.has_prev = False
+        self.has_next = has_next
+        self.message = None
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.previous_page.disabled = not self.has_prev
+        self.next_page.disabled = not self.has_next
+
+    def build_embed(self):
+        embed = discord.Embed(
+            title="Current Matches in Database",
+            color=discord.Color.blue()
+        )
+        for match_id, match_date, match_week, match_type, team1, team2, poll_created, winner, score in self.rows:
+            poll_status = "✅" if poll_created else "❌"
+            result = f"Winner: {winner}, Score: {score}" if winner else "Result: Not recorded"
+            embed.add_field(
+                name=f"#{match_id} {team1} vs {team2} ({match_type.upper()})",
+                value=f"**Date:** {match_date} ({STAGE_MODEL.name(match_week)})\n**Poll Created:** {poll_status}\n{result}",
+                inline=False
+            )
+        embed.set_footer(text=f"Page {self.page}")
+        return embed
+
+    async def interaction_check(self, interaction):
+        tenants.activate(self.tenant)
+        return interaction.user.id == self.author_id
+
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction, button):
+        first = self.rows[0]
+        rows, has_more = fetch_matches_page(self.conditions, self.params, before=(first[1], first[0]))
+        if rows:
+            self.rows = rows
+            self.page -= 1
+        self.has_prev = has_more
+        self.has_next = True
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction, button):
+        last = self.rows[-1]
+        rows, has_more = fetch_matches_page(self.conditions, self.params, after=(last[1], last[0]))
+        if rows:
+            self.rows = rows
+            self.page += 1
+        self.has_prev = True
+        self.has_next = has_more
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+
 @bot.command()
 @commands.check(is_mod_channel)
-async def matches(ctx):
+async def matches(ctx, *filters):
     """
-    Display all matches currently in the database.
+    Display matches in the database, a page at a time.
+    Optional filters: week:<n>, date:<DD-MM>, pending (no result yet), nopoll (poll not created)
+    Example: !matches week:3 pending
     """
-    cursor.execute('''
-    SELECT id, match_date, match_type, team1, team2, poll_created, winner, score
-    FROM matches
-    ORDER BY match_date
-    ''')
-    matches = cursor.fetchall()
+    try:
+        conditions, params = parse_match_filters(filters)
+    except ValueError as e:
+        await ctx.send(f"❌ {e}")
+        return
+
+    rows, has_next = fetch_matches_page(conditions, params)
 
-    if not matches:
+    if not rows:
         await ctx.send("No matches found in the database!")
         return
 
-    matches_message = "**Current Matches in Database**\n"
-    for match in matches:
-        match_id, match_date, match_type, team1, team2, poll_created, winner, score = match
-        poll_status = "✅" if poll_created else "❌"
-        result = f"Winner: {winner}, Score: {score}" if winner else "Result: Not recorded"
-        matches_message += (
-            f"**Match ID:** {match_id}\n"
-            f"**Date:** {match_date}\n"
-            f"**Type:** {match_type.upper()}\n"
-            f"**Teams:** {team1} vs {team2}\n"
-            f"**Poll Created:** {poll_status}\n"
-            f"{result}\n\n"
-        )
-
-    await ctx.send(matches_message)
+    view = MatchesView(ctx.author.id, conditions, params, rows, has_next)
+    view.message = await ctx.send(embed=view.build_embed(), view=view)
 
 @bot.command()
-async def predictions(ctx, match_week: int = None):
+async def predictions(ctx, match_week: str = None):
     """
     Shows a user's predictions for a specific match week.
     If no match_week is provided, it defaults to the latest match week the user has predicted for.
     """
     try:
         user_id = ctx.author.id
-        bot_channel_id = 1346615855408091180  # Replace with your bot channel ID
+        bot_channel_id = channel_id("bot")
         bot_channel = bot.get_channel(bot_channel_id)
 
-        if isinstance(match_week, str):
+        if match_week is not None:
             try:
-                match_week = int(match_week)
+                match_week = STAGE_MODEL.parse(match_week)
             except ValueError:
-                await bot_channel.send("Please provide a valid week number (e.g., 1, 2, 3)")
+                await bot_channel.send(f"Please provide a valid week: {STAGE_MODEL.choices()}")
                 return
 
         # If no match_week is provided, get the latest match week the user has predicted for
+        if match_week is None:
+            match_week = latest_prediction_week_cache.get(user_id)
+
         if match_week is None:
             cursor.execute('''
                 SELECT DISTINCT match_week
                 FROM predictions
+                JOIN stages ON stages.stage = predictions.match_week
                 WHERE user_id = ?
-                ORDER BY match_week DESC
+                ORDER BY stages.stage_order DESC
                 LIMIT 1
             ''', (user_id,))
             latest_week = cursor.fetchone()
@@ -1711,69 +2735,75 @@ async def predictions(ctx, match_week: int = None):
                 return
 
             match_week = latest_week[0]  # Set match_week to the latest one
+            latest_prediction_week_cache[user_id] = match_week
 
-        # Fetch match predictions for the given match week
-        cursor.execute('''
-            SELECT matches.match_date, matches.team1, matches.team2, matches.match_type, 
-                   predictions.pred_winner, predictions.pred_score, predictions.points
-            FROM matches
-            LEFT JOIN predictions 
-                ON matches.id = predictions.match_id AND predictions.user_id = ?
-            WHERE matches.match_week = ?
-            ORDER BY matches.match_date, matches.id
-        ''', (user_id, match_week))
-        match_predictions = cursor.fetchall()
-
-        # Fetch bonus question predictions for the given match week
-        cursor.execute('''
-            SELECT bonus_questions.date, bonus_questions.question, bonus_answers.answer, bonus_answers.points
-            FROM bonus_questions
-            LEFT JOIN bonus_answers
-                ON bonus_questions.id = bonus_answers.question_id AND bonus_answers.user_id = ?
-            WHERE bonus_questions.match_week = ?
-            ORDER BY bonus_questions.date, bonus_questions.id
-        ''', (user_id, match_week))
-        bonus_predictions = cursor.fetchall()
-
-        # If no predictions are found
-        if not match_predictions and not bonus_predictions:
-            await bot_channel.send(f"No predictions found for match week {match_week}.")
-            return
+        # Repeat calls are served from the cache until this user's votes or the week's results change
+        embed = predictions_view_cache.get(match_week, {}).get(user_id)
+        if embed is None:
+            # Fetch match predictions for the given match week
+            cursor.execute('''
+                SELECT matches.match_date, matches.team1, matches.team2, matches.match_type, 
+                       predictions.pred_winner, predictions.pred_score, predictions.points
+                FROM matches
+                LEFT JOIN predictions 
+                    ON matches.id = predictions.match_id AND predictions.user_id = ?
+                WHERE matches.match_week = ?
+                ORDER BY matches.match_date, matches.id
+            ''', (user_id, match_week))
+            match_predictions = cursor.fetchall()
+
+            # Fetch bonus question predictions for the given match week
+            cursor.execute('''
+                SELECT bonus_questions.date, bonus_questions.question, bonus_answers.answer, bonus_answers.points
+                FROM bonus_questions
+                LEFT JOIN bonus_answers
+                    ON bonus_questions.id = bonus_answers.question_id AND bonus_answers.user_id = ?
+                WHERE bonus_questions.match_week = ?
+                ORDER BY bonus_questions.date, bonus_questions.id
+            ''', (user_id, match_week))
+            bonus_predictions = cursor.fetchall()
+
+            # If no predictions are found
+            if not match_predictions and not bonus_predictions:
+                await bot_channel.send(f"No predictions found for match week {match_week}.")
+                return
 
-        # Prepare the embed
-        embed = discord.Embed(
-            title=f"Predictions for {TOURNAMENT_STAGES[match_week][0]}",
-            description=f"{ctx.author.mention}, Here are your predictions for the selected match week.",
-            color=discord.Color.blue()
-        )
+            # Prepare the embed
+            embed = discord.Embed(
+                title=f"Predictions for {STAGE_MODEL.name(match_week)}",
+                description=f"{ctx.author.mention}, Here are your predictions for the selected match week.",
+                color=discord.Color.blue()
+            )
+
+            # Add match predictions
+            if match_predictions:
+                for match_date, team1, team2, match_type, pred_winner, pred_score, points in match_predictions:
+                    if pred_winner:
+                        prediction_text = f"{pred_winner} {pred_score} (Points: {points if points else 0})"
+                    else:
+                        prediction_text = "No prediction made."
 
-        # Add match predictions
-        if match_predictions:
-            for match_date, team1, team2, match_type, pred_winner, pred_score, points in match_predictions:
-                if pred_winner:
-                    prediction_text = f"{pred_winner} {pred_score} (Points: {points if points else 0})"
-                else:
-                    prediction_text = "No prediction made."
+                    embed.add_field(
+                        name=f"{team1} vs {team2} ({match_type}) - {match_date}",
+                        value=prediction_text,
+                        inline=False
+                    )
 
-                embed.add_field(
-                    name=f"{team1} vs {team2} ({match_type}) - {match_date}",
-                    value=prediction_text,
-                    inline=False
-                )
+            # Add bonus question predictions
+            if bonus_predictions:
+                for date, question, answer, points in bonus_predictions:
+                    if answer:
+                        answer_text = f"{json.loads(answer)} (Points: {points if points else 0})"
+                    else:
+                        answer_text = "No response given."
 
-        # Add bonus question predictions
-        if bonus_predictions:
-            for date, question, answer, points in bonus_predictions:
-                if answer:
-                    answer_text = f"{json.loads(answer)} (Points: {points if points else 0})"
-                else:
-                    answer_text = "No response given."
+                    embed.add_field(
+                        name=f"{question} - {date}",
+                        value=answer_text,
+                        inline=False
+                    )
 
-                embed.add_field(
-                    name=f"{question} - {date}",
-                    value=answer_text,
-                    inline=False
-                )
+            predictions_view_cache.setdefault(match_week, {})[user_id] = embed
 
         await bot_channel.send(embed=embed)
 
@@ -1795,10 +2825,49 @@ async def reset_leaderboard(ctx):
     conn.commit()
 
     cursor.execute('DELETE FROM bonus_answers')
+    cursor.execute('DELETE FROM poll_tallies')
+    log_event("leaderboard_reset")
     conn.commit()
+    invalidate_predictions_view()
 
     await ctx.send("Leaderboard has been reset, and all points have been cleared!")
 
+def format_voting_summary(match_date, match_rows, bonus_rows):
+    """
+    Voting summary text from (match id, team1, team2, match type, option, votes) rows
+    and (question id, question, option, votes) rows, both ordered by poll and then votes.
+    """
+    summary_message = f"**Voting Summary for {match_date}**\n"
+
+    if match_rows:
+        last_match_id = None
+        for match_id, team1, team2, match_type, option, votes in match_rows:
+            # Append match summary
+            if match_id != last_match_id:
+                last_match_id = match_id
+                summary_message += f"\n**Match:** {team1} vs {team2} ({match_type.upper()})\n"
+                if option is None:
+                    summary_message += "   No votes recorded for this match.\n"
+                    continue
+            summary_message += f" - {option}: {votes} vote(s)\n"
+    else:
+        summary_message += "\nNo matches found for this date.\n"
+
+    if bonus_rows:
+        last_question_id = None
+        for question_id, question, option, votes in bonus_rows:
+            if question_id != last_question_id:
+                last_question_id = question_id
+                summary_message += f"\n **Bonus Question:** {question}\n"
+                if option is None:
+                    summary_message += "   No responses recorded for this question.\n"
+                    continue
+            summary_message += f" - {option}: {votes} vote(s)\n"
+    else:
+        summary_message += "\nNo bonus questions found for this date.\n"
+
+    return summary_message
+
 @bot.command()
 @commands.check(is_mod_channel)
 async def voting_summary(ctx, match_date: str):
@@ -1813,75 +2882,30 @@ async def voting_summary(ctx, match_date: str):
         current_year = datetime.now().year
         match_date_with_year = match_date_obj.replace(year=current_year).strftime("%Y-%m-%d")
 
-        summary_message = f"**Voting Summary for {match_date_with_year}**\n"
-
         # ---- MATCH VOTING SUMMARY ----
+        # Counts come from poll_tallies, so this reads one row per option instead of one per vote
         cursor.execute('''
-        SELECT id, team1, team2, match_type
+        SELECT matches.id, matches.team1, matches.team2, matches.match_type, poll_tallies.option, poll_tallies.votes
         FROM matches
-        WHERE match_date = ?
+        LEFT JOIN poll_tallies
+            ON poll_tallies.poll_type = 'match' AND poll_tallies.poll_id = matches.id AND poll_tallies.votes > 0
+        WHERE matches.match_date = ?
+        ORDER BY matches.id, poll_tallies.votes DESC
         ''', (match_date_with_year,))
-        matches = cursor.fetchall()
-
-        if matches:
-            for match_id, team1, team2, match_type in matches:
-                cursor.execute('''
-                SELECT pred_winner, pred_score, COUNT(*) AS votes
-                FROM predictions
-                WHERE match_id = ?
-                GROUP BY pred_winner, pred_score
-                ORDER BY votes DESC
-                ''', (match_id,))
-                vote_data = cursor.fetchall()
-
-                # Append match summary
-                summary_message += f"\n**Match:** {team1} vs {team2} ({match_type.upper()})\n"
-                if vote_data:
-                    for pred_winner, pred_score, votes in vote_data:
-                        summary_message += f" - {pred_winner} {pred_score}: {votes} vote(s)\n"
-                else:
-                    summary_message += "   No votes recorded for this match.\n"
-        else:
-            summary_message += "\nNo matches found for this date.\n"
+        match_rows = cursor.fetchall()
 
         # ---- BONUS QUESTION VOTING SUMMARY ----
         cursor.execute('''
-        SELECT id, question, options
+        SELECT bonus_questions.id, bonus_questions.question, poll_tallies.option, poll_tallies.votes
         FROM bonus_questions
-        WHERE date = ?
+        LEFT JOIN poll_tallies
+            ON poll_tallies.poll_type = 'bonus' AND poll_tallies.poll_id = bonus_questions.id AND poll_tallies.votes > 0
+        WHERE bonus_questions.date = ?
+        ORDER BY bonus_questions.id, poll_tallies.votes DESC
         ''', (match_date_with_year,))
-        bonus_questions = cursor.fetchall()
-
-        if bonus_questions:
-            for question_id, question, options in bonus_questions:
-                # Count votes for each bonus option
-                cursor.execute('''
-                SELECT answer, COUNT(*) AS votes
-                FROM bonus_answers
-                WHERE question_id = ?
-                GROUP BY answer
-                ORDER BY votes DESC
-                ''', (question_id,))
-                bonus_vote_data = cursor.fetchall()
-
-                summary_message += f"\n **Bonus Question:** {question}\n"
-                if bonus_vote_data:
-                    option_votes = {}
-                    for answer_json, votes in bonus_vote_data:
-                        if answer_json:
-                            answers = json.loads(answer_json)
-                            # Count each selected option
-                            for answer in answers:
-                                option_votes[answer] = option_votes.get(answer, 0) + votes
-
-                # Sort and display votes
-                    for option, vote_count in sorted(option_votes.items(), key=lambda x: x[1], reverse=True):
-                        summary_message += f" - {option}: {vote_count} vote(s)\n"
-                else:
-                    summary_message += "   No responses recorded for this question.\n"
-            else:
-                summary_message += "\nNo bonus questions found for this date.\n"
+        bonus_rows = cursor.fetchall()
 
+        summary_message = format_voting_summary(match_date_with_year, match_rows, bonus_rows)
         await ctx.send(summary_message)
 
     except ValueError:
@@ -1889,6 +2913,97 @@ async def voting_summary(ctx, match_date: str):
 
 
 
+@bot.command()
+@commands.check(is_mod_channel)
+async def reconcile_tallies(ctx):
+    """
+    Checks the live vote counts against the stored votes and fixes any drift.
+    """
+    try:
+        drifted = reconcile_poll_tallies()
+        if drifted:
+            refresh_live_polls()
+            await ctx.send(f"⚠️ Corrected vote counts for {drifted} poll option(s).")
+        else:
+            await ctx.send("✅ Vote counts match the stored votes.")
+    except Exception as e:
+        await ctx.send(f"❌ Error reconciling vote counts: {e}")
+
+@bot.command()
+@commands.check(is_mod_channel)
+async def reload_config(ctx):
+    """
+    Loads CONFIG_FILE now instead of waiting for the next check.
+    """
+    try:
+        config.reload(force=True, strict=True, apply=apply_config)
+        await ctx.send(f"✅ Configuration reloaded: {len(TEAM_EMOTES)} team emotes, stages {', '.join(STAGE_MODEL.short_name(key) for key in STAGE_MODEL.keys)}.")
+    except Exception as e:
+        await ctx.send(f"❌ Error reloading configuration, keeping the current one: {e}")
+
+@bot.command()
+@commands.check(is_mod_channel)
+async def test_reactions(ctx, set_name: str):
+    """Test a reaction set"""
+    if set_name not in EMOJIS.reaction_sets:
+        await ctx.send("Invalid set name")
+        return
+
+    message = await ctx.send("Testing reactions...")
+    for reaction in EMOJIS.reaction_sets[set_name]:
+        await message.add_reaction(reaction)
+
+@bot.command()
+@commands.check(is_mod_channel)
+async def sql_top(ctx, *options):
+    """
+    Shows the heaviest SQL statements since startup (needs SQL_PROFILE=1).
+    Options: a number of statements (default 10), by:total|p99|mean|calls, plan, reset.
+    Usage: !sql_top [n] [by:p99] [plan] [reset]
+    """
+    if not sql_profiler.ENABLED:
+        await ctx.send("SQL profiling is off. Start the bot with SQL_PROFILE=1 to turn it on.")
+        return
+
+    count, order, show_plans = 10, "total", False
+    for option in options:
+        option = option.lower()
+        if option.isdigit():
+            count = min(int(option), 25)
+        elif option.startswith("by:") and option[3:] in ("total", "p99", "mean", "calls"):
+            order = option[3:]
+        elif option == "plan":
+            show_plans = True
+        elif option == "reset":
+            sql_profiler.reset()
+            await ctx.send("SQL profile cleared.")
+            return
+        else:
+            await ctx.send(f"Unknown option: {option}")
+            return
+
+    rows = sql_profiler.top(count, order)
+    if not rows:
+        await ctx.send("No statements recorded yet.")
+        return
+
+    entries = []
+    for rank, (sql, calls, total, mean_ms, p99_ms, max_ms, row_count, plan) in enumerate(rows, start=1):
+        entry = (f"{rank}. calls={calls} total={total:.3f}s mean={mean_ms:.2f}ms p99={p99_ms:.2f}ms "
+                 f"max={max_ms:.2f}ms rows={row_count}\n   {sql[:300]}\n")
+        if show_plans and plan:
+            entry += f"   plan: {plan[:300]}\n"
+        entries.append(entry)
+
+    # Keep each message under Discord's 2000 character limit
+    chunk = f"Top {len(rows)} statements by {order}:\n"
+    for entry in entries:
+        if len(chunk) + len(entry) > 1900:
+            await ctx.send(f"```{chunk}```")
+            chunk = ""
+        chunk += entry
+    await ctx.send(f"```{chunk}```")
+
 @bot.command()
 @commands.check(is_mod_channel)
 async def delete_match(ctx, team1: str, team2: str, match_type: str, match_date: str):
@@ -1900,84 +3015,150 @@ async def delete_match(ctx, team1: str, team2: str, match_type: str, match_date:
         current_year = datetime.now().year
         match_date_with_year = match_date.replace(year=current_year).strftime("%Y-%m-%d")
         
+        cursor.execute('''
+        DELETE FROM poll_tallies
+        WHERE poll_type = 'match' AND poll_id IN (
+            SELECT id FROM matches WHERE team1 = ? AND team2 = ? AND match_type = ? AND match_date = ?
+        )
+        ''', (team1, team2, match_type, match_date_with_year))
+        cursor.execute('SELECT id FROM matches WHERE team1 = ? AND team2 = ? AND match_type = ? AND match_date = ?', (team1, team2, match_type, match_date_with_year))
+        match_ids = [row[0] for row in cursor.fetchall()]
         cursor.execute('DELETE FROM matches WHERE team1 = ? AND team2 = ? AND match_type = ? AND match_date = ?', (team1, team2, match_type, match_date_with_year))
+        deleted = cursor.rowcount
+        if match_ids:
+            # Their predictions stay in the table, but no longer count towards standings (see compute_standings_drift)
+            log_event("match_deleted", match_ids=match_ids)
         conn.commit()
+        week_calendar().remove(match_date_with_year, deleted)
+        invalidate_predictions_view()
         await ctx.send(f"Match has been deleted.")
     except ValueError:
         await ctx.send("Invalid date format. Please use DD-MM.")
     except Exception as e:
         await ctx.send(f"Error deleting match: {e}")
 
-async def delete_polls(match_date: str):
+async def bulk_delete_messages(channel, message_ids):
+    """
+    Deletes messages by ID in as few API calls as possible: bulk deletes of up to 100,
+    and one call each for messages older than 14 days, which Discord won't bulk delete.
+    """
+    bulk_cutoff = discord.utils.utcnow() - timedelta(days=14) + timedelta(minutes=10)  # Margin for clock skew
+    recent = [discord.Object(id=message_id) for message_id in message_ids if discord.utils.snowflake_time(message_id) > bulk_cutoff]
+    old = [message_id for message_id in message_ids if discord.utils.snowflake_time(message_id) <= bulk_cutoff]
+
+    for i in range(0, len(recent), 100):
+        try:
+            await channel.delete_messages(recent[i:i + 100])
+        except discord.NotFound:
+            # Something in the chunk was already deleted by hand, fall back to one at a time
+            old.extend(message.id for message in recent[i:i + 100])
+
+    for message_id in old:
+        try:
+            await channel.get_partial_message(message_id).delete()
+        except discord.NotFound:
+            pass
+
+async def delete_polls(match_date: str, include_open_result_polls: bool = False):
     """
-    Deletes all polls associated with the specified match_date.
+    Deletes all polls associated with the specified match_date, found by their stored message IDs:
+    the prediction polls, and the result polls in the admin channel once their result is in.
     Args:
         match_date: The match date in dd-mm format.
+        include_open_result_polls: Also delete result polls that are still waiting for a result.
     """
     match_date = datetime.strptime(match_date, "%d-%m")      
     current_year = datetime.now().year
     match_date_with_year = match_date.replace(year=current_year).strftime("%Y-%m-%d")
-    print(match_date_with_year)
     try:
         # Fetch the channel IDs where the polls are located
-        poll_channel_id = 1346615134885253181  # Replace with actual channel IDs        
+        poll_channel_id = channel_id("poll")
         poll_channel = bot.get_channel(poll_channel_id)
-        if poll_channel is None:
-            print(f"Channel with ID {poll_channel_id} not found.")
+        admin_channel_id = channel_id("admin")
+        admin_channel = bot.get_channel(admin_channel_id)
+        if poll_channel is None or admin_channel is None:
+            log.error("Poll or admin channel not found.")
             return
 
-        # Fetch all messages from the channel
-        async for message in poll_channel.history(limit=200):
-            if message.author == bot.user and message.embeds:
-                embed = message.embeds[0]
-                if embed.description:
-                    # Look for date in the first line of description
-                    date_line = embed.description.split('\n')[0]
-                    if f"Match Date: {match_date_with_year}" in date_line:
-                        await message.delete()
+        cursor.execute('''
+        SELECT 'matches', id, poll_created AND NOT poll_deleted, poll_message_id, result_message_id, winner IS NOT NULL
+        FROM matches WHERE match_date = ?
+        UNION ALL
+        SELECT 'bonus_questions', id, poll_created AND NOT poll_deleted, poll_message_id, result_message_id, correct_answer IS NOT NULL
+        FROM bonus_questions WHERE date = ?
+        ''', (match_date_with_year, match_date_with_year))
+        polls = cursor.fetchall()
+        # Only polls that were posted, not deleted since, and have no stored message IDs date from before the IDs were stored
+        legacy_polls = any(poll_posted and poll_id is None and result_id is None for _, _, poll_posted, poll_id, result_id, _ in polls)
+
+        poll_message_ids = [int(poll_id) for _, _, _, poll_id, _, _ in polls if poll_id]
+        await bulk_delete_messages(poll_channel, poll_message_ids)
+        for message_id in poll_message_ids:
+            poll_messages.pop(message_id, None)
+        cursor.execute('UPDATE matches SET poll_message_id = NULL, poll_deleted = poll_created WHERE match_date = ?', (match_date_with_year,))
+        cursor.execute('UPDATE bonus_questions SET poll_message_id = NULL, poll_deleted = poll_created WHERE date = ?', (match_date_with_year,))
+
+        result_polls = [
+            (table, row_id, int(result_id)) for table, row_id, _, _, result_id, resolved in polls
+            if result_id and (resolved or include_open_result_polls)
+        ]
+        await bulk_delete_messages(admin_channel, [result_id for _, _, result_id in result_polls])
+        for table in ("matches", "bonus_questions"):
+            cursor.executemany(f'UPDATE {table} SET result_message_id = NULL WHERE id = ?',
+                               [(row_id,) for row_table, row_id, _ in result_polls if row_table == table])
+        conn.commit()
+
+        # Polls created before message IDs were stored can only be found by scanning the channel
+        if legacy_polls:
+            async for message in poll_channel.history(limit=200):
+                if message.author == bot.user and message.embeds:
+                    embed = message.embeds[0]
+                    if embed.description:
+                        # Look for date in the first line of description
+                        date_line = embed.description.split('\n')[0]
+                        if f"Match Date: {match_date_with_year}" in date_line:
+                            await message.delete()
 
-        print(f"All polls for {match_date} have been successfully deleted.")
+        log.info("All polls for %s have been deleted.", match_date)
 
     except Exception as e:
-        print(f"Error deleting polls for {match_date}: {e}")
+        log.exception("Error deleting polls for %s: %s", match_date, e)
 
-
-@bot.command()
+@bot.command(name="delete_polls")
 @commands.check(is_mod_channel)
-async def schedule_poll_deletion(ctx, match_date: str):
+async def delete_polls_now(ctx, match_date: str, *options):
     """
-    Schedules the deletion of polls for the given match_date at 5 PM UK time.
-    match_date format: dd-mm
+    Deletes the polls for a date right away: the prediction polls, and the result polls that have their result.
+    Add 'results' to also delete the result polls still waiting for one.
+    Usage: !delete_polls <DD-MM> [results]
     """
     try:
-        # Convert match_date to datetime
-        match_date_dt = datetime.strptime(match_date, "%d-%m")
-        current_year = datetime.now().year
-        match_date_with_year = match_date_dt.replace(year=current_year)
-
-        deletion_time_utc = uk_tz.localize(
-            datetime.combine(match_date_with_year.date(), datetime.min.time()) + timedelta(hours=16)
-        ).astimezone(pytz.utc)  # Convert to UTC for the scheduler
+        datetime.strptime(match_date, "%d-%m")
+    except ValueError:
+        await ctx.send("Invalid date format. Please use DD-MM.")
+        return
 
-        # Schedule task
-        scheduler.add_job(delete_polls, "date", run_date=deletion_time_utc, args=[match_date])
-        await ctx.send(f"Poll deletion for {match_date} scheduled at 4 PM UK time.")
+    include_open_result_polls = "results" in [option.lower() for option in options]
+    await delete_polls(match_date, include_open_result_polls)
+    await ctx.send(f"Polls for {match_date} deleted{' (including open result polls)' if include_open_result_polls else ''}.")
 
-    except Exception as e:
-        await ctx.send(f"Error scheduling poll deletion: {e}")
 
 @bot.command()
 @commands.check(is_mod_channel)
 async def announce(ctx):
     """Takes the last message from the source channel, posts it in the announcement channel, and closes the poll channel."""
     try:
-        poll_channel_id = 1346615134885253181  # Replace with actual channel IDs        
+        poll_channel_id = channel_id("poll")
         poll_channel = bot.get_channel(poll_channel_id)
-        source_channel_id = 1346615886848593985
+        source_channel_id = channel_id("announcements")
         source_channel = bot.get_channel(source_channel_id)
-        announcement_channel_id = 800704760284971058
-        announcement_channel = bot.get_channel(announcement_channel_id)
-        announcement_channel2 = bot.get_channel(381820768310263818)  # Add your second channel ID here
+        announcement_channel_id = channel_id("public_announcements")
+        announcement_channel = bot.get_channel(announcement_channel_id) if announcement_channel_id else None
+        announcement_channel2_id = channel_id("ping_announcements")
+        announcement_channel2 = bot.get_channel(announcement_channel2_id) if announcement_channel2_id else None
+        if not announcement_channel or not announcement_channel2:
+            await ctx.send("❌ Announcement channels not found. Set public_announcements and ping_announcements in the tenant's channels.")
+            return
         # Fetch the last message from the source channel
         async for message in source_channel.history(limit=1):
             last_message = message
@@ -2012,32 +3193,303 @@ async def announce(ctx):
     except Exception as e:
         await ctx.send(f"Error: {e}")
 
+async def close_poll_channel():
+    """
+    Makes the poll channel private.
+    """
+    poll_channel_id = channel_id("poll")
+    poll_channel = bot.get_channel(poll_channel_id)
+    # Make the channel private
+    overwrite = discord.PermissionOverwrite()
+    overwrite.send_messages = False
+    overwrite.read_messages = True
+    overwrite.add_reactions = True
+    overwrite.view_channel = False
+
+    await poll_channel.set_permissions(poll_channel.guild.default_role, overwrite=overwrite)
+    return poll_channel
+
+async def send_reminder(reminder_text):
+    """
+    Posts a reminder in the poll channel.
+    """
+    poll_channel = bot.get_channel(channel_id("poll"))
+    await poll_channel.send(reminder_text)
+
 @bot.command()
 @commands.check(is_mod_channel)
 async def close_channel(ctx):
     """Makes the poll channel private."""
     try:
-        poll_channel_id = 1346615134885253181  # Replace with actual channel IDs        
-        poll_channel = bot.get_channel(poll_channel_id)
-        # Make the channel private
-        overwrite = discord.PermissionOverwrite()
-        overwrite.send_messages = False
-        overwrite.read_messages = True
-        overwrite.add_reactions = True
-        overwrite.view_channel = False
-
-        await poll_channel.set_permissions(ctx.guild.default_role, overwrite=overwrite)
+        poll_channel = await close_poll_channel()
         await ctx.send(f"{poll_channel.mention} is now **private**.")
 
     except Exception as e:
         await ctx.send(f"Error: {e}")
 
 
+# Handlers that persisted jobs can run, by scheduled_jobs.kind
+JOB_HANDLERS = {
+    "delete_polls": delete_polls,
+    "close_channel": close_poll_channel,
+    "reminder": send_reminder
+}
+
+def uk_time_to_utc(date, time_of_day):
+    """
+    Turns a DD-MM date and HH:MM UK time into a UTC datetime for the scheduler.
+    """
+    parsed_date = datetime.strptime(date, "%d-%m").replace(year=datetime.now().year)
+    parsed_time = datetime.strptime(time_of_day, "%H:%M").time()
+    return uk_tz.localize(datetime.combine(parsed_date.date(), parsed_time)).astimezone(pytz.utc)
+
+def scheduler_job_id(job_id):
+    """
+    The scheduler is shared by every tenant, so its job IDs carry the tenant name.
+    """
+    return f"{tenants.active().name}:{job_id}"
+
+def add_scheduler_job(job_id, run_at):
+    scheduler.add_job(
+        run_persisted_job, "date", run_date=run_at, args=[tenants.active().name, job_id],
+        id=scheduler_job_id(job_id), replace_existing=True, misfire_grace_time=int(JOB_MISFIRE_GRACE.total_seconds())
+    )
+
+def persist_job(job_id, kind, run_at, args):
+    """
+    Stores a job in predictions.db and schedules it. Scheduling the same job_id again replaces it.
+    """
+    cursor.execute('''
+    INSERT INTO scheduled_jobs (id, kind, run_at, args, status)
+    VALUES (?, ?, ?, ?, 'pending')
+    ON CONFLICT(id) DO UPDATE SET
+        kind = excluded.kind, run_at = excluded.run_at, args = excluded.args, status = 'pending'
+    ''', (job_id, kind, run_at.isoformat(), json.dumps(args)))
+    conn.commit()
+    add_scheduler_job(job_id, run_at)
+
+async def run_persisted_job(tenant_name, job_id):
+    tenants.activate(TENANTS.by_name[tenant_name])
+
+    # Claim the job first, so it can't run twice even if it was queued twice
+    cursor.execute("UPDATE scheduled_jobs SET status = 'running' WHERE id = ? AND status = 'pending'", (job_id,))
+    claimed = cursor.rowcount > 0
+    conn.commit()
+    if not claimed:
+        return
+
+    cursor.execute('SELECT kind, args FROM scheduled_jobs WHERE id = ?', (job_id,))
+    kind, args = cursor.fetchone()
+    try:
+        await JOB_HANDLERS[kind](*json.loads(args))
+        status = "done"
+    except Exception as e:
+        log.exception("Error running scheduled job %s: %s", job_id, e)
+        status = "failed"
+
+    cursor.execute('UPDATE scheduled_jobs SET status = ? WHERE id = ?', (status, job_id))
+    conn.commit()
+
+def restore_scheduled_jobs():
+    """
+    Re-adds pending jobs after a restart. Jobs that came due while the bot was down
+    run straight away if they are still within JOB_MISFIRE_GRACE, otherwise they're marked missed.
+    """
+    now = datetime.now(pytz.utc)
+
+    # A job left 'running' was cut off mid-run; don't risk running it again
+    cursor.execute("UPDATE scheduled_jobs SET status = 'interrupted' WHERE status = 'running'")
+
+    cursor.execute("SELECT id, run_at FROM scheduled_jobs WHERE status = 'pending'")
+    for job_id, run_at in cursor.fetchall():
+        run_at = datetime.fromisoformat(run_at)
+        if now - run_at > JOB_MISFIRE_GRACE:
+            cursor.execute("UPDATE scheduled_jobs SET status = 'missed' WHERE id = ?", (job_id,))
+            log.warning("Scheduled job %s was due at %s and is past the grace window, skipping.", job_id, run_at)
+        else:
+            add_scheduler_job(job_id, max(run_at, now))
+    conn.commit()
+
+@bot.command()
+@commands.check(is_mod_channel)
+async def schedule_poll_deletion(ctx, match_date: str):
+    """
+    Schedules the deletion of polls for the given match_date at 4 PM UK time.
+    match_date format: dd-mm
+    """
+    try:
+        deletion_time_utc = uk_time_to_utc(match_date, "16:00")
+
+        # Schedule task
+        persist_job(f"delete_polls:{match_date}", "delete_polls", deletion_time_utc, [match_date])
+        await ctx.send(f"Poll deletion for {match_date} scheduled at 4 PM UK time.")
+
+    except Exception as e:
+        await ctx.send(f"Error scheduling poll deletion: {e}")
+
+@bot.command()
+@commands.check(is_mod_channel)
+async def schedule_close(ctx, date: str, time_of_day: str = "16:00"):
+    """
+    Schedules making the poll channel private.
+    Usage: !schedule_close <DD-MM> [HH:MM UK time, default 16:00]
+    """
+    try:
+        close_time_utc = uk_time_to_utc(date, time_of_day)
+        persist_job(f"close_channel:{close_time_utc.isoformat()}", "close_channel", close_time_utc, [])
+        await ctx.send(f"Poll channel will close on {date} at {time_of_day} UK time.")
+
+    except Exception as e:
+        await ctx.send(f"Error scheduling channel close: {e}")
+
+@bot.command()
+@commands.check(is_mod_channel)
+async def schedule_reminder(ctx, date: str, time_of_day: str, *, reminder_text: str):
+    """
+    Schedules a reminder message in the poll channel.
+    Usage: !schedule_reminder <DD-MM> <HH:MM UK time> <message>
+    """
+    try:
+        reminder_time_utc = uk_time_to_utc(date, time_of_day)
+        persist_job(f"reminder:{reminder_time_utc.isoformat()}", "reminder", reminder_time_utc, [reminder_text])
+        await ctx.send(f"Reminder scheduled for {date} at {time_of_day} UK time.")
+
+    except Exception as e:
+        await ctx.send(f"Error scheduling reminder: {e}")
+
+@bot.command()
+@commands.check(is_mod_channel)
+async def scheduled(ctx):
+    """
+    Lists jobs that are waiting to run.
+    """
+    cursor.execute("SELECT id, run_at FROM scheduled_jobs WHERE status = 'pending' ORDER BY run_at")
+    jobs = cursor.fetchall()
+    if not jobs:
+        await ctx.send("No scheduled jobs.")
+        return
+
+    jobs_message = "**Scheduled Jobs**\n"
+    for job_id, run_at in jobs:
+        run_at_uk = datetime.fromisoformat(run_at).astimezone(uk_tz)
+        jobs_message += f"`{job_id}` - {run_at_uk.strftime('%d-%m %H:%M')} UK\n"
+    await ctx.send(jobs_message)
+
+@bot.command()
+@commands.check(is_mod_channel)
+async def cancel_job(ctx, job_id: str):
+    """
+    Cancels a scheduled job by its id (see !scheduled).
+    """
+    cursor.execute("DELETE FROM scheduled_jobs WHERE id = ? AND status = 'pending'", (job_id,))
+    cancelled = cursor.rowcount > 0
+    conn.commit()
+    if not cancelled:
+        await ctx.send(f"No pending job with id `{job_id}`.")
+        return
+
+    if scheduler.get_job(scheduler_job_id(job_id)):
+        scheduler.remove_job(scheduler_job_id(job_id))
+    await ctx.send(f"Cancelled `{job_id}`.")
+
+def render_predictions_table(match_date, users, matches, predictions):
+    """
+    Draws the predictions grid: one row per (username, total points, weekly scores) user,
+    one column per (id, team1, team2, match type) match.
+    predictions: {(match id, username): (pred_winner, pred_score)}
+    """
+    # Pillow takes a while to import and only this command uses it, so it's loaded on the first render
+    from PIL import Image, ImageDraw, ImageFont
+
+    # Image dimensions
+    width = 200 + (len(matches) * 150)
+    header_height = 60
+    row_height = 30
+    column_width = 150
+    username_width = 150
+    points_width = 100
+    grid_color = 'gray'
+    line_thickness = 2
+    padding = 10
+
+    total_rows = len(users)
+    height = header_height + (row_height * (total_rows + 1)) + padding
+
+    # Create image
+    img = Image.new('RGB', (width, height), color='white')
+    draw = ImageDraw.Draw(img)
+    
+    try:
+        font = ImageFont.truetype("arial.ttf", 36)
+    except:
+        font = ImageFont.load_default()
+
+    # Draw header
+    draw.rectangle([0, 0, width, header_height], fill='lightblue')
+    draw.text((padding, 20), f"Predictions for {match_date}", font=font, fill='black')
+
+    # Draw grid
+    # Vertical lines
+    x = username_width
+    draw.line([(x, header_height), (x, height)], fill=grid_color, width=line_thickness)
+    x += points_width
+    draw.line([(x, header_height), (x, height)], fill=grid_color, width=line_thickness)
+    for i in range(len(matches)):
+        x += column_width
+        draw.line([(x, header_height), (x, height)], fill=grid_color, width=line_thickness)
+
+    # Horizontal lines
+    for i in range(total_rows + 2):
+        y = header_height + (i * row_height)
+        draw.line([(0, y), (width, y)], fill=grid_color, width=line_thickness)
+
+    # Draw column headers
+    y = header_height + padding
+    draw.text((padding, y), "Username", font=font, fill='black')
+    draw.text((username_width + padding, y), "Points", font=font, fill='black')
+    x = username_width + points_width + padding
+    for match in matches:
+        draw.text((x, y), f"{match[1]} vs {match[2]}", font=font, fill='black')
+        x += column_width
+
+    # Colors for top positions
+    position_colors = {
+        0: '#FFD700',  # Gold
+        1: '#C0C0C0',  # Silver
+        2: '#CD7F32'   # Bronze
+    }
+
+    # Get top 3 scores to handle ties
+    scores = sorted(set(points for _, points, _ in users), reverse=True)[:3]
+    
+    # Draw predictions
+    y = header_height + row_height + padding
+    for i, (username, total_points, weekly_scores) in enumerate(users):
+        # Determine background color based on position
+        if total_points in scores[:3]:
+            position = scores.index(total_points)
+            bg_color = position_colors[position]
+            draw.rectangle([0, y-padding, width, y+row_height-padding], fill=bg_color)
+
+        draw.text((padding, y), username, font=font, fill='black')
+        draw.text((username_width + padding, y), str(total_points), font=font, fill='black')
+        
+        x = username_width + points_width + padding
+        for match in matches:
+            pred = predictions.get((match[0], username))
+            pred_text = f"{pred[0]} {pred[1]}" if pred else "No prediction"
+            draw.text((x, y), pred_text, font=font, fill='black')
+            x += column_width
+        y += row_height
+    
+    img = img.resize((width, height), Image.LANCZOS)
+    return img
+
 @bot.command()
 async def predictions_table(ctx, match_date: str):
     """Creates an image showing all predictions for matches on a given date."""
     try:
-        bot_channel_id = 1346615855408091180
+        bot_channel_id = channel_id("bot")
         bot_channel = bot.get_channel(bot_channel_id)
         match_date_obj = datetime.strptime(match_date, "%d-%m")
         current_year = datetime.now().year
@@ -2067,94 +3519,16 @@ async def predictions_table(ctx, match_date: str):
         ''', (match_date_with_year,))
         matches = cursor.fetchall()
 
-        # Image dimensions
-        width = 200 + (len(matches) * 150)
-        header_height = 60
-        row_height = 30
-        column_width = 150
-        username_width = 150
-        points_width = 100
-        grid_color = 'gray'
-        line_thickness = 2
-        padding = 10
-
-        total_rows = len(users)
-        height = header_height + (row_height * (total_rows + 1)) + padding
-
-        # Create image
-        img = Image.new('RGB', (width, height), color='white')
-        draw = ImageDraw.Draw(img)
-        
-        try:
-            font = ImageFont.truetype("arial.ttf", 36)
-        except:
-            font = ImageFont.load_default()
-
-        # Draw header
-        draw.rectangle([0, 0, width, header_height], fill='lightblue')
-        draw.text((padding, 20), f"Predictions for {match_date}", font=font, fill='black')
-
-        # Draw grid
-        # Vertical lines
-        x = username_width
-        draw.line([(x, header_height), (x, height)], fill=grid_color, width=line_thickness)
-        x += points_width
-        draw.line([(x, header_height), (x, height)], fill=grid_color, width=line_thickness)
-        for i in range(len(matches)):
-            x += column_width
-            draw.line([(x, header_height), (x, height)], fill=grid_color, width=line_thickness)
-
-        # Horizontal lines
-        for i in range(total_rows + 2):
-            y = header_height + (i * row_height)
-            draw.line([(0, y), (width, y)], fill=grid_color, width=line_thickness)
-
-        # Draw column headers
-        y = header_height + padding
-        draw.text((padding, y), "Username", font=font, fill='black')
-        draw.text((username_width + padding, y), "Points", font=font, fill='black')
-        x = username_width + points_width + padding
-        for match in matches:
-            draw.text((x, y), f"{match[1]} vs {match[2]}", font=font, fill='black')
-            x += column_width
-
-        # Colors for top positions
-        position_colors = {
-            0: '#FFD700',  # Gold
-            1: '#C0C0C0',  # Silver
-            2: '#CD7F32'   # Bronze
-        }
+        # All predictions for these matches in one query instead of one per user and match
+        cursor.execute(f'''
+        SELECT predictions.match_id, users.username, predictions.pred_winner, predictions.pred_score
+        FROM predictions
+        JOIN users ON predictions.user_id = users.user_id
+        WHERE predictions.match_id IN ({",".join(["?"] * len(matches))})
+        ''', [match[0] for match in matches])
+        predictions = {(match_id, username): (pred_winner, pred_score) for match_id, username, pred_winner, pred_score in cursor.fetchall()}
 
-        # Get top 3 scores to handle ties
-        scores = sorted(set(points for _, points, _ in users), reverse=True)[:3]
-        
-        # Draw predictions
-        y = header_height + row_height + padding
-        for i, (username, total_points, weekly_scores) in enumerate(users):
-            # Determine background color based on position
-            if total_points in scores[:3]:
-                position = scores.index(total_points)
-                bg_color = position_colors[position]
-                draw.rectangle([0, y-padding, width, y+row_height-padding], fill=bg_color)
-
-            draw.text((padding, y), username, font=font, fill='black')
-            draw.text((username_width + padding, y), str(total_points), font=font, fill='black')
-            
-            x = username_width + points_width + padding
-            for match in matches:
-                cursor.execute('''
-                SELECT pred_winner, pred_score
-                FROM predictions
-                JOIN users ON predictions.user_id = users.user_id
-                WHERE match_id = ? AND users.username = ?
-                ''', (match[0], username))
-                pred = cursor.fetchone()
-                pred_text = f"{pred[0]} {pred[1]}" if pred else "No prediction"
-                draw.text((x, y), pred_text, font=font, fill='black')
-                x += column_width
-            y += row_height
-        
-        img = img.resize((width, height), Image.LANCZOS)
+        img = render_predictions_table(match_date, users, matches, predictions)
 
         # Save and send image
         with io.BytesIO() as image_binary:
@@ -2205,6 +3579,12 @@ async def add_prediction(ctx, username: str, match_date: str, team1: str, team2:
 
         match_id, match_week = match_data
 
+        cursor.execute('''
+        SELECT pred_winner, pred_score FROM predictions
+        WHERE match_id = ? AND user_id = ?
+        ''', (match_id, user_id))
+        previous_prediction = cursor.fetchone()
+
         # Add the prediction
         cursor.execute('''
         INSERT INTO predictions (user_id, match_id, match_week, pred_winner, pred_score)
@@ -2212,9 +3592,16 @@ async def add_prediction(ctx, username: str, match_date: str, team1: str, team2:
         ON CONFLICT(user_id, match_id) DO UPDATE SET
             pred_winner = excluded.pred_winner,
             pred_score = excluded.pred_score
-        ''', (user_id, match_id, int(match_week), pred_winner, pred_score))
+        ''', (user_id, match_id, match_week, pred_winner, pred_score))
+
+        if previous_prediction != (pred_winner, pred_score):
+            if previous_prediction:
+                bump_tally("match", match_id, " ".join(previous_prediction), -1)
+            bump_tally("match", match_id, f"{pred_winner} {pred_score}", 1)
+            log_event("match_vote", match_id=match_id, match_week=match_week, user_id=user_id, option=f"{pred_winner} {pred_score}", source="manual")
 
         conn.commit()
+        invalidate_predictions_view(user_id, match_week)
         await ctx.send(f"Added prediction for {username}: {pred_winner} {pred_score} in {team1} vs {team2}")
 
     except ValueError:
@@ -2234,126 +3621,389 @@ async def update_board(ctx):
     except Exception as e:
         await ctx.send(f"Error updating leaderboard: {e}")
 
+def compute_standings_drift(match_week=None, user_id=None):
+    """
+    Works out the weekly points the stored predictions and bonus answers add up to and diffs them
+    against the leaderboard, optionally for one week and/or one user.
+    Returns [(user_id, match_week, current_points, expected_points)] for rows that differ,
+    current_points being None when the leaderboard has no row.
+    Rows for weeks a user didn't vote in (the missed-week minimum scores) are never touched.
+    """
+    conditions = []
+    params = []
+    if match_week is not None:
+        conditions.append("match_week = ?")
+        params.append(match_week)
+    if user_id is not None:
+        conditions.append("user_id = ?")
+        params.append(user_id)
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    # Expected standings go into a temp table so the main database is only read here
+    cursor.execute('DROP TABLE IF EXISTS temp.expected_standings')
+    cursor.execute('''
+    CREATE TEMP TABLE expected_standings (
+        user_id INTEGER,
+        match_week INTEGER,
+        weekly_points INTEGER,
+        PRIMARY KEY (user_id, match_week)
+    )
+    ''')
+    cursor.execute(f'''
+    INSERT INTO expected_standings (user_id, match_week, weekly_points)
+    SELECT user_id, match_week, SUM(points)
+    FROM (
+        SELECT user_id, match_week, COALESCE(points, 0) AS points
+        FROM predictions
+        WHERE match_id IN (SELECT id FROM matches)
+        UNION ALL
+        SELECT user_id, match_week, COALESCE(points, 0) AS points
+        FROM bonus_answers
+    )
+    {where_clause}
+    GROUP BY user_id, match_week
+    ''', params)
+
+    cursor.execute('''
+    SELECT expected_standings.user_id, expected_standings.match_week,
+           leaderboard.weekly_points, expected_standings.weekly_points
+    FROM expected_standings
+    LEFT JOIN leaderboard
+        ON leaderboard.user_id = expected_standings.user_id AND leaderboard.match_week = expected_standings.match_week
+    WHERE (leaderboard.weekly_points IS NULL AND expected_standings.weekly_points != 0)
+       OR leaderboard.weekly_points != expected_standings.weekly_points
+    ORDER BY expected_standings.match_week, expected_standings.user_id
+    ''')
+    drift = cursor.fetchall()
+
+    cursor.execute('DROP TABLE temp.expected_standings')
+    conn.commit()  # Releases the read lock before any changes are written
+
+    return drift
+
+def apply_standings_drift(drift):
+    """
+    Writes only the leaderboard rows that compute_standings_drift found to be wrong.
+    """
+    cursor.executemany('''
+    INSERT INTO leaderboard (user_id, match_week, weekly_points)
+    VALUES (?, ?, ?)
+    ON CONFLICT(user_id, match_week) DO UPDATE SET weekly_points = excluded.weekly_points
+    ''', [(user_id, match_week, expected_points) for user_id, match_week, _, expected_points in drift])
+    for user_id, match_week, _, expected_points in drift:
+        log_event("leaderboard_set", user_id=user_id, match_week=match_week, points=expected_points, reason="recalculate")
+    conn.commit()
+
 @bot.command()
 @commands.check(is_mod_channel)
-async def recalculate_weeks(ctx):
-    """Recalculates weekly points for all users based on stored predictions and bonus answers."""
+async def recalculate_weeks(ctx, *options):
+    """
+    Recalculates weekly points from stored predictions and bonus answers, only rewriting rows that are wrong.
+    Options: week:<n> and/or user:<username> to limit the scope, dry to only report the differences.
+    Example: !recalculate_weeks week:3 dry
+    """
     try:
-        cursor.execute('BEGIN TRANSACTION')
-        
-        # Clear existing leaderboard
-        cursor.execute('DELETE FROM leaderboard')
-        
-        # Recalculate match prediction points
-        cursor.execute('''
-        INSERT INTO leaderboard (user_id, match_week, weekly_points)
-        SELECT user_id, match_week, SUM(points) as total_points
-        FROM predictions
-        WHERE points > 0
-        GROUP BY user_id, match_week
-        ''')
-        
-        # Add bonus question points
-        cursor.execute('''
-        INSERT INTO leaderboard (user_id, match_week, weekly_points)
-        SELECT user_id, match_week, SUM(points) as total_points
-        FROM bonus_answers
-        WHERE points > 0
-        GROUP BY user_id, match_week
-        ON CONFLICT(user_id, match_week) 
-        DO UPDATE SET weekly_points = leaderboard.weekly_points + excluded.weekly_points
-        ''')
-        
-        cursor.execute('COMMIT')
-        await ctx.send("✅ Weekly points recalculated successfully!")
+        match_week = None
+        user_id = None
+        dry_run = False
+        for option in options:
+            key, _, value = option.partition(":")
+            if key.lower() == "week":
+                match_week = STAGE_MODEL.parse(value)
+            elif key.lower() == "user":
+                cursor.execute('SELECT user_id FROM users WHERE username = ?', (value,))
+                user_row = cursor.fetchone()
+                if not user_row:
+                    await ctx.send(f"❌ No user found with username: {value}")
+                    return
+                user_id = user_row[0]
+            elif key.lower() == "dry":
+                dry_run = True
+            else:
+                await ctx.send(f"❌ Unknown option '{option}'. Use week:<n>, user:<username> or dry.")
+                return
+
+        drift = compute_standings_drift(match_week, user_id)
+
+        if not drift:
+            await ctx.send("✅ Leaderboard already matches the stored points.")
+            return
+
+        if dry_run:
+            # One JSON parameter however many rows drifted, so a large drift stays under SQLite's variable limit
+            cursor.execute('''
+            SELECT user_id, username FROM users
+            WHERE user_id IN (SELECT value FROM json_each(?))
+            ''', (json.dumps(sorted({row[0] for row in drift})),))
+            usernames = dict(cursor.fetchall())
+
+            report = f"**Leaderboard drift: {len(drift)} row(s)**\n"
+            for drift_user_id, drift_week, current_points, expected_points in drift:
+                line = f"{STAGE_MODEL.short_name(drift_week)} {usernames.get(drift_user_id, drift_user_id)}: {current_points if current_points is not None else 'missing'} → {expected_points}\n"
+                if len(report) + len(line) > 1900:
+                    await ctx.send(report)
+                    report = ""
+                report += line
+            await ctx.send(report)
+            return
+
+        apply_standings_drift(drift)
+        await ctx.send(f"✅ Weekly points recalculated successfully! {len(drift)} row(s) corrected.")
         await update_leaderboard()
-        
+
     except Exception as e:
-        cursor.execute('ROLLBACK')
+        conn.rollback()
         await ctx.send(f"❌ Error recalculating points: {e}")
 
-@bot.command()
-@commands.check(is_mod_channel)
-async def sync_poll_reactions(ctx):
-    """Syncs database answers with current poll reactions for all bonus questions in channel."""
+POLL_SYNC_CONCURRENCY = 5  # Polls fetched from Discord at once
+
+def match_options(match_type, team1, team2):
+    """
+    The score options of a match poll, in poll order. None for an unknown match type.
+    """
+    if match_type == 'BO1':
+        return [f"{team1} wins", f"{team2} wins"]
+    if match_type == 'BO3':
+        return [f"{team1} 2-0", f"{team1} 2-1", f"{team2} 2-1", f"{team2} 2-0"]
+    if match_type == 'BO5':
+        return [
+            f"{team1} 3-0", f"{team1} 3-1", f"{team1} 3-2",
+            f"{team2} 3-2", f"{team2} 3-1", f"{team2} 3-0"
+        ]
+    return None
+
+def match_poll_options(team1, team2, match_type):
+    """
+    {reaction key: option} for a match poll, laid out the same way create_polls does.
+    """
+    if match_type not in emojis.MATCH_TYPES:
+        match_type = 'BO5'
+    reactions = EMOJIS.match_reactions(match_type, layout=match_layout())
+    return dict(zip(map(emojis.key, reactions), match_options(match_type, team1, team2)))
+
+def bonus_poll_options(options, reaction_type):
+    """
+    {reaction key: option} for a bonus question poll, laid out the same way create_polls does.
+    """
+    return EMOJIS.bonus_poll_options(reaction_type, [option.strip() for option in options.split(",")])
+
+def diff_match_votes(options, reactors, current, prune=False):
+    """
+    Compares who reacted to a match poll with the stored predictions.
+    options: {reaction key: option}, reactors: {reaction key: {user_id: username}}, current: {user_id: option}.
+    Returns (upserts {user_id: option}, deletes [user_id]).
+    Predictions without a reaction are only deleted with prune, since add_prediction creates those.
+    """
+    reacted = {}
+    for key, option in options.items():
+        for user_id in reactors.get(key, {}):
+            reacted.setdefault(user_id, []).append(option)
+
+    # Someone reacting twice keeps their stored pick if it's one of them, otherwise the first in poll order
+    upserts = {user_id: choices[0] for user_id, choices in reacted.items() if current.get(user_id) not in choices}
+    deletes = [user_id for user_id in current if user_id not in reacted] if prune else []
+    return upserts, deletes
+
+def diff_bonus_votes(options, reactors, current, required_answers):
+    """
+    Compares who reacted to a bonus poll with the stored answers.
+    options: {reaction key: option}, reactors: {reaction key: {user_id: username}}, current: {user_id: [answers]}.
+    Returns (upserts {user_id: [answers]}, deletes [user_id]).
+    """
+    reacted = {}
+    for key, option in options.items():
+        for user_id in reactors.get(key, {}):
+            reacted.setdefault(user_id, []).append(option)
+
+    upserts = {}
+    for user_id, choices in reacted.items():
+        # Stored answers that still have a reaction keep their order, new ones fill up to required_answers
+        answers = [answer for answer in current.get(user_id, []) if answer in choices]
+        answers += [choice for choice in choices if choice not in answers][:max(required_answers - len(answers), 0)]
+        if answers != current.get(user_id):
+            upserts[user_id] = answers
+    deletes = [user_id for user_id in current if user_id not in reacted]
+    return upserts, deletes
+
+def recount_poll_tallies(poll_type, poll_id):
+    """
+    Rebuilds one poll's rows in poll_tallies from the raw votes. Doesn't commit.
+    """
+    cursor.execute('DELETE FROM poll_tallies WHERE poll_type = ? AND poll_id = ?', (poll_type, poll_id))
+    if poll_type == "match":
+        cursor.execute('''
+        INSERT INTO poll_tallies (poll_type, poll_id, option, votes)
+        SELECT 'match', match_id, pred_winner || ' ' || pred_score, COUNT(*)
+        FROM predictions
+        WHERE match_id = ?
+        GROUP BY pred_winner, pred_score
+        ''', (poll_id,))
+    else:
+        cursor.execute('''
+        INSERT INTO poll_tallies (poll_type, poll_id, option, votes)
+        SELECT 'bonus', bonus_answers.question_id, answer_options.value, COUNT(*)
+        FROM bonus_answers, json_each(bonus_answers.answer) AS answer_options
+        WHERE bonus_answers.question_id = ? AND json_valid(bonus_answers.answer)
+        GROUP BY answer_options.value
+        ''', (poll_id,))
+
+async def fetch_poll_reactors(channel, message_id):
+    """
+    Returns {reaction key: {user_id: username}} for one poll, or None if the message is gone.
+    """
     try:
-        poll_channel = bot.get_channel(1346615134885253181)
-        updated_count = 0
+        message = await channel.fetch_message(int(message_id))
+    except discord.NotFound:
+        return None
+    poll_messages[message.id] = message
+
+    async def reaction_users(reaction):
+        users = {user.id: str(user.name) async for user in reaction.users() if user.id != bot.user.id}
+        return emojis.key(reaction.emoji), users
+
+    return dict(await asyncio.gather(*(reaction_users(reaction) for reaction in message.reactions)))
+
+async def reconcile_poll_reactions(prune=False):
+    """
+    Diffs the reactions on every open poll (no result yet) against predictions and bonus_answers,
+    then applies only the differences in one transaction.
+    Returns a report dict with the drift counts.
+    """
+    poll_channel = bot.get_channel(channel_id("poll"))
 
-        async for message in poll_channel.history(limit=200):
-            if not (message.embeds and "Bonus Question:" in message.embeds[0].title):
+    cursor.execute('''
+    SELECT id, match_week, team1, team2, match_type, poll_message_id FROM matches
+    WHERE poll_message_id IS NOT NULL AND winner IS NULL
+    ''')
+    open_matches = cursor.fetchall()
+    cursor.execute('''
+    SELECT id, match_week, options, reaction_type, required_answers, poll_message_id FROM bonus_questions
+    WHERE poll_message_id IS NOT NULL AND correct_answer IS NULL
+    ''')
+    open_questions = cursor.fetchall()
+
+    semaphore = asyncio.Semaphore(POLL_SYNC_CONCURRENCY)
+
+    async def fetch(message_id):
+        async with semaphore:
+            return await fetch_poll_reactors(poll_channel, message_id)
+
+    reactor_lists = await asyncio.gather(*(fetch(row[-1]) for row in open_matches + open_questions))
+    match_reactors = reactor_lists[:len(open_matches)]
+    question_reactors = reactor_lists[len(open_matches):]
+
+    report = {"polls": len(reactor_lists), "missing": reactor_lists.count(None), "added": 0, "changed": 0, "removed": 0}
+    usernames = {}
+    touched_users = set()  # (user_id, match_week)
+    touched_polls = []
+    try:
+        for (match_id, match_week, team1, team2, match_type, _), reactors in zip(open_matches, match_reactors):
+            if reactors is None:
                 continue
-                
-            question_text = message.embeds[0].title.split(":")[1].strip()
-            
-            # Get question details from database
             cursor.execute('''
-            SELECT id, options, reaction_type, match_week 
-            FROM bonus_questions 
-            WHERE question = ?
-            ''', (question_text,))
-            question_row = cursor.fetchone()
-
-            if not question_row:
+            SELECT user_id, pred_winner || ' ' || pred_score FROM predictions WHERE match_id = ?
+            ''', (match_id,))
+            current = dict(cursor.fetchall())
+            upserts, deletes = diff_match_votes(match_poll_options(team1, team2, match_type), reactors, current, prune)
+            if not upserts and not deletes:
                 continue
 
-            question_id, options, reaction_type, match_week = question_row
-            option_split = [opt.strip() for opt in options.split(",")]
+            cursor.executemany('''
+            INSERT INTO predictions (match_id, match_week, user_id, pred_winner, pred_score, points)
+            VALUES (?, ?, ?, ?, ?, 0)
+            ON CONFLICT(match_id, user_id) DO UPDATE SET
+            pred_winner = excluded.pred_winner,
+            pred_score = excluded.pred_score
+            ''', [(match_id, match_week, user_id, *option.split(" ", 1)) for user_id, option in upserts.items()])
+            cursor.executemany('DELETE FROM predictions WHERE match_id = ? AND user_id = ?', [(match_id, user_id) for user_id in deletes])
+            for user_id, option in upserts.items():
+                log_event("match_vote", match_id=match_id, match_week=match_week, user_id=user_id, option=option, source="sync")
+            for user_id in deletes:
+                log_event("match_unvote", match_id=match_id, user_id=user_id, option=current[user_id], source="sync")
+
+            report["added"] += sum(1 for user_id in upserts if user_id not in current)
+            report["changed"] += sum(1 for user_id in upserts if user_id in current)
+            report["removed"] += len(deletes)
+            for users in reactors.values():
+                usernames.update(users)
+            touched_users.update((user_id, match_week) for user_id in [*upserts, *deletes])
+            touched_polls.append(("match", match_id))
+
+        for (question_id, match_week, options, reaction_type, required_answers, _), reactors in zip(open_questions, question_reactors):
+            if reactors is None:
+                continue
+            cursor.execute('SELECT user_id, answer FROM bonus_answers WHERE question_id = ?', (question_id,))
+            current = {}
+            for user_id, answer in cursor.fetchall():
+                try:
+                    current[user_id] = json.loads(answer)
+                except (TypeError, json.JSONDecodeError):
+                    current[user_id] = []
+            upserts, deletes = diff_bonus_votes(bonus_poll_options(options, reaction_type), reactors, current, required_answers)
+            if not upserts and not deletes:
+                continue
 
-            # Start transaction for each question
-            cursor.execute('BEGIN TRANSACTION')
-            try:
-                # Clear existing answers for this question
-                cursor.execute('DELETE FROM bonus_answers WHERE question_id = ?', (question_id,))
-
-                # Process each reaction on the message
-                for reaction in message.reactions:
-                    async for user in reaction.users():
-                        if user == bot.user:  # Skip bot's reactions
-                            continue
-                            
-                        # Map reaction to option based on reaction type
-                        selected_option = None
-                        if reaction_type == "numbers":
-                            if str(reaction.emoji) in [f"{i+1}️⃣" for i in range(len(option_split))]:
-                                selected_index = [f"{i+1}️⃣" for i in range(len(option_split))].index(str(reaction.emoji))
-                                selected_option = option_split[selected_index]
-                        elif reaction_type == "teams":
-                            if isinstance(reaction.emoji, discord.PartialEmoji):
-                                emoji_id = str(reaction.emoji.id)
-                                for i, team in enumerate(option_split):
-                                    if team in TEAM_EMOTES and TEAM_EMOTES[team].split(':')[2].rstrip('>') == emoji_id:
-                                        selected_option = team
-                                        break
-
-                        if selected_option:
-                            # Update database with reaction
-                            cursor.execute('''
-                            SELECT answer FROM bonus_answers WHERE user_id = ? AND question_id = ?
-                            ''', (user.id, question_id))
-                            row = cursor.fetchone()
-                            
-                            existing_answers = json.loads(row[0]) if row and row[0] else []
-                            if selected_option not in existing_answers:
-                                existing_answers.append(selected_option)
+            cursor.executemany('''
+            INSERT INTO bonus_answers (user_id, question_id, answer, match_week)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(user_id, question_id) DO UPDATE SET answer = excluded.answer
+            ''', [(user_id, question_id, json.dumps(answers), match_week) for user_id, answers in upserts.items()])
+            cursor.executemany('DELETE FROM bonus_answers WHERE question_id = ? AND user_id = ?', [(question_id, user_id) for user_id in deletes])
+            for user_id, answers in upserts.items():
+                log_event("bonus_answer", question_id=question_id, match_week=match_week, user_id=user_id, answers=answers, source="sync")
+            for user_id in deletes:
+                log_event("bonus_answer_deleted", question_id=question_id, user_id=user_id, source="sync")
+
+            report["added"] += sum(1 for user_id in upserts if user_id not in current)
+            report["changed"] += sum(1 for user_id in upserts if user_id in current)
+            report["removed"] += len(deletes)
+            for users in reactors.values():
+                usernames.update(users)
+            touched_users.update((user_id, match_week) for user_id in [*upserts, *deletes])
+            touched_polls.append(("bonus", question_id))
+
+        cursor.executemany('''
+        INSERT INTO users (user_id, username)
+        VALUES (?, ?)
+        ON CONFLICT(user_id) DO UPDATE SET username = excluded.username
+        ''', [(user_id, usernames[user_id]) for user_id, _ in touched_users if user_id in usernames])
+        for poll_type, poll_id in touched_polls:
+            recount_poll_tallies(poll_type, poll_id)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
-                            cursor.execute('''
-                            INSERT INTO bonus_answers (user_id, question_id, answer, match_week)
-                            VALUES (?, ?, ?, ?)
-                            ON CONFLICT(user_id, question_id) DO UPDATE SET answer = excluded.answer
-                            ''', (user.id, question_id, json.dumps(existing_answers), match_week))
+    for user_id, match_week in touched_users:
+        invalidate_predictions_view(user_id, match_week)
+    if touched_polls:
+        refresh_live_polls()
 
-                cursor.execute('COMMIT')
-                updated_count += 1
+    return report
 
-            except Exception as e:
-                cursor.execute('ROLLBACK')
-                await ctx.send(f"Error processing question '{question_text}': {e}")
+@bot.command()
+@commands.check(is_mod_channel)
+async def sync_poll_reactions(ctx, *options):
+    """
+    Syncs predictions and bonus answers with the current reactions on all open polls.
+    Add 'prune' to also delete match predictions that have no reaction (e.g. ones entered with add_prediction).
+    Usage: !sync_poll_reactions [prune]
+    """
+    try:
+        prune = "prune" in [option.lower() for option in options]
+        # Live votes wait until the diff is applied, as during recovery
+        async with reactions_held():
+            report = await reconcile_poll_reactions(prune)
 
-        await ctx.send(f"✅ Successfully synced reactions for {updated_count} bonus questions!")
+        message = (f"✅ Synced {report['polls']} open polls: {report['added']} added, "
+                   f"{report['changed']} changed, {report['removed']} removed.")
+        if report["missing"]:
+            message += f" {report['missing']} poll messages could not be found."
+        await ctx.send(message)
 
     except Exception as e:
         await ctx.send(f"❌ Error syncing reactions: {e}")
         
-# Run bot
-bot.run(TOKEN)
\ No newline at end of file
+# Run bot (log_handler=None so discord.py logs through the queue set up by configure_logging)
+if __name__ == "__main__":
+    bot.run(TOKEN, log_handler=None)
\ No newline at end of file
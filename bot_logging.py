@@ -0,0 +1,143 @@
+"""
+Logging setup for the prediction bots.
+
+Records go through a queue to a background thread, so a log call on the event loop never blocks on
+stdout. Debug lines on hot paths are sampled and every call site is rate limited.
+
+Environment:
+    LOG_LEVEL              root level, default INFO
+    LOG_LEVELS             per-logger levels, e.g. "lec.reactions=DEBUG,lec.leaderboard=WARNING"
+    LOG_FORMAT             "text" (default) or "json"
+    LOG_DEBUG_SAMPLE       keep 1 in N DEBUG records per call site, default 1 (keep all)
+    LOG_RATE_LIMIT         max records per call site per minute below WARNING, default 60 (0 = unlimited)
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from datetime import datetime, timezone
+
+# Attributes every LogRecord has; anything else was passed with extra= and goes into the JSON output
+STANDARD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in STANDARD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        text = super().format(record)
+        if getattr(record, "suppressed", 0):
+            text += f" ({record.suppressed} more from this line suppressed)"
+        return text
+
+
+class CallSiteLimiter(logging.Filter):
+    """
+    Samples DEBUG records and caps how often any one call site below WARNING can log.
+    Suppressed records are counted and reported on the next record that gets through.
+    """
+
+    def __init__(self, debug_sample, rate_limit):
+        super().__init__()
+        self.debug_sample = debug_sample
+        self.rate_limit = rate_limit
+        self.sites = {}  # (pathname, lineno) -> [seen, window start, in window, suppressed]
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        site = self.sites.get((record.pathname, record.lineno))
+        if site is None:
+            site = self.sites[(record.pathname, record.lineno)] = [0, time.monotonic(), 0, 0]
+        site[0] += 1
+
+        if record.levelno <= logging.DEBUG and (site[0] - 1) % self.debug_sample:
+            return False
+
+        if self.rate_limit:
+            now = time.monotonic()
+            if now - site[1] >= 60:
+                site[1], site[2] = now, 0
+            if site[2] >= self.rate_limit:
+                site[3] += 1
+                return False
+            site[2] += 1
+
+        if site[3]:
+            record.suppressed = site[3]
+            site[3] = 0
+        return True
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues the record as is. The queue never leaves the process, so unlike the stock QueueHandler
+    there's no need to format the message on the calling thread.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def configure_logging():
+    """
+    Sets up the root logger from the environment. Safe to call more than once.
+    """
+    global listener
+    if listener is not None:
+        return
+
+    if os.getenv("LOG_FORMAT", "text").lower() == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = TextFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    handler = LocalQueueHandler(log_queue)
+    handler.addFilter(CallSiteLimiter(
+        debug_sample=max(int(os.getenv("LOG_DEBUG_SAMPLE", "1")), 1),
+        rate_limit=int(os.getenv("LOG_RATE_LIMIT", "60")),
+    ))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    for setting in filter(None, os.getenv("LOG_LEVELS", "").split(",")):
+        name, _, level = setting.partition("=")
+        logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+    listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """
+    Flushes whatever is still queued. Runs automatically at exit.
+    """
+    global listener
+    if listener is not None:
+        listener.stop()
+        listener = None
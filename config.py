@@ -0,0 +1,136 @@
+"""
+Live configuration: team emotes, reaction sets, stage lists and channel IDs, changeable without a restart.
+
+CONFIG_FILE (default bot_config.json) is optional JSON like
+    {"team_emotes": {"SHFT": "<:Shifters:1459685880636641391>"},
+     "reaction_sets": {"set1": ["🟦", "🔵", "💙", "❤️", "🔴", "🟥"]},
+     "stages": {"lec": 10, "internationals": [["G", "Group Stage", "G"], ["SF", "Semi-Finals", "SF"], ["F", "Finals", "F"]]},
+     "channels": {"lec": {"bot": 1346615855408091180}}}
+Every key is optional. team_emotes and channels are merged over the built-in values, reaction_sets and stages
+replace the ones they name. A stage list is a week count (numbered weeks) or [key, name, short name] entries.
+
+reload() builds a complete Snapshot, lookups included, and swaps it in with one assignment, so a handler sees
+either the old or the new configuration. A file that doesn't load is logged and the running configuration stays.
+"""
+import json
+import logging
+import os
+
+import emojis
+import stages
+import tenants
+
+log = logging.getLogger("lec.config")
+
+PATH = os.getenv("CONFIG_FILE", "bot_config.json")
+
+DEFAULT_REACTION_SETS = {
+    'set1': ['🟦', '🔵', '💙', '❤️', '🔴', '🟥'],  # Blue/Red themed emojis only
+}
+
+DEFAULT_TEAM_EMOTES = {
+    "KOI": "<:Koi:1330749930167603311>",
+    "SK": "<:SK:1330750495169445928>",
+    "FNC": "<:Fnatic:1330750485568946317>",
+    "G2": "<:G2:1330750487762440222>",
+    "TH": "<:Heretics:1330750491046445106>",
+    "NAVI": "<:NaVi:1402724220978331808>",
+    "VIT": "<:Vitality:1330750496557760624>",
+    "GX": "<:GiantX:1330750489285103616>",
+    "KC": "<:KC:1330750492552466463>",
+    "SHFT": "<:Shifters:1459685880636641391>",
+    "LR": "<:LosRatones:1459685744325951672>",
+    "KCB": "<:KCorpBlue:1459685949675016314>"
+}
+
+
+class Snapshot:
+    """
+    One consistent configuration with the lookups built from it. Never changed after it's built.
+    """
+
+    def __init__(self, data):
+        self.team_emotes = {**DEFAULT_TEAM_EMOTES, **data.get("team_emotes", {})}
+        self.reaction_sets = {**DEFAULT_REACTION_SETS, **data.get("reaction_sets", {})}
+        self.emojis = emojis.EmojiRegistry(self.team_emotes, self.reaction_sets)
+
+        self.stage_models = dict(stages.MODELS)
+        for tournament, stage_list in data.get("stages", {}).items():
+            if isinstance(stage_list, int):
+                self.stage_models[tournament] = stages.NumberedWeeks(stage_list)
+            else:
+                self.stage_models[tournament] = stages.NamedStages([tuple(stage) for stage in stage_list])
+
+        self.channels = {}  # tenant name -> {role: channel ID}, overriding the tenant's own
+        for tenant_name, channels in data.get("channels", {}).items():
+            unknown = set(channels) - set(tenants.CHANNEL_ROLES + tenants.ANNOUNCE_ROLES)
+            if unknown:
+                raise ValueError(f"Unknown channel role(s) for {tenant_name}: {', '.join(sorted(unknown))}")
+            self.channels[tenant_name] = {role: int(channel) for role, channel in channels.items()}
+
+
+current = Snapshot({})
+loaded_mtime = None  # mtime of the file current came from, None for the defaults
+
+
+def file_mtime():
+    try:
+        return os.stat(PATH).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def reload(force=False, strict=False, apply=None):
+    """
+    Loads CONFIG_FILE if it changed since the last load. Returns the new Snapshot, or None if nothing changed
+    or the file didn't load; strict raises instead. apply(snapshot) runs before the swap and can reject it by raising.
+    """
+    global current, loaded_mtime
+    mtime = file_mtime()
+    if mtime == loaded_mtime and not force:
+        return None
+    # Remembered even if the file is broken, so the same broken file isn't retried on every check
+    loaded_mtime = mtime
+    try:
+        if mtime is None:
+            snapshot = Snapshot({})
+        else:
+            with open(PATH, encoding="utf-8") as config_file:
+                snapshot = Snapshot(json.load(config_file))
+        if apply:
+            apply(snapshot)
+    except Exception as e:
+        if strict:
+            raise
+        log.error("Couldn't load %s, keeping the current configuration: %s", PATH, e)
+        return None
+    current = snapshot
+    log.info("Loaded configuration from %s", PATH if mtime is not None else "built-in defaults")
+    return snapshot
+
+
+class ConfigAttribute:
+    """
+    Read-only stand-in for a mapping on the current Snapshot, e.g. ConfigAttribute("team_emotes").
+    """
+
+    def __init__(self, attribute):
+        self._attribute = attribute
+
+    def _target(self):
+        return getattr(current, self._attribute)
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+    def __getitem__(self, key):
+        return self._target()[key]
+
+    def __contains__(self, key):
+        return key in self._target()
+
+    def __iter__(self):
+        return iter(self._target())
+
+    def __len__(self):
+        return len(self._target())
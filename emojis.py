@@ -0,0 +1,111 @@
+"""
+Emoji registry: which poll option a reaction stands for, in one dict lookup.
+
+Reactions are looked up by key: the ID of a custom emoji, the emoji itself for unicode ones. config.Snapshot
+builds one registry per configuration, so the lookups follow changes to team emotes and reaction sets.
+"""
+import re
+
+EMOTE = re.compile(r"<a?:\w+:(\d+)>")
+
+NUMBER_EMOJIS = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟"]
+FINALIZE = "✅"
+
+MATCH_TYPES = ("BO1", "BO3", "BO5")
+
+# Position in a reaction set used by each option of a match poll, in option order. A tenant's polls keep one
+# layout, since the reactions on polls already posted have to keep meaning the same option.
+MATCH_LAYOUTS = {
+    "outer": {  # LEC polls
+        "BO1": (0, 5),  # Outer pair
+        "BO3": (0, 1, 4, 5),  # From outside in
+        "BO5": (0, 1, 2, 3, 4, 5),  # All six
+    },
+    "middle": {  # Internationals polls
+        "BO1": (2, 3),  # Middle pair
+        "BO3": (1, 2, 3, 4),  # The middle four
+        "BO5": (0, 1, 2, 3, 4, 5),  # All six
+    },
+}
+DEFAULT_LAYOUT = "outer"
+TOURNAMENT_LAYOUTS = {"internationals": "middle"}  # Tournaments whose polls don't use DEFAULT_LAYOUT
+REACTION_SET_SIZE = 6
+
+
+def key(emoji):
+    """
+    Lookup key for a PartialEmoji, Emoji, Reaction.emoji or emoji text such as "<:G2:123>" or "🟦".
+    """
+    emoji_id = getattr(emoji, "id", None)
+    if emoji_id:
+        return str(emoji_id)
+    text = str(emoji)
+    match = EMOTE.fullmatch(text)
+    return match.group(1) if match else text
+
+
+class EmojiRegistry:
+    def __init__(self, team_emotes, reaction_sets):
+        for team, emote in team_emotes.items():
+            if not EMOTE.fullmatch(emote):
+                raise ValueError(f"Emote for {team} isn't a custom emoji: {emote}")
+        for name, reactions in reaction_sets.items():
+            if len(reactions) != REACTION_SET_SIZE:
+                raise ValueError(f"Reaction set {name} needs {REACTION_SET_SIZE} emojis, has {len(reactions)}")
+        self.team_emotes = team_emotes
+        self.reaction_sets = reaction_sets
+        self.teams = {key(emote): team for team, emote in team_emotes.items()}  # emote ID -> team
+        self.numbers = {emoji: index for index, emoji in enumerate(NUMBER_EMOJIS)}  # emoji -> option index
+
+        # layout -> match type -> {key: option index}, over every reaction set; the first set using an emoji wins
+        self.match_choices = {
+            layout: {match_type: {} for match_type in positions} for layout, positions in MATCH_LAYOUTS.items()
+        }
+        for reactions in reaction_sets.values():
+            for layout, positions in MATCH_LAYOUTS.items():
+                for match_type, match_positions in positions.items():
+                    for index, position in enumerate(match_positions):
+                        self.match_choices[layout][match_type].setdefault(key(reactions[position]), index)
+        self.match_keys = {key(emoji) for reactions in reaction_sets.values() for emoji in reactions}
+
+    def match_reactions(self, match_type, reaction_set="set1", layout=DEFAULT_LAYOUT):
+        """
+        The reactions a match poll gets, in option order.
+        """
+        reactions = self.reaction_sets[reaction_set]
+        return [reactions[position] for position in MATCH_LAYOUTS[layout][match_type]]
+
+    def is_match_reaction(self, emoji_key):
+        return emoji_key in self.match_keys
+
+    def match_choice(self, match_type, emoji_key, layout=DEFAULT_LAYOUT):
+        """
+        Index of the option a reaction picks on a match poll, None if it isn't one of that poll's reactions.
+        """
+        return self.match_choices[layout].get(match_type, {}).get(emoji_key)
+
+    def bonus_reactions(self, reaction_type, options):
+        """
+        The reactions a bonus poll gets, in option order. KeyError for a team without an emote.
+        """
+        if reaction_type.lower() == "teams":
+            return [self.team_emotes[team] for team in options]
+        return NUMBER_EMOJIS[:len(options)]
+
+    def bonus_choice(self, reaction_type, options, emoji_key):
+        """
+        The option a reaction picks on a bonus poll, None if it isn't one of that poll's reactions.
+        """
+        if reaction_type.lower() == "teams":
+            team = self.teams.get(emoji_key)
+            return team if team in options else None
+        index = self.numbers.get(emoji_key)
+        return options[index] if index is not None and index < len(options) else None
+
+    def bonus_poll_options(self, reaction_type, options):
+        """
+        {key: option} for a bonus poll, leaving out teams without an emote.
+        """
+        if reaction_type.lower() == "teams":
+            return {key(self.team_emotes[team]): team for team in options if team in self.team_emotes}
+        return dict(zip(NUMBER_EMOJIS, options))
@@ -0,0 +1,597 @@
+"""
+Load test for bot_lec.py without a live guild.
+
+Imports the bot against a temporary predictions.db and swaps Discord for in-process fakes: channels,
+messages, users and reaction payloads, with configurable REST latency and injected 429s (which
+discord.py would wait out, so they show up as extra latency). Then it
+  1. schedules matches and bonus questions and runs create_polls,
+  2. has every simulated user vote, switch and unvote on the polls at the requested event rate,
+  3. checks that sync_poll_reactions finds no drift between reactions and the database,
+  4. enters results and finalizes bonus questions like a mod would,
+and reports throughput, latency percentiles per event type and whether the final standings match
+what the simulated votes should have scored.
+
+With --shards N the bot is built as an AutoShardedBot with N shards and the results of all polls come in at
+once, as they would from mods on different shards. The leaderboard channel must then hold exactly one copy
+of the final leaderboard.
+
+With --tenants N one process serves N tenants at once, alternating LEC and internationals, each with its own
+database, channels and guild; combined with --shards their guilds land on different shards (SHARD_IDS still
+limits the process to some of them). Every tenant's votes, standings and leaderboard are checked on their own.
+
+TOURNAMENT picks the bot's stage model as usual; with named stages everything is scheduled in the first one.
+
+Usage: python loadtest.py [--users 200] [--matches 5] [--rate 100] [--latency 0.05] [--rate-limit-chance 0.01] [--shards 4] [--tenants 2]
+Exits non-zero if the standings are wrong or a handler logged an error.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import discord
+
+TEAMS = ["G2", "FNC", "KC", "VIT", "TH", "SK", "GX", "KOI", "NAVI", "SHFT", "LR", "KCB"]
+MATCH_TYPES = ["BO1", "BO3", "BO5"]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else 0.0
+
+
+class FakeDiscord:
+    """
+    Stands in for the REST API: every call waits out a random latency and sometimes a rate limit.
+    """
+
+    def __init__(self, latency, rate_limit_chance, retry_after, rng):
+        self.latency = latency
+        self.rate_limit_chance = rate_limit_chance
+        self.retry_after = retry_after
+        self.rng = rng
+        self.calls = Counter()
+        self.rate_limited = 0
+        self.next_id = discord.utils.time_snowflake(discord.utils.utcnow())
+
+    def snowflake(self):
+        self.next_id += 1
+        return self.next_id
+
+    async def call(self, route):
+        self.calls[route] += 1
+        delay = self.rng.expovariate(1 / self.latency) if self.latency else 0
+        if self.rng.random() < self.rate_limit_chance:
+            self.rate_limited += 1
+            delay += self.retry_after
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class FakeUser:
+    def __init__(self, user_id, name):
+        self.id = user_id
+        self.name = name
+        self.mention = f"<@{user_id}>"
+
+    def __eq__(self, other):
+        return getattr(other, "id", None) == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class FakeReaction:
+    def __init__(self, emoji):
+        self.emoji = emoji
+        self.user_ids = {}  # user_id -> FakeUser, in reaction order
+
+    async def users(self):
+        for user in list(self.user_ids.values()):
+            yield user
+
+
+class FakeMessage:
+    def __init__(self, fake, channel, author, content=None, embed=None):
+        self.fake = fake
+        self.id = fake.snowflake()
+        self.channel = channel
+        self.author = author
+        self.content = content
+        self.embeds = [embed] if embed else []
+        self.reaction_map = {}  # reaction key -> FakeReaction
+
+    @property
+    def reactions(self):
+        return [reaction for reaction in self.reaction_map.values() if reaction.user_ids]
+
+    def react(self, emoji, user, add=True):
+        reaction = self.reaction_map.setdefault(str(emoji.id or emoji.name), FakeReaction(emoji))
+        if add:
+            reaction.user_ids[user.id] = user
+        else:
+            reaction.user_ids.pop(user.id, None)
+
+    async def add_reaction(self, emoji):
+        await self.fake.call("add_reaction")
+        self.react(discord.PartialEmoji.from_str(emoji), self.channel.bot_user)
+
+    async def edit(self, **fields):
+        await self.fake.call("edit_message")
+        if "embed" in fields:
+            self.embeds = [fields["embed"]]
+
+    async def delete(self):
+        await self.fake.call("delete_message")
+        self.channel.messages.pop(self.id, None)
+
+
+class FakeChannel:
+    def __init__(self, fake, channel_id, bot_user):
+        self.fake = fake
+        self.id = channel_id
+        self.bot_user = bot_user
+        self.messages = {}
+
+    async def send(self, content=None, embed=None, **kwargs):
+        await self.fake.call("send_message")
+        message = FakeMessage(self.fake, self, self.bot_user, content, embed)
+        self.messages[message.id] = message
+        return message
+
+    async def fetch_message(self, message_id):
+        await self.fake.call("fetch_message")
+        try:
+            return self.messages[int(message_id)]
+        except KeyError:
+            raise discord.NotFound(FakeResponse(404), "Unknown Message")
+
+    async def purge(self, check=None, **kwargs):
+        await self.fake.call("purge")
+        removed = [message for message in self.messages.values() if check is None or check(message)]
+        for message in removed:
+            del self.messages[message.id]
+        return removed
+
+    def get_partial_message(self, message_id):
+        return self.messages.get(message_id)
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status = status
+        self.reason = "Not Found"
+
+
+class FakeContext:
+    def __init__(self, channel, author):
+        self.channel = channel
+        self.author = author
+        self.replies = []
+
+    async def send(self, content=None, **kwargs):
+        self.replies.append(content)
+        return await self.channel.send(content, **kwargs)
+
+
+class Payload:
+    """
+    The fields of a RawReactionActionEvent that the reaction handlers read.
+    """
+
+    def __init__(self, message, user, emoji, event_type, guild_id=None):
+        self.message_id = message.id
+        self.channel_id = message.channel.id
+        self.user_id = user.id
+        self.emoji = emoji
+        self.event_type = event_type
+        self.guild_id = guild_id
+        self.member = None
+
+
+class ErrorCounter(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class FakeGuilds:
+    """
+    The Discord side shared by every tenant: REST, the bot and mod accounts, the voters and every tenant's channels.
+    The same users vote in every tournament, as they would on a shared server.
+    """
+
+    def __init__(self, bot_module, args):
+        self.lec = bot_module
+        self.fake = FakeDiscord(args.latency, args.rate_limit_chance, args.retry_after, random.Random(args.seed))
+        self.bot_user = FakeUser(1, "prediction-bot")
+        self.mod = FakeUser(2, "mod")
+        self.users = {user_id: FakeUser(user_id, f"user{user_id}") for user_id in range(1000, 1000 + args.users)}
+        self.channels = {}
+        self.errors = ErrorCounter()
+
+    def install(self):
+        """
+        Points the bot at the fake channels and users.
+        """
+        bot = self.lec.bot
+        for tenant in self.lec.TENANTS.tenants:
+            for channel_id in tenant.channels.values():
+                self.channels[channel_id] = FakeChannel(self.fake, channel_id, self.bot_user)
+
+        async def fetch_user(user_id):
+            await self.fake.call("fetch_user")
+            return self.users.get(user_id) or self.mod
+
+        bot.get_channel = self.channels.get
+        bot.fetch_user = fetch_user
+        bot._connection.user = self.bot_user
+        logging.getLogger("lec").addHandler(self.errors)
+
+
+class LoadTest:
+    """
+    One tenant's run: its polls, votes, results and the checks on its database.
+    """
+
+    def __init__(self, guilds, tenant, args, seed):
+        self.lec = guilds.lec
+        self.tenant = tenant
+        self.args = args
+        self.rng = random.Random(seed)
+        self.fake = guilds.fake
+        self.mod = guilds.mod
+        self.users = guilds.users
+        self.channels = guilds.channels
+        self.errors = guilds.errors
+        self.latencies = defaultdict(list)  # event type -> seconds
+        self.expected_matches = defaultdict(dict)  # match_id -> {user_id: option}
+        self.expected_bonus = defaultdict(dict)  # question_id -> {user_id: [answers]}
+
+    def channel(self, role):
+        return self.channels[self.tenant.channels[role]]
+
+    async def react(self, message, user, emoji, add=True):
+        message.react(emoji, user, add)
+        payload = Payload(message, user, emoji, "REACTION_ADD" if add else "REACTION_REMOVE", self.tenant.guild_id)
+        handler = self.lec.on_raw_reaction_add if add else self.lec.on_raw_reaction_remove
+        start = time.perf_counter()
+        await handler(payload)
+        return time.perf_counter() - start
+
+    async def setup_polls(self):
+        admin = self.channel("admin")
+        ctx = FakeContext(admin, self.mod)
+        today = datetime.now().strftime("%d-%m")
+        teams = TEAMS[:]
+        self.rng.shuffle(teams)
+        # Like a mod would type it: tournaments with named stages take the stage after the date, here the first one
+        stage_model = self.lec.STAGE_MODEL
+        stage = [] if stage_model.assigned_by_date else [stage_model.at(1)]
+        for i in range(self.args.matches):
+            team1, team2 = teams[(2 * i) % len(teams)], teams[(2 * i + 1) % len(teams)]
+            await self.lec.schedule.callback(ctx, today, MATCH_TYPES[i % len(MATCH_TYPES)], *stage, team1, team2)
+        for i in range(self.args.bonus):
+            if i % 2:
+                options, reaction_type = ", ".join(teams[:4]), "teams"
+            else:
+                options, reaction_type = "Yes, No, Maybe", "numbers"
+            await self.lec.add_bonus_question.callback(ctx, today, *stage, f"Load test question {i + 1}", "Pick one", options, reaction_type, 1, 2)
+
+        start = time.perf_counter()
+        await self.lec.create_polls.callback(ctx)
+        self.latencies["create_polls"].append(time.perf_counter() - start)
+
+    def load_polls(self):
+        poll_channel = self.channel("poll")
+        admin = self.channel("admin")
+        self.lec.cursor.execute('SELECT id, team1, team2, match_type, poll_message_id, result_message_id FROM matches')
+        matches = [
+            (match_id, self.lec.match_poll_options(team1, team2, match_type), poll_channel.messages[int(poll_id)], admin.messages[int(result_id)])
+            for match_id, team1, team2, match_type, poll_id, result_id in self.lec.cursor.fetchall()
+        ]
+        self.lec.cursor.execute('SELECT id, options, reaction_type, points, poll_message_id, result_message_id FROM bonus_questions')
+        questions = [
+            (question_id, self.lec.bonus_poll_options(options, reaction_type), points, poll_channel.messages[int(poll_id)], admin.messages[int(result_id)])
+            for question_id, options, reaction_type, points, poll_id, result_id in self.lec.cursor.fetchall()
+        ]
+        return matches, questions
+
+    @staticmethod
+    def emoji_for(key):
+        return discord.PartialEmoji(name="emote", id=int(key)) if key.isdigit() else discord.PartialEmoji(name=key)
+
+    def user_script(self, matches, questions):
+        """
+        A user's votes in order: (kind, poll id, message, reaction key, option, add).
+        Some users switch their pick (add the new one, drop the old one) or take their vote back.
+        Polls are visited in random order, the votes on one poll stay in order.
+        """
+        per_poll = []
+        for match_id, options, message, _ in matches:
+            if self.rng.random() > self.args.turnout:
+                continue
+            keys = list(options)
+            first = self.rng.choice(keys)
+            votes = [("match", match_id, message, first, options[first], True)]
+            roll = self.rng.random()
+            if roll < self.args.churn:
+                second = self.rng.choice(keys)
+                votes.append(("match", match_id, message, second, options[second], True))
+                if second != first:
+                    votes.append(("match", match_id, message, first, options[first], False))
+            elif roll < self.args.churn * 1.5:
+                votes.append(("match", match_id, message, first, options[first], False))
+            per_poll.append(votes)
+        for question_id, options, _, message, _ in questions:
+            if self.rng.random() > self.args.turnout:
+                continue
+            keys = list(options)
+            first = self.rng.choice(keys)
+            votes = [("bonus", question_id, message, first, options[first], True)]
+            if self.rng.random() < self.args.churn:
+                second = self.rng.choice(keys)
+                votes.append(("bonus", question_id, message, first, options[first], False))
+                votes.append(("bonus", question_id, message, second, options[second], True))
+            per_poll.append(votes)
+        self.rng.shuffle(per_poll)
+        return [vote for votes in per_poll for vote in votes]
+
+    def expect(self, kind, poll_id, user_id, option, add):
+        """
+        Applies one vote to the model of what the database should end up holding, using the handlers' rules.
+        """
+        if kind == "match":
+            votes = self.expected_matches[poll_id]
+            if add:
+                votes[user_id] = option
+            elif votes.get(user_id) == option:
+                del votes[user_id]
+        else:
+            answers = self.expected_bonus[poll_id]
+            if add:
+                current = answers.setdefault(user_id, [])
+                if not current:  # Every load test question takes one answer
+                    current.append(option)
+            elif option in answers.get(user_id, []):
+                answers[user_id].remove(option)
+
+    async def run_user(self, user, script, mean_gap):
+        for kind, poll_id, message, key, option, add in script:
+            await asyncio.sleep(self.rng.expovariate(1 / mean_gap))
+            self.expect(kind, poll_id, user.id, option, add)
+            seconds = await self.react(message, user, self.emoji_for(key), add)
+            self.latencies[f"{kind}_{'add' if add else 'remove'}"].append(seconds)
+
+    async def vote(self, matches, questions):
+        scripts = {user_id: self.user_script(matches, questions) for user_id in self.users}
+        events = sum(len(script) for script in scripts.values())
+        # Each user acts in order, so spread the target rate over everyone
+        mean_gap = len(self.users) / self.args.rate
+        start = time.perf_counter()
+        await asyncio.gather(*(self.run_user(self.users[user_id], script, mean_gap) for user_id, script in scripts.items()))
+        return events, time.perf_counter() - start
+
+    async def enter_results(self, matches, questions):
+        """
+        One mod action per poll, one after the other, or all at once when sharded.
+        """
+        results = {}
+        actions = []
+        for match_id, options, _, result_message in matches:
+            key = self.rng.choice(list(options))
+            results[match_id] = options[key]
+            actions.append(self.enter_result(result_message, key))
+        answers = {}
+        for question_id, options, points, _, result_message in questions:
+            key = self.rng.choice(list(options))
+            answers[question_id] = (options[key], points)
+            actions.append(self.finalize_bonus(result_message, key))
+        if self.args.shards:
+            await asyncio.gather(*actions)
+        else:
+            for action in actions:
+                await action
+        return results, answers
+
+    async def enter_result(self, result_message, key):
+        self.latencies["result"].append(await self.react(result_message, self.mod, self.emoji_for(key)))
+
+    async def finalize_bonus(self, result_message, key):
+        self.latencies["bonus_answer"].append(await self.react(result_message, self.mod, self.emoji_for(key)))
+        self.latencies["bonus_finalize"].append(await self.react(result_message, self.mod, discord.PartialEmoji(name="✅")))
+
+    async def check_leaderboard(self):
+        """
+        Whether the leaderboard channel shows the current leaderboard once: republishing it must give the same messages.
+        """
+        channel = self.channel("leaderboard")
+        posted = [message.content for message in channel.messages.values()]
+        await self.lec.publish_leaderboard()
+        return posted == [message.content for message in channel.messages.values()]
+
+    def expected_standings(self, matches, results, answers):
+        """
+        Week 1 points per user from the model, using the bot's default points per match type.
+        """
+        match_types = {}
+        self.lec.cursor.execute('SELECT id, match_type FROM matches')
+        match_types.update(self.lec.cursor.fetchall())
+        standings = defaultdict(int)
+        for match_id, votes in self.expected_matches.items():
+            winner, score = results[match_id].split(" ", 1)
+            match_type = match_types[match_id]
+            for user_id, option in votes.items():
+                pred_winner, pred_score = option.split(" ", 1)
+                points = 0
+                if pred_winner == winner:
+                    points += 1 if match_type == "BO1" else (2 if match_type == "BO3" else 3)
+                    if pred_score == score:
+                        points += 1 if match_type == "BO3" else (2 if match_type == "BO5" else 0)
+                standings[user_id] += points
+        for question_id, user_answers in self.expected_bonus.items():
+            correct, points = answers[question_id]
+            for user_id, selected in user_answers.items():
+                standings[user_id] += points if selected == [correct] else 0
+        return standings
+
+    def check_votes(self):
+        problems = 0
+        for match_id, votes in self.expected_matches.items():
+            self.lec.cursor.execute("SELECT user_id, pred_winner || ' ' || pred_score FROM predictions WHERE match_id = ?", (match_id,))
+            if dict(self.lec.cursor.fetchall()) != votes:
+                problems += 1
+        for question_id, user_answers in self.expected_bonus.items():
+            self.lec.cursor.execute('SELECT user_id, answer FROM bonus_answers WHERE question_id = ?', (question_id,))
+            stored = {user_id: json.loads(answer) for user_id, answer in self.lec.cursor.fetchall()}
+            if {u: a for u, a in stored.items() if a} != {u: a for u, a in user_answers.items() if a}:
+                problems += 1
+        return problems
+
+    async def run(self):
+        """
+        Runs the test with this tenant active, as the bot's handlers would have it. Returns the report lines and
+        whether everything checked out.
+        """
+        with self.lec.tenants.using(self.tenant):
+            return await self.run_tenant()
+
+    async def run_tenant(self):
+        await self.setup_polls()
+        matches, questions = self.load_polls()
+        if len(matches) != self.args.matches or len(questions) != self.args.bonus:
+            # A command the bot rejected answers in the admin channel instead of scheduling
+            replies = [message.content for message in self.channel("admin").messages.values() if message.content]
+            lines = [f"Scheduled {len(matches)} of {self.args.matches} matches and {len(questions)} of {self.args.bonus} bonus questions"]
+            lines += [f"  {reply}" for reply in replies[:5]]
+            return lines, False
+
+        events, vote_seconds = await self.vote(matches, questions)
+        wrong_polls = self.check_votes()
+        sync_report = await self.lec.reconcile_poll_reactions()
+        tally_drift = self.lec.reconcile_poll_tallies()
+
+        results, answers = await self.enter_results(matches, questions)
+        expected = self.expected_standings(matches, results, answers)
+        self.lec.cursor.execute('SELECT user_id, SUM(weekly_points) FROM leaderboard GROUP BY user_id')
+        actual = dict(self.lec.cursor.fetchall())
+        wrong_users = sorted(user_id for user_id in set(expected) | set(actual) if expected.get(user_id, 0) != actual.get(user_id, 0))
+        leaderboard_ok = await self.check_leaderboard()
+
+        lines = self.report(events, vote_seconds, wrong_polls, sync_report, tally_drift, wrong_users, expected, actual, leaderboard_ok)
+        return lines, not wrong_polls and not wrong_users and leaderboard_ok
+
+    def report(self, events, vote_seconds, wrong_polls, sync_report, tally_drift, wrong_users, expected, actual, leaderboard_ok):
+        lines = [f"Vote events: {events} in {vote_seconds:.2f}s ({events / vote_seconds:.1f}/s, target {self.args.rate}/s)", ""]
+        lines.append(f"{'event':<16}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for event, values in sorted(self.latencies.items()):
+            lines.append(f"{event:<16}{len(values):>8}{percentile(values, 0.5) * 1000:>10.1f}{percentile(values, 0.95) * 1000:>10.1f}"
+                         f"{percentile(values, 0.99) * 1000:>10.1f}{max(values) * 1000:>10.1f}")
+        lines.append("")
+        drift = sync_report["added"] + sync_report["changed"] + sync_report["removed"]
+        lines.append(f"Polls whose stored votes differ from the simulated votes: {wrong_polls}")
+        lines.append(f"Reaction sync drift after voting: {drift}, tally drift: {tally_drift}")
+        lines.append(f"Users with wrong standings: {len(wrong_users)} of {len(set(expected) | set(actual))}")
+        for user_id in wrong_users[:10]:
+            lines.append(f"  {user_id}: expected {expected.get(user_id, 0)}, got {actual.get(user_id, 0)}")
+        lines.append(f"Leaderboard channel shows the final leaderboard once: {'yes' if leaderboard_ok else 'no'}")
+        return lines
+
+
+async def run_all(bot_module, args):
+    """
+    Runs every tenant the bot loaded at the same time, the way one process serves them, and prints the reports.
+    """
+    guilds = FakeGuilds(bot_module, args)
+    guilds.install()
+    runs = [LoadTest(guilds, tenant, args, args.seed + index) for index, tenant in enumerate(bot_module.TENANTS.tenants)]
+    outcomes = await asyncio.gather(*(run.run() for run in runs))
+
+    bot = bot_module.bot
+    print(f"Users: {args.users}, match polls: {args.matches}, bonus polls: {args.bonus}, tenants: {len(runs)}")
+    if args.shards:
+        shards = Counter(bot_module.tenants.shard_for_guild(run.tenant.guild_id, bot.shard_count) for run in runs)
+        print(f"Shards: {bot.shard_count} ({type(bot).__name__}), tenants per shard: {dict(sorted(shards.items()))}")
+    print(f"REST calls: {sum(guilds.fake.calls.values())} ({dict(guilds.fake.calls)}), 429s injected: {guilds.fake.rate_limited}")
+    for run, (lines, _) in zip(runs, outcomes):
+        print()
+        if len(runs) > 1:
+            print(f"== {run.tenant.name} ({run.tenant.tournament}, guild {run.tenant.guild_id}) ==")
+        print("\n".join(lines))
+    print()
+    print(f"Handler errors logged: {len(guilds.errors.messages)}")
+    for message in guilds.errors.messages[:10]:
+        print(f"  {message}")
+    return all(ok for _, ok in outcomes) and not guilds.errors.messages
+
+
+def write_tenants_file(directory, count):
+    """
+    TENANTS_FILE for --tenants: alternating LEC and internationals tenants, each with its own database, fake
+    channels and a guild on shard index % SHARD_COUNT (guild IDs carry the shard in their top bits).
+    """
+    entries = []
+    for index in range(count):
+        tournament = ("lec", "internationals")[index % 2]
+        entries.append({
+            "name": f"{tournament}{index}",
+            "tournament": tournament,
+            "db": os.path.join(directory, f"{tournament}{index}.db"),
+            "guild_id": index << 22 | 1,
+            "channels": {role: (index + 1) * 100 + offset for offset, role in enumerate(("poll", "admin", "leaderboard", "bot", "announcements"))},
+        })
+    path = os.path.join(directory, "tenants.json")
+    with open(path, "w") as tenants_file:
+        json.dump(entries, tenants_file)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test bot_lec.py against fake Discord objects.")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--matches", type=int, default=5)
+    parser.add_argument("--bonus", type=int, default=2)
+    parser.add_argument("--rate", type=float, default=100, help="target vote events per second")
+    parser.add_argument("--turnout", type=float, default=0.9, help="chance a user votes on a given poll")
+    parser.add_argument("--churn", type=float, default=0.2, help="chance a user changes their vote")
+    parser.add_argument("--latency", type=float, default=0.05, help="mean REST latency in seconds")
+    parser.add_argument("--rate-limit-chance", type=float, default=0.01, help="chance a REST call hits a 429")
+    parser.add_argument("--retry-after", type=float, default=0.5, help="seconds a 429 costs")
+    parser.add_argument("--shards", type=int, default=0, help="run the bot as an AutoShardedBot with this many shards")
+    parser.add_argument("--tenants", type=int, default=0, help="serve this many tenants from one process, each on its own guild")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep-db", action="store_true", help="keep the temporary predictions.db")
+    args = parser.parse_args()
+
+    db_dir = tempfile.mkdtemp(prefix="lec-loadtest-")
+    os.environ["PREDICTIONS_DB"] = os.path.join(db_dir, "predictions.db")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if args.shards:
+        os.environ["SHARD_COUNT"] = str(args.shards)
+    if args.tenants:
+        os.environ["TENANTS_FILE"] = write_tenants_file(db_dir, args.tenants)
+    import bot_lec
+
+    ok = asyncio.run(run_all(bot_lec, args))
+    if args.keep_db:
+        print(f"Databases kept in {db_dir}")
+    else:
+        for tenant in bot_lec.TENANTS.tenants:
+            tenant.conn.close()
+        shutil.rmtree(db_dir)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
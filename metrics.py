@@ -0,0 +1,266 @@
+"""
+Optional Prometheus-style metrics for the prediction bots.
+
+Set METRICS_PORT to turn them on, e.g. METRICS_PORT=9108, then scrape http://127.0.0.1:9108/metrics.
+Without it every helper here is a no-op: nothing gets wrapped and decorators hand back the original function.
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import re
+import time
+
+METRICS_PORT = os.getenv("METRICS_PORT")
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+ENABLED = bool(METRICS_PORT)
+
+log = logging.getLogger("metrics")
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+counters = {}  # (name, labels) -> value
+histograms = {}  # (name, labels) -> [count per bucket..., +Inf count, sum]
+gauges = {}  # name -> function returning the current value, read at scrape time
+
+# Labels added from inside a function wrapped with timed(), e.g. the poll type once it's known
+current_labels = contextvars.ContextVar("metric_labels", default=None)
+
+
+def inc(name, amount=1, **labels):
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    counters[key] = counters.get(key, 0) + amount
+
+
+def observe(name, seconds, **labels):
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    histogram = histograms.get(key)
+    if histogram is None:
+        histogram = histograms[key] = [0] * (len(BUCKETS) + 2)
+    for i, bound in enumerate(BUCKETS):
+        if seconds <= bound:
+            histogram[i] += 1
+            break
+    else:
+        histogram[len(BUCKETS)] += 1
+    histogram[-1] += seconds
+
+
+def gauge(name, read):
+    """
+    Registers a gauge whose value is read by calling read() when metrics are scraped.
+    """
+    if ENABLED:
+        gauges[name] = read
+
+
+def label(**labels):
+    """
+    Adds labels to the measurement of the enclosing timed() function.
+    """
+    if not ENABLED:
+        return
+    pending = current_labels.get()
+    if pending is not None:
+        pending.update(labels)
+
+
+def timed(name, **labels):
+    """
+    Decorator recording how long an async function takes as histogram `<name>_seconds`,
+    plus a `<name>_errors_total` counter for exceptions that escape it.
+    """
+    def decorator(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            measured_labels = dict(labels)
+            token = current_labels.set(measured_labels)
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                inc(f"{name}_errors_total", **measured_labels)
+                raise
+            finally:
+                observe(f"{name}_seconds", time.perf_counter() - start, **measured_labels)
+                current_labels.reset(token)
+        return wrapper
+    return decorator
+
+
+def statement_kind(sql):
+    """
+    Low-cardinality label for a SQL statement: the verb and the first table, e.g. "SELECT matches".
+    """
+    words = sql.split(None, 1)
+    verb = words[0].upper() if words else ""
+    table = re.search(r"\b(?:FROM|INTO|UPDATE|TABLE(?: IF NOT EXISTS)?)\s+(\w+)", sql, re.IGNORECASE)
+    return f"{verb} {table.group(1)}" if table else verb
+
+
+class InstrumentedCursor:
+    """
+    sqlite3 cursor wrapper that times execute/executemany. Everything else is passed through.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(sql, parameters)
+        finally:
+            observe("sql_seconds", time.perf_counter() - start, statement=statement_kind(sql))
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(sql, seq_of_parameters)
+        finally:
+            observe("sql_seconds", time.perf_counter() - start, statement=statement_kind(sql))
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def instrument_cursor(cursor):
+    return InstrumentedCursor(cursor) if ENABLED else cursor
+
+
+def instrument_http(http):
+    """
+    Times every Discord REST call made through the bot's HTTPClient, labelled by method and route template.
+    """
+    if not ENABLED or getattr(http, "_metrics_wrapped", False):
+        return
+    request = http.request
+
+    @functools.wraps(request)
+    async def timed_request(route, **kwargs):
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            return await request(route, **kwargs)
+        except Exception as e:
+            status = type(e).__name__
+            raise
+        finally:
+            observe("discord_http_seconds", time.perf_counter() - start, method=route.method, route=route.path)
+            inc("discord_http_requests_total", method=route.method, route=route.path, status=status)
+
+    http.request = timed_request
+    http._metrics_wrapped = True
+
+
+def instrument_commands(bot):
+    """
+    Times every prefix command via the bot's before/after invoke hooks.
+    """
+    if not ENABLED:
+        return
+
+    @bot.before_invoke
+    async def start_command_timer(ctx):
+        ctx.metrics_started = time.perf_counter()
+
+    @bot.after_invoke
+    async def stop_command_timer(ctx):
+        started = getattr(ctx, "metrics_started", None)
+        if started is not None:
+            failed = "yes" if ctx.command_failed else "no"
+            observe("command_seconds", time.perf_counter() - started, command=ctx.command.qualified_name, failed=failed)
+
+
+def format_labels(labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    escaped = []
+    for key, value in pairs:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{key}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def render():
+    """
+    Everything recorded so far in the Prometheus text exposition format.
+    """
+    lines = []
+    typed = set()
+
+    for (name, labels), value in sorted(counters.items()):
+        if name not in typed:
+            lines.append(f"# TYPE {name} counter")
+            typed.add(name)
+        lines.append(f"{name}{format_labels(labels)} {value}")
+
+    for name, read in sorted(gauges.items()):
+        try:
+            value = read()
+        except Exception:
+            continue
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+
+    for (name, labels), histogram in sorted(histograms.items()):
+        if name not in typed:
+            lines.append(f"# TYPE {name} histogram")
+            typed.add(name)
+        cumulative = 0
+        for bound, count in zip(BUCKETS, histogram):
+            cumulative += count
+            lines.append(f"{name}_bucket{format_labels(labels, [('le', bound)])} {cumulative}")
+        cumulative += histogram[len(BUCKETS)]
+        lines.append(f"{name}_bucket{format_labels(labels, [('le', '+Inf')])} {cumulative}")
+        lines.append(f"{name}_sum{format_labels(labels)} {histogram[-1]}")
+        lines.append(f"{name}_count{format_labels(labels)} {cumulative}")
+
+    return "\n".join(lines) + "\n"
+
+
+async def handle_scrape(reader, writer):
+    try:
+        request_line = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass  # Skip the headers
+
+        if request_line.split()[1:2] == [b"/metrics"]:
+            body = render().encode()
+            status = "200 OK"
+        else:
+            body = b"Not found\n"
+            status = "404 Not Found"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except Exception as e:
+        log.error("Error serving metrics: %s", e)
+    finally:
+        writer.close()
+
+
+async def start_server():
+    """
+    Serves /metrics on METRICS_HOST:METRICS_PORT from the bot's event loop.
+    """
+    if not ENABLED:
+        return None
+    server = await asyncio.start_server(handle_scrape, METRICS_HOST, int(METRICS_PORT))
+    log.info("Metrics available at http://%s:%s/metrics", METRICS_HOST, METRICS_PORT)
+    return server
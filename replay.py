@@ -0,0 +1,305 @@
+"""
+Rebuilds predictions, bonus_answers and leaderboard from the bot's event_log.
+
+The bot appends an event for every accepted vote, removal, result, bonus finalization, match deletion and leaderboard write,
+in the same transaction as the change itself. Replaying them in order applies the same point rules (scoring.py)
+and the same leaderboard arithmetic as the bot, so on a database whose history is fully logged the rebuilt
+tables match the live ones row for row. History only starts when the event log was added; older databases
+will show differences for anything decided before that.
+
+Usage:
+    python replay.py                          # replay predictions.db in memory and report the speed
+    python replay.py --compare                # diff the rebuilt tables against the live ones, exit 1 on differences
+    python replay.py --check-recalculate      # rows recalculate_weeks would change on the rebuilt tables
+    python replay.py --until 5000 --out at_5000.db  # state after event 5000, written to a new database
+    python replay.py --apply                  # replace the live tables with the rebuilt ones (stop the bot first)
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from scoring import bonus_points, match_points
+
+REBUILT_TABLES = ("predictions", "bonus_answers", "leaderboard")
+
+
+class Replay:
+    """
+    In-memory standings built one event at a time. Each event kind has an apply_<kind> method taking the event data.
+    """
+
+    def __init__(self):
+        self.predictions = {}  # match_id -> {user_id: [pred_winner, pred_score, points, match_week]}
+        self.bonus_answers = {}  # question_id -> {user_id: [answers, points, match_week]}
+        self.leaderboard = {}  # (user_id, match_week) -> weekly_points
+        self.results = {}  # match_id -> match_week, for matches that currently have a result
+        self.deleted_matches = set()  # Their predictions stay in the table but don't count towards standings
+        self.handlers = {name[len("apply_"):]: getattr(self, name) for name in dir(self) if name.startswith("apply_")}
+
+    def run(self, events):
+        """
+        Applies (seq, kind, data) events in order and returns how many were applied.
+        """
+        applied = 0
+        for seq, kind, data in events:
+            handler = self.handlers.get(kind)
+            if handler is None:
+                raise ValueError(f"Event {seq} has unknown kind {kind!r}")
+            handler(**json.loads(data))
+            applied += 1
+        return applied
+
+    def add_points(self, user_id, match_week, points):
+        # INSERT ... ON CONFLICT DO UPDATE SET weekly_points = weekly_points + ?
+        self.leaderboard[(user_id, match_week)] = self.leaderboard.get((user_id, match_week), 0) + points
+
+    def remove_points(self, user_id, match_week, points):
+        # UPDATE leaderboard SET weekly_points = weekly_points - ?, which does nothing without a row
+        if (user_id, match_week) in self.leaderboard:
+            self.leaderboard[(user_id, match_week)] -= points
+
+    def clear_match_points(self, match_id, match_week):
+        for user_id, prediction in self.predictions.get(match_id, {}).items():
+            if prediction[2] > 0:
+                self.remove_points(user_id, match_week, prediction[2])
+            prediction[2] = 0
+        self.results.pop(match_id, None)
+
+    def apply_match_vote(self, match_id, match_week, user_id, option, source=None):
+        pred_winner, pred_score = option.split(" ", 1)
+        prediction = self.predictions.setdefault(match_id, {}).get(user_id)
+        if prediction is None:
+            self.predictions[match_id][user_id] = [pred_winner, pred_score, 0, match_week]
+        else:
+            prediction[0], prediction[1] = pred_winner, pred_score
+
+    def apply_match_unvote(self, match_id, user_id, option, source=None):
+        self.predictions.get(match_id, {}).pop(user_id, None)
+
+    def apply_match_result(self, match_id, match_week, match_type, winner, score, winner_points, scoreline_points):
+        for user_id, prediction in self.predictions.get(match_id, {}).items():
+            points = match_points(prediction[0], prediction[1], winner, score, match_type, winner_points, scoreline_points)
+            prediction[2] += points
+            self.add_points(user_id, prediction[3], points)
+        self.results[match_id] = match_week
+
+    def apply_match_deleted(self, match_ids):
+        # DELETE FROM matches only: predictions and leaderboard rows are left as they are
+        self.deleted_matches.update(match_ids)
+        for match_id in match_ids:
+            self.results.pop(match_id, None)
+
+    def apply_match_result_cleared(self, match_id, match_week):
+        self.clear_match_points(match_id, match_week)
+
+    def apply_stage_results_cleared(self, match_week):
+        for match_id in [match_id for match_id, week in self.results.items() if week == match_week]:
+            self.clear_match_points(match_id, match_week)
+
+    def apply_bonus_answer(self, question_id, match_week, user_id, answers, source=None):
+        answer = self.bonus_answers.setdefault(question_id, {}).get(user_id)
+        if answer is None:
+            self.bonus_answers[question_id][user_id] = [list(answers), 0, match_week]
+        else:
+            answer[0] = list(answers)
+
+    def apply_bonus_answer_deleted(self, question_id, user_id, source=None):
+        self.bonus_answers.get(question_id, {}).pop(user_id, None)
+
+    def apply_bonus_finalize(self, question_id, match_week, correct_answers, required_answers, points):
+        correct_answers = set(correct_answers)
+        for user_id, answer in self.bonus_answers.get(question_id, {}).items():
+            answer[1] = bonus_points(set(answer[0]), correct_answers, required_answers, points)
+            self.add_points(user_id, match_week, answer[1])
+
+    def apply_bonus_finalize_undone(self, question_id, match_week):
+        for user_id, answer in self.bonus_answers.get(question_id, {}).items():
+            if answer[1] > 0:
+                self.remove_points(user_id, match_week, answer[1])
+            answer[1] = 0
+
+    def apply_leaderboard_set(self, user_id, match_week, points, reason=None):
+        self.leaderboard[(user_id, match_week)] = points
+
+    def apply_stage_reset(self, match_week):
+        for key in [key for key in self.leaderboard if key[1] == match_week]:
+            del self.leaderboard[key]
+
+    def apply_leaderboard_reset(self):
+        self.predictions.clear()
+        self.bonus_answers.clear()
+        self.leaderboard.clear()
+
+    def rows(self):
+        """
+        The rebuilt tables as {table: {key: row}}, keyed the same way as load_live_rows.
+        """
+        return {
+            "predictions": {
+                (match_id, user_id): (winner, score, points, week)
+                for match_id, users in self.predictions.items() for user_id, (winner, score, points, week) in users.items()
+            },
+            "bonus_answers": {
+                (question_id, user_id): (answers, points, week)
+                for question_id, users in self.bonus_answers.items() for user_id, (answers, points, week) in users.items()
+            },
+            "leaderboard": dict(self.leaderboard),
+        }
+
+    def recalculate_drift(self):
+        """
+        What compute_standings_drift in the bot would report on the rebuilt tables:
+        [(user_id, match_week, leaderboard points or None, points the predictions and bonus answers add up to)].
+        Like the bot, predictions on deleted matches don't count.
+        """
+        expected = {}
+        for match_id, users in self.predictions.items():
+            if match_id in self.deleted_matches:
+                continue
+            for user_id, (_, _, points, week) in users.items():
+                expected[(user_id, week)] = expected.get((user_id, week), 0) + points
+        for users in self.bonus_answers.values():
+            for user_id, (_, points, week) in users.items():
+                expected[(user_id, week)] = expected.get((user_id, week), 0) + points
+
+        drift = []
+        for (user_id, week), points in sorted(expected.items(), key=lambda item: (item[0][1], item[0][0])):
+            current = self.leaderboard.get((user_id, week))
+            if (current is None and points != 0) or (current is not None and current != points):
+                drift.append((user_id, week, current, points))
+        return drift
+
+
+def read_events(connection, until=None, batch_size=10000):
+    query = 'SELECT seq, kind, data FROM event_log'
+    params = ()
+    if until is not None:
+        query += ' WHERE seq <= ?'
+        params = (until,)
+    cursor = connection.execute(query + ' ORDER BY seq', params)
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            return
+        yield from batch
+
+
+def load_live_rows(connection):
+    live = {"predictions": {}, "bonus_answers": {}, "leaderboard": {}}
+    for match_id, user_id, winner, score, points, week in connection.execute(
+        'SELECT match_id, user_id, pred_winner, pred_score, COALESCE(points, 0), match_week FROM predictions'
+    ):
+        live["predictions"][(match_id, user_id)] = (winner, score, points, week)
+    for question_id, user_id, answer, points, week in connection.execute(
+        'SELECT question_id, user_id, answer, COALESCE(points, 0), match_week FROM bonus_answers'
+    ):
+        try:
+            answers = json.loads(answer)
+        except (TypeError, json.JSONDecodeError):
+            answers = answer
+        live["bonus_answers"][(question_id, user_id)] = (answers, points, week)
+    for user_id, week, points in connection.execute('SELECT user_id, match_week, weekly_points FROM leaderboard'):
+        live["leaderboard"][(user_id, week)] = points
+    return live
+
+
+def diff_rows(rebuilt, live):
+    """
+    [(table, key, live row or None, rebuilt row or None)] for every row that differs.
+    """
+    differences = []
+    for table in REBUILT_TABLES:
+        for key in sorted(rebuilt[table].keys() | live[table].keys()):
+            if rebuilt[table].get(key) != live[table].get(key):
+                differences.append((table, key, live[table].get(key), rebuilt[table].get(key)))
+    return differences
+
+
+def write_tables(connection, source, rebuilt):
+    """
+    Replaces predictions, bonus_answers and leaderboard in connection with the rebuilt rows, in one transaction.
+    Missing tables are created from the schema in source.
+    """
+    with connection:
+        for table in REBUILT_TABLES:
+            if not connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone():
+                schema = source.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+                connection.execute(schema[0])
+            connection.execute(f'DELETE FROM {table}')
+        connection.executemany('''
+        INSERT INTO predictions (match_id, user_id, pred_winner, pred_score, points, match_week)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', [(*key, *row) for key, row in rebuilt["predictions"].items()])
+        connection.executemany('''
+        INSERT INTO bonus_answers (question_id, user_id, answer, points, match_week)
+        VALUES (?, ?, ?, ?, ?)
+        ''', [(*key, json.dumps(answers), points, week) for key, (answers, points, week) in rebuilt["bonus_answers"].items()])
+        connection.executemany('''
+        INSERT INTO leaderboard (user_id, match_week, weekly_points) VALUES (?, ?, ?)
+        ''', [(*key, points) for key, points in rebuilt["leaderboard"].items()])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild predictions, bonus answers and the leaderboard from the event log.")
+    parser.add_argument("--db", default=os.getenv("PREDICTIONS_DB", "predictions.db"))
+    parser.add_argument("--until", type=int, metavar="SEQ", help="stop after this event")
+    parser.add_argument("--compare", action="store_true", help="diff against the live tables, exit 1 on differences")
+    parser.add_argument("--check-recalculate", action="store_true", help="list the rows recalculate_weeks would change")
+    parser.add_argument("--show", type=int, default=20, help="differences to print")
+    parser.add_argument("--out", metavar="PATH", help="write the rebuilt tables to a new database")
+    parser.add_argument("--apply", action="store_true", help="replace the live tables with the rebuilt ones")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        sys.exit(f"No database at {args.db}")
+    connection = sqlite3.connect(args.db)
+    if not connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'event_log'").fetchone():
+        sys.exit(f"{args.db} has no event_log table")
+
+    replay = Replay()
+    start = time.perf_counter()
+    applied = replay.run(read_events(connection, args.until))
+    seconds = time.perf_counter() - start
+    rebuilt = replay.rows()
+    print(f"Replayed {applied} events in {seconds:.3f}s ({applied / seconds if seconds else 0:,.0f} events/s): "
+          f"{len(rebuilt['predictions'])} predictions, {len(rebuilt['bonus_answers'])} bonus answers, "
+          f"{len(rebuilt['leaderboard'])} leaderboard rows")
+
+    exit_code = 0
+    if args.compare:
+        differences = diff_rows(rebuilt, load_live_rows(connection))
+        if differences:
+            exit_code = 1
+            print(f"{len(differences)} rows differ from the live tables:")
+            for table, key, live_row, rebuilt_row in differences[:args.show]:
+                print(f"  {table} {key}: live {live_row}, replayed {rebuilt_row}")
+        else:
+            print("Rebuilt tables match the live tables.")
+
+    if args.check_recalculate:
+        drift = replay.recalculate_drift()
+        if drift:
+            print(f"recalculate_weeks would change {len(drift)} leaderboard rows:")
+            for user_id, week, current, expected in drift[:args.show]:
+                print(f"  user {user_id}, week {week}: {current} -> {expected}")
+        else:
+            print("Leaderboard agrees with the replayed points, recalculate_weeks would change nothing.")
+
+    if args.out:
+        if os.path.exists(args.out):
+            sys.exit(f"{args.out} already exists")
+        write_tables(sqlite3.connect(args.out), connection, rebuilt)
+        print(f"Wrote the rebuilt tables to {args.out}")
+
+    if args.apply:
+        write_tables(connection, connection, rebuilt)
+        print(f"Replaced {', '.join(REBUILT_TABLES)} in {args.db}")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
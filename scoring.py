@@ -0,0 +1,47 @@
+"""
+Point rules shared by the bot, the benchmarks and the event-log replay.
+"""
+import logging
+
+log = logging.getLogger("lec.scoring")
+
+
+def match_points(pred_winner, pred_score, winner, score, match_type, winner_points, scoreline_points):
+    """
+    Points for one match prediction. Zero winner/scoreline points mean the defaults for the match type.
+    """
+    points = 0
+
+    # Award points for correct winner
+    if pred_winner == winner:
+        if winner_points != 0:
+            points += winner_points
+        else:
+            points += 1 if match_type == "BO1" else (2 if match_type == "BO3" else 3)
+
+        # Bonus points for correct score
+        if pred_score == score:
+            if scoreline_points != 0:
+                points += scoreline_points
+            else:
+                points += 1 if match_type == "BO3" else (2 if match_type == "BO5" else 0)
+    return points
+
+
+def bonus_points(user_selections, correct_answers, required_answers, points_value):
+    """
+    Points for one bonus answer. With exactly required_answers correct answers the selection has to match them;
+    with more, any required_answers of them count.
+    """
+    if len(correct_answers) == required_answers:
+        # For exact number of required answers, need exact match
+        points_awarded = points_value if user_selections == correct_answers else 0
+        log.debug("Exact match required. Match found: %s", user_selections == correct_answers)
+    else:
+        # For more answers than required, must be valid subset AND have correct number of answers
+        if len(user_selections) == required_answers and user_selections.issubset(correct_answers):
+            points_awarded = points_value
+        else:
+            points_awarded = 0
+        log.debug("Subset check: selections=%d, required=%d, valid subset=%s", len(user_selections), required_answers, user_selections.issubset(correct_answers))
+    return points_awarded
@@ -0,0 +1,119 @@
+"""
+Per-statement SQL profiler and slow-query log for the prediction bots.
+
+Set SQL_PROFILE=1 to record call counts and timings for every distinct statement. Statements are
+normalized first, so literals and IN lists of different lengths group together.
+Statements slower than SQL_SLOW_MS (default 50) go to the "sql.slow" logger. With SQL_EXPLAIN_SLOW=1
+that log line includes the statement's EXPLAIN QUERY PLAN, captured once per statement.
+Without SQL_PROFILE, profile_cursor() returns the cursor untouched.
+"""
+import collections
+import logging
+import os
+import re
+import time
+
+ENABLED = os.getenv("SQL_PROFILE", "false").lower() in ("1", "true", "yes")
+SLOW_MS = float(os.getenv("SQL_SLOW_MS", "50"))
+EXPLAIN_SLOW = os.getenv("SQL_EXPLAIN_SLOW", "false").lower() in ("1", "true", "yes")
+SAMPLES_PER_STATEMENT = 1024  # Most recent timings kept per statement for the p99
+
+slow_log = logging.getLogger("sql.slow")
+
+# normalized sql -> {"calls", "rows", "total", "max", "samples": deque of seconds, "plan"}
+stats = {}
+
+
+def normalize_sql(sql):
+    """
+    Collapses whitespace, replaces literals with ? and shortens IN (?, ?, ...) lists to IN (...).
+    """
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+    sql = " ".join(sql.split())
+    return re.sub(r"\bIN \((?:\?, ?)*\?\)", "IN (...)", sql, flags=re.IGNORECASE)
+
+
+def explain(connection, sql, parameters):
+    if not re.match(r"\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b", sql, re.IGNORECASE):
+        return None
+    try:
+        rows = connection.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+    except Exception as e:
+        return f"(no plan: {e})"
+    return "; ".join(row[-1] for row in rows)
+
+
+def record(cursor, sql, parameters, seconds, row_count):
+    key = normalize_sql(sql)
+    entry = stats.get(key)
+    if entry is None:
+        entry = stats[key] = {
+            "calls": 0, "rows": 0, "total": 0.0, "max": 0.0,
+            "samples": collections.deque(maxlen=SAMPLES_PER_STATEMENT), "plan": None,
+        }
+    entry["calls"] += 1
+    entry["rows"] += max(row_count, 0)
+    entry["total"] += seconds
+    entry["max"] = max(entry["max"], seconds)
+    entry["samples"].append(seconds)
+
+    if seconds * 1000 >= SLOW_MS:
+        if EXPLAIN_SLOW and entry["plan"] is None and parameters is not None:
+            entry["plan"] = explain(cursor.connection, sql, parameters)
+        slow_log.warning("Slow query (%.1f ms): %s%s", seconds * 1000, key, f" | plan: {entry['plan']}" if entry["plan"] else "")
+
+
+class ProfiledCursor:
+    """
+    sqlite3 cursor wrapper that feeds every execute/executemany into stats. Everything else is passed through.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        result = self._cursor.execute(sql, parameters)
+        record(self._cursor, sql, parameters, time.perf_counter() - start, self._cursor.rowcount)
+        return result
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        result = self._cursor.executemany(sql, seq_of_parameters)
+        record(self._cursor, sql, None, time.perf_counter() - start, self._cursor.rowcount)
+        return result
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def profile_cursor(cursor):
+    return ProfiledCursor(cursor) if ENABLED else cursor
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else 0.0
+
+
+def top(n=10, order="total"):
+    """
+    The n heaviest statements as (sql, calls, total s, mean ms, p99 ms, max ms, rows, plan),
+    ordered by "total", "p99", "mean" or "calls".
+    """
+    rows = []
+    for sql, entry in stats.items():
+        rows.append((
+            sql, entry["calls"], entry["total"], entry["total"] / entry["calls"] * 1000,
+            percentile(entry["samples"], 0.99) * 1000, entry["max"] * 1000, entry["rows"], entry["plan"],
+        ))
+    column = {"calls": 1, "total": 2, "mean": 3, "p99": 4}[order]
+    return sorted(rows, key=lambda row: row[column], reverse=True)[:n]
+
+
+def reset():
+    stats.clear()
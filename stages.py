@@ -0,0 +1,126 @@
+"""
+Stage models: how a tournament is split into stages.
+
+The bots store a stage key in every match_week column. A StageModel knows the valid keys, their order,
+display names, how to read one typed in a command and the order ties are broken in. The order also goes
+into the stages table, so SQL can sort by an indexed integer instead of the key itself.
+"""
+
+
+class StageModel:
+    """
+    Ordered stages as (key, name, short name). Subclasses decide how command arguments map to keys.
+    assigned_by_date: whether new matches get their stage from the schedule rather than a command argument.
+    """
+    assigned_by_date = False
+
+    def __init__(self, stages):
+        self.keys = [key for key, _, _ in stages]
+        self.orders = {key: order for order, key in enumerate(self.keys, start=1)}
+        self.names = {key: name for key, name, _ in stages}
+        self.short_names = {key: short for key, _, short in stages}
+
+    def __contains__(self, key):
+        return key in self.orders
+
+    def parse(self, text):
+        """
+        The stage key for a command argument. Raises ValueError for anything that isn't a stage.
+        """
+        raise NotImplementedError
+
+    def choices(self):
+        """
+        Human readable list of valid command arguments, for error messages.
+        """
+        raise NotImplementedError
+
+    def order(self, key):
+        """
+        Position of a stage starting at 1, 0 for None or unknown keys.
+        """
+        return self.orders.get(key, 0)
+
+    def name(self, key):
+        return self.names.get(key, str(key))
+
+    def short_name(self, key):
+        return self.short_names.get(key, str(key))
+
+    def at(self, order):
+        return self.keys[order - 1] if 1 <= order <= len(self.keys) else None
+
+    def following(self, key):
+        """
+        The stage after key, None after the last one. None gives the first stage.
+        """
+        return self.at(self.order(key) + 1)
+
+    def between(self, earlier, later):
+        """
+        Stages strictly after earlier (None for the start) and before later.
+        """
+        return self.keys[self.order(earlier):max(self.order(later) - 1, 0)]
+
+    def tie_break_order(self, latest):
+        """
+        Stages compared to break a tie on total and latest-stage points: the ones before latest, newest first.
+        """
+        return self.keys[:max(self.order(latest) - 1, 0)][::-1]
+
+    def rows(self):
+        """
+        (stage, stage_order, name) rows for the stages table.
+        """
+        return [(key, order, self.names[key]) for key, order in self.orders.items()]
+
+
+class NumberedWeeks(StageModel):
+    """
+    Weeks 1..count stored as integers. A match within two days of the previous one stays in its week.
+    """
+    assigned_by_date = True
+
+    def __init__(self, count):
+        super().__init__([(week, f"Week {week}", f"W{week}") for week in range(1, count + 1)])
+
+    def parse(self, text):
+        try:
+            week = int(text)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid week '{text}'. Use {self.choices()}.")
+        if week not in self:
+            raise ValueError(f"Invalid week '{text}'. Use {self.choices()}.")
+        return week
+
+    def choices(self):
+        return f"a week number from 1 to {len(self.keys)}"
+
+
+class NamedStages(StageModel):
+    """
+    Stages stored as short codes like 'G' or 'SF', given explicitly when scheduling.
+    """
+
+    def parse(self, text):
+        key = str(text).strip().upper()
+        if key not in self:
+            raise ValueError(f"Invalid stage '{text}'. Use {self.choices()}.")
+        return key
+
+    def choices(self):
+        return ", ".join(f"'{key}' for {self.names[key]}" for key in self.keys)
+
+
+LEC_WEEKS = NumberedWeeks(10)
+
+INTERNATIONALS_STAGES = NamedStages([
+    ('G', 'Group Stage', 'G'),
+    ('SF', 'Semi-Finals', 'SF'),
+    ('F', 'Finals', 'F'),
+])
+
+MODELS = {
+    "lec": LEC_WEEKS,
+    "internationals": INTERNATIONALS_STAGES,
+}
@@ -0,0 +1,282 @@
+"""
+Tenant registry: one bot process serving several tournaments, each with its own database and Discord channels.
+
+Set TENANTS_FILE to a JSON list of tenants, e.g.
+    [{"name": "lec", "tournament": "lec", "db": "lec.db", "guild_id": 123,
+      "channels": {"poll": 1, "admin": 2, "leaderboard": 3, "bot": 4, "announcements": 5}},
+     {"name": "msi", "tournament": "internationals", "db": "msi.db", "guild_id": 123, "channels": {...}}]
+Without it there's a single tenant built from TOURNAMENT and PREDICTIONS_DB with the original channel IDs.
+"public_announcements" and "ping_announcements" channels are optional, !announce needs them.
+"match_layout" picks where match poll options sit in a reaction set (see emojis.MATCH_LAYOUTS); by default
+the one the tournament's polls have always used.
+
+With SHARD_COUNT set, a process only keeps the tenants whose guild is on one of its shards (SHARD_IDS, all by default),
+so every database has exactly one writing process. A tenant without a guild_id belongs to shard 0.
+
+Events are routed with one dict lookup on the channel ID. The tenant an event or command belongs to is held in a
+context variable for the rest of its task, and the bot's module-level cursor, conn and STAGE_MODEL are
+TenantAttribute stand-ins that forward to that tenant's own objects.
+"""
+import contextvars
+import json
+import os
+import sqlite3
+
+import emojis
+import stages
+
+CHANNEL_ROLES = ("poll", "admin", "leaderboard", "bot", "announcements")
+# Where !announce posts the latest message of "announcements": without role pings, and as written. Optional, and
+# not used for routing, since tournaments on one server usually share them.
+ANNOUNCE_ROLES = ("public_announcements", "ping_announcements")
+
+# The channels the bots were originally written for, used by the single default tenant
+DEFAULT_CHANNELS = {
+    "poll": 1346615134885253181,
+    "admin": 1346615169433997322,
+    "leaderboard": 1346615199544905730,
+    "bot": 1346615855408091180,
+    "announcements": 1346615886848593985,
+    "public_announcements": 800704760284971058,
+    "ping_announcements": 381820768310263818,
+}
+
+current = contextvars.ContextVar("tenant", default=None)
+registry = None
+
+
+class Tenant:
+    def __init__(self, name, tournament, db_path, channels, guild_id=None, match_layout=None):
+        missing = [role for role in CHANNEL_ROLES if role not in channels]
+        if missing:
+            raise ValueError(f"Tenant '{name}' has no channel for {', '.join(missing)}")
+        if tournament not in stages.MODELS:
+            raise ValueError(f"Tenant '{name}' has unknown tournament '{tournament}'")
+        self.name = name
+        self.tournament = tournament
+        self.stage_model = stages.MODELS[tournament]
+        self.match_layout = match_layout or emojis.TOURNAMENT_LAYOUTS.get(tournament, emojis.DEFAULT_LAYOUT)
+        if self.match_layout not in emojis.MATCH_LAYOUTS:
+            raise ValueError(f"Tenant '{name}' has unknown match layout '{self.match_layout}'")
+        self.db_path = db_path
+        self.guild_id = int(guild_id) if guild_id is not None else None
+        # As configured at startup
+        self.base_channels = {role: int(channels[role]) for role in CHANNEL_ROLES + ANNOUNCE_ROLES if role in channels}
+        self.channels = dict(self.base_channels)
+        self.conn = None
+        self.cursor = None
+        self.caches = {}  # name -> dict, see TenantDict
+
+    def __repr__(self):
+        return f"<Tenant {self.name} ({self.tournament}, {self.db_path})>"
+
+    def connect(self, wrap_cursor=None):
+        self.conn = sqlite3.connect(self.db_path)
+        cursor = self.conn.cursor()
+        self.cursor = wrap_cursor(cursor) if wrap_cursor else cursor
+
+
+class Registry:
+    def __init__(self, tenants):
+        if not tenants:
+            raise ValueError("No tenants configured")
+        self.tenants = tenants
+        self.by_name = {}
+        for tenant in tenants:
+            if tenant.name in self.by_name:
+                raise ValueError(f"Tenant name '{tenant.name}' is used twice")
+            self.by_name[tenant.name] = tenant
+        self.by_channel, self.by_guild = self.index(tenant.channels for tenant in tenants)
+
+    def index(self, channel_maps):
+        """
+        (by_channel, by_guild) for the tenants with the given channels, in tenant order.
+        """
+        by_channel = {}
+        guilds = {}
+        for tenant, channels in zip(self.tenants, channel_maps):
+            for channel_id in (channels[role] for role in CHANNEL_ROLES):
+                owner = by_channel.setdefault(channel_id, tenant)
+                if owner is not tenant:
+                    raise ValueError(f"Channel {channel_id} belongs to both '{owner.name}' and '{tenant.name}'")
+            if tenant.guild_id is not None:
+                guilds.setdefault(tenant.guild_id, []).append(tenant)
+        # Guild fallback only where a guild has one tournament, otherwise the channel has to decide
+        by_guild = {guild_id: owners[0] for guild_id, owners in guilds.items() if len(owners) == 1}
+        return by_channel, by_guild
+
+    def plan_channels(self, overrides):
+        """
+        Checks new channels, {tenant name: {role: channel ID}} over the startup channels, without changing anything.
+        Returns the plan for set_channels; raises ValueError for a conflict.
+        """
+        channel_maps = [{**tenant.base_channels, **overrides.get(tenant.name, {})} for tenant in self.tenants]
+        by_channel, by_guild = self.index(channel_maps)
+        return channel_maps, by_channel, by_guild
+
+    def set_channels(self, plan):
+        """
+        Moves tenants to the channels of a plan_channels plan. Only assignments, so it can't fail halfway.
+        """
+        channel_maps, by_channel, by_guild = plan
+        for tenant, channels in zip(self.tenants, channel_maps):
+            tenant.channels = channels
+        self.by_channel, self.by_guild = by_channel, by_guild
+
+    def on_shards(self, shard_ids, shard_count):
+        """
+        A registry of just the tenants whose guild lives on one of shard_ids. None means every shard.
+        """
+        if shard_ids is None:
+            return self
+        local = [tenant for tenant in self.tenants if shard_for_guild(tenant.guild_id, shard_count) in shard_ids]
+        if not local:
+            raise ValueError(f"No tenant's guild is on shards {sorted(shard_ids)}")
+        return Registry(local)
+
+    def for_channel(self, channel_id):
+        """
+        The tenant owning a channel, or None. This is the hot path for reaction events.
+        """
+        return self.by_channel.get(channel_id)
+
+    def resolve(self, channel_id, guild_id=None):
+        """
+        The tenant for a command: by channel, then by guild, then the only tenant if there's just one.
+        """
+        tenant = self.by_channel.get(channel_id) or self.by_guild.get(guild_id)
+        if tenant is None and len(self.tenants) == 1:
+            tenant = self.tenants[0]
+        return tenant
+
+
+def shard_for_guild(guild_id, shard_count):
+    """
+    The shard Discord delivers a guild's events on. Tenants without a guild count as shard 0.
+    """
+    if guild_id is None:
+        return 0
+    return (guild_id >> 22) % shard_count
+
+
+def parse_shard_ids(text):
+    """
+    "0-3,6" -> {0, 1, 2, 3, 6}. Empty means every shard (None).
+    """
+    if not text:
+        return None
+    shard_ids = set()
+    for part in text.split(","):
+        first, _, last = part.strip().partition("-")
+        shard_ids.update(range(int(first), int(last or first) + 1))
+    return shard_ids
+
+
+def load(default_tournament, default_db, shard_ids=None, shard_count=1):
+    """
+    Builds the registry from TENANTS_FILE, or the single default tenant without it, keeping only the tenants
+    on shard_ids. Doesn't open databases.
+    """
+    global registry
+    path = os.getenv("TENANTS_FILE")
+    if path:
+        with open(path) as tenants_file:
+            entries = json.load(tenants_file)
+        tenants = [
+            Tenant(entry["name"], entry.get("tournament", "lec").lower(), entry["db"], entry["channels"], entry.get("guild_id"),
+                   entry.get("match_layout"))
+            for entry in entries
+        ]
+    else:
+        tenants = [Tenant(default_tournament, default_tournament, default_db, DEFAULT_CHANNELS)]
+    registry = Registry(tenants).on_shards(shard_ids, shard_count)
+    return registry
+
+
+def active():
+    """
+    The tenant of the running task. With a single tenant that's always the one.
+    """
+    tenant = current.get()
+    if tenant is None:
+        if registry is not None and len(registry.tenants) == 1:
+            return registry.tenants[0]
+        raise RuntimeError("No tenant is active in this task")
+    return tenant
+
+
+def activate(tenant):
+    """
+    Makes tenant active for the rest of the current task, e.g. at the top of an event handler.
+    """
+    current.set(tenant)
+
+
+class using:
+    """
+    Context manager making a tenant active for a block, for code that works through every tenant.
+    """
+
+    def __init__(self, tenant):
+        self.tenant = tenant
+
+    def __enter__(self):
+        self.token = current.set(self.tenant)
+        return self.tenant
+
+    def __exit__(self, *exc_info):
+        current.reset(self.token)
+
+
+class TenantAttribute:
+    """
+    Forwards attribute access to an attribute of the active tenant, e.g. TenantAttribute("cursor").
+    """
+
+    def __init__(self, attribute):
+        self._attribute = attribute
+
+    def _target(self):
+        return getattr(active(), self._attribute)
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+    def __iter__(self):
+        return iter(self._target())
+
+    def __contains__(self, item):
+        return item in self._target()
+
+
+class TenantDict:
+    """
+    A dict per tenant behind one name, for in-memory caches of database state.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def _target(self):
+        return active().caches.setdefault(self._name, {})
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+    def __getitem__(self, key):
+        return self._target()[key]
+
+    def __setitem__(self, key, value):
+        self._target()[key] = value
+
+    def __delitem__(self, key):
+        del self._target()[key]
+
+    def __contains__(self, key):
+        return key in self._target()
+
+    def __iter__(self):
+        return iter(self._target())
+
+    def __len__(self):
+        return len(self._target())
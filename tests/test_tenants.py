@@ -0,0 +1,54 @@
+"""
+Multi-tenant startup: bot_lec.py has to import with several tenants, none of them active at import time.
+"""
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("discord")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_tenants(tmp_path, tournaments):
+    entries = [
+        {"name": f"{tournament}{index}", "tournament": tournament, "db": str(tmp_path / f"{tournament}{index}.db"),
+         "guild_id": (index + 1) << 22, "channels": {role: 100 * (index + 1) + offset for offset, role in enumerate(
+             ("poll", "admin", "leaderboard", "bot", "announcements"))}}
+        for index, tournament in enumerate(tournaments)
+    ]
+    path = tmp_path / "tenants.json"
+    path.write_text(json.dumps(entries))
+    return path, entries
+
+
+def import_bot(tenants_file, **env):
+    config_file = tenants_file.parent / "bot_config.json"  # Not there: the built-in configuration
+    return subprocess.run(
+        [sys.executable, "-c", "import bot_lec; print(','.join(tenant.name for tenant in bot_lec.TENANTS.tenants))"],
+        cwd=ROOT, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "TENANTS_FILE": str(tenants_file), "LOG_LEVEL": "WARNING", "CONFIG_FILE": str(config_file), **env},
+    )
+
+
+@pytest.mark.parametrize("tournaments", [("lec", "internationals"), ("lec", "lec")])
+def test_import_with_two_tenants(tmp_path, tournaments):
+    tenants_file, entries = write_tenants(tmp_path, tournaments)
+    result = import_bot(tenants_file)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == ",".join(entry["name"] for entry in entries)
+    for entry in entries:
+        with sqlite3.connect(entry["db"]) as conn:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert {"matches", "predictions", "bonus_questions", "leaderboard", "stages"} <= tables
+
+
+def test_import_keeps_only_local_shard_tenants(tmp_path):
+    tenants_file, entries = write_tenants(tmp_path, ("lec", "internationals"))
+    result = import_bot(tenants_file, SHARD_COUNT="2", SHARD_IDS="1")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == entries[0]["name"]  # guild 1 << 22 is on shard 1
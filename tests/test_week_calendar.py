@@ -0,0 +1,20 @@
+"""
+Week assignment at the end of the season: there is no week after the last one.
+"""
+import pytest
+
+from stages import NumberedWeeks
+from week_calendar import WeekCalendar
+
+
+def test_last_week_has_no_following_week():
+    assert NumberedWeeks(10).following(10) is None
+
+
+def test_date_after_the_last_week_is_rejected():
+    calendar = WeekCalendar(NumberedWeeks(10), [("2026-03-01", 10)])
+    assert calendar.week_for("2026-03-02") == 10
+    with pytest.raises(ValueError):
+        calendar.week_for("2026-03-08")
+    with pytest.raises(ValueError):
+        calendar.plan(["2026-03-02", "2026-03-08"])
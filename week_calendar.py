@@ -0,0 +1,91 @@
+"""
+Calendar index for assigning weeks from the schedule.
+
+Keeps the distinct match days in date order with the week each belongs to, so the week for a new date is a
+binary search instead of a query over the matches table. Dates are ISO strings, which sort as text.
+"""
+import bisect
+from datetime import date
+
+# A match within this many days of the previous match day stays in its week
+SAME_WEEK_DAYS = 2
+
+
+class WeekCalendar:
+    def __init__(self, stage_model, rows=()):
+        """
+        rows: (match_date, match_week) for every scheduled match.
+        """
+        self.stage_model = stage_model
+        self.dates = []
+        self.weeks = []
+        self.matches = {}  # match_date -> number of matches that day
+        for match_date, match_week in sorted(rows, key=lambda row: row[0]):
+            self.add(match_date, match_week)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def copy(self):
+        calendar = WeekCalendar(self.stage_model)
+        calendar.dates = list(self.dates)
+        calendar.weeks = list(self.weeks)
+        calendar.matches = dict(self.matches)
+        return calendar
+
+    def week_for(self, match_date):
+        """
+        The week for a match or question on match_date: the week of the closest match day on or before it if that's
+        within SAME_WEEK_DAYS, otherwise the week after it. The first week when nothing is scheduled before it.
+        Raises ValueError when it would be the week after the last one.
+        """
+        index = bisect.bisect_right(self.dates, match_date)
+        if index == 0:
+            return self.stage_model.at(1)
+        previous_date, previous_week = self.dates[index - 1], self.weeks[index - 1]
+        if (date.fromisoformat(match_date) - date.fromisoformat(previous_date)).days <= SAME_WEEK_DAYS:
+            return previous_week
+        week = self.stage_model.following(previous_week)
+        if week is None:
+            raise ValueError(f"{match_date} would start a week after {self.stage_model.name(previous_week)}, the last one. "
+                             f"Give it a date within {SAME_WEEK_DAYS} days of {previous_date} or add weeks to the stages.")
+        return week
+
+    def add(self, match_date, match_week):
+        """
+        Records a scheduled match. A day keeps the week of its first match.
+        """
+        count = self.matches.get(match_date, 0)
+        self.matches[match_date] = count + 1
+        if count == 0:
+            index = bisect.bisect_left(self.dates, match_date)
+            self.dates.insert(index, match_date)
+            self.weeks.insert(index, match_week)
+
+    def remove(self, match_date, count=1):
+        """
+        Forgets count deleted matches on match_date, and the day once none are left.
+        """
+        left = self.matches.get(match_date, 0) - count
+        if left > 0:
+            self.matches[match_date] = left
+            return
+        self.matches.pop(match_date, None)
+        index = bisect.bisect_left(self.dates, match_date)
+        if index < len(self.dates) and self.dates[index] == match_date:
+            del self.dates[index]
+            del self.weeks[index]
+
+    def plan(self, match_dates):
+        """
+        Weeks for a batch of new matches, in the given order, as if they were scheduled in date order.
+        Returns (weeks, calendar with the batch added); this calendar is left as it is until the batch is saved.
+        Raises ValueError like week_for if a date falls after the last week.
+        """
+        planned = self.copy()
+        weeks = {}
+        for match_date in sorted(match_dates):
+            if match_date not in weeks:
+                weeks[match_date] = planned.week_for(match_date)
+            planned.add(match_date, weeks[match_date])
+        return [weeks[match_date] for match_date in match_dates], planned